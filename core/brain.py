@@ -982,7 +982,12 @@ class Brain:
     def _trim_history(self) -> None:
         """Keep only recent messages to manage context size."""
         if len(self._messages) > self._max_history:
-            self._messages = self._messages[-self._max_history:]
+            # Trim in place rather than rebinding to a fresh copy
+            del self._messages[:-self._max_history]
+
+    def recent_messages(self, limit: int = 10) -> List[Message]:
+        """Return up to the last `limit` conversation messages, oldest first."""
+        return self._messages[-limit:] if limit > 0 else []
 
     def _build_memory_context(self, user_message: str) -> str:
         """Build relevant memory context to append to prompts."""
@@ -990,7 +990,7 @@ class Heartbeat:
 
         try:
             # Get recent conversation for context
-            recent = self.brain._messages[-10:] if self.brain._messages else []
+            recent = self.brain.recent_messages(10)
             if len(recent) < 4:
                 return None  # Need enough conversation to extract from
 
@@ -156,6 +156,7 @@ class Personality:
 
         self.mood = MoodState()
         self._last_interaction = time.time()
+        self._last_update = time.monotonic()
         self._interaction_count = 0
 
         # Progression system
@@ -204,16 +205,25 @@ class Personality:
             except Exception:
                 pass
 
-    def update(self) -> None:
+    def update(self, elapsed: Optional[float] = None) -> None:
         """
         Update mood based on time passage.
-        Should be called periodically (e.g., every minute).
+        Should be called periodically (e.g., every few seconds to a minute).
+
+        Args:
+            elapsed: Seconds since the previous update (measured if omitted),
+                so decay is the same however often this is called
         """
         now = time.time()
         minutes_idle = (now - self._last_interaction) / 60.0
 
+        tick = time.monotonic()
+        if elapsed is None:
+            elapsed = tick - self._last_update
+        self._last_update = tick
+
         # Decay intensity over time
-        decay = self.mood_decay_rate * minutes_idle
+        decay = self.mood_decay_rate * elapsed / 60.0
         self.mood.intensity = max(0.1, self.mood.intensity - decay)
 
         # If very low intensity, transition to baseline mood
@@ -26,6 +26,11 @@ from typing import Optional
 import yaml
 from dotenv import load_dotenv
 
+try:
+    import uvloop
+except ImportError:
+    uvloop = None  # Fall back to the default asyncio event loop
+
 from core.brain import Brain
 from core.crypto import Identity
 from core.display import DisplayManager
@@ -695,4 +700,8 @@ Examples:
 
 
 if __name__ == "__main__":
+    if uvloop is not None:
+        # libuv-based loop: cheaper callbacks for the thread hand-offs from
+        # the web server and for the heartbeat/display timers
+        asyncio.set_event_loop_policy(uvloop.EventLoopPolicy())
     asyncio.run(main())
@@ -521,12 +521,13 @@ class SSHChatMode:
 
     def _print_history(self) -> None:
         """Print recent conversation messages."""
-        if not self.brain._messages:
+        messages = self.brain.recent_messages(10)
+        if not messages:
             print(f"\n{Colors.DIM}No conversation history.{Colors.RESET}")
             return
 
         print(f"\n{Colors.BOLD}Recent Messages{Colors.RESET}")
-        for msg in self.brain._messages[-10:]:
+        for msg in messages:
             if msg.role == "user":
                 role_color = Colors.PROMPT
                 prefix = "You"
@@ -5,6 +5,19 @@ if TYPE_CHECKING:
     from modes.web_chat import WebChatMode
 
 
+# Progress bars used by /traits, /energy and /level, built once per width
+_BARS = {
+    width: tuple("█" * i + "░" * (width - i) for i in range(width + 1))
+    for width in (10, 20)
+}
+
+
+def progress_bar(fraction: float, width: int = 10) -> str:
+    """Return a text progress bar for fraction (0-1), clamped to the width."""
+    filled = min(max(int(fraction * width), 0), width)
+    return _BARS[width][filled]
+
+
 class CommandHandler:
     """Base class for command handlers.
 
@@ -28,6 +41,32 @@ class CommandHandler:
         """Get event loop dynamically (it's set after __init__)."""
         return self.web_mode._loop
 
+    def _error(self, response: str, **extra: Any) -> Dict[str, Any]:
+        """Build an error response; face/status are only sent if given."""
+        result = {"response": response, "error": True}
+        if extra:
+            result.update(extra)
+        return result
+
+    def _schedule(self, coro) -> None:
+        """Run a coroutine on the event loop without waiting for it."""
+        self.web_mode._schedule(coro)
+
+    def _update_display(self, **kwargs: Any) -> None:
+        """Schedule a (coalesced) display update."""
+        self.web_mode._update_display(**kwargs)
+
     def _get_face_str(self) -> str:
         """Get current face emoji."""
         return self.web_mode._get_face_str()
+
+    def _envelope(self, response: str, **extra: Any) -> Dict[str, Any]:
+        """Wrap a command response with the current face and status."""
+        result = {
+            "response": response,
+            "face": self.web_mode._get_face_str(),
+            "status": self.personality.get_status_line(),
+        }
+        if extra:
+            result.update(extra)
+        return result
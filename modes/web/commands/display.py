@@ -1,24 +1,27 @@
 """Display control commands."""
-import asyncio
 from typing import Dict, Any
 
+from core.ui import FACES
 from . import CommandHandler
 
 
+# /faces listing; FACES is fixed at import time
+FACES_TEXT = "\n".join(
+    ["AVAILABLE FACES", ""] + [f"{name:12} {face}" for name, face in sorted(FACES.items())]
+)
+USAGE_FACE = "Usage: /face <name>\n\nUse /faces to see all available faces"
+
+
 class DisplayCommands(CommandHandler):
     """Handlers for display commands (/face, /faces, /refresh, /screensaver, /darkmode)."""
 
     def face(self, args: str) -> Dict[str, Any]:
         """Test a face expression."""
         if not args:
-            return {"response": "Usage: /face <name>\n\nUse /faces to see all available faces", "error": True}
+            return self._error(USAGE_FACE)
 
         # Update display
-        if self._loop:
-            asyncio.run_coroutine_threadsafe(
-                self.display.update(face=args, text=f"Testing face: {args}"),
-                self._loop
-            )
+        self._update_display(face=args, text=f"Testing face: {args}")
 
         face_str = self.web_mode._faces.get(args, f"({args})")
         return {
@@ -29,36 +32,18 @@ class DisplayCommands(CommandHandler):
 
     def faces(self) -> Dict[str, Any]:
         """List all available faces."""
-        from core.ui import FACES
-
-        response = "AVAILABLE FACES\n\n"
-        for name, face in sorted(FACES.items()):
-            response += f"{name:12} {face}\n"
-
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(FACES_TEXT)
 
     def refresh(self) -> Dict[str, Any]:
         """Force display refresh."""
-        if self._loop:
-            asyncio.run_coroutine_threadsafe(
-                self.display.update(
-                    face=self.personality.face,
-                    text="Display refreshed!",
-                    status=self.personality.get_status_line(),
-                    force=True,
-                ),
-                self._loop
-            )
-
-        return {
-            "response": "Display refreshed.",
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        result = self._envelope("Display refreshed.")
+        self._update_display(
+            face=self.personality.face,
+            text="Display refreshed!",
+            status=result["status"],
+            force=True,
+        )
+        return result
 
     def screensaver(self, args: str = "") -> Dict[str, Any]:
         """Toggle screen saver."""
@@ -67,11 +52,8 @@ class DisplayCommands(CommandHandler):
             response = "✓ Screen saver enabled"
         elif args.lower() == "off":
             self.display.configure_screensaver(enabled=False)
-            if self.display._screensaver_active and self._loop:
-                asyncio.run_coroutine_threadsafe(
-                    self.display.stop_screensaver(),
-                    self._loop
-                )
+            if self.display._screensaver_active:
+                self._schedule(self.display.stop_screensaver())
             response = "✓ Screen saver disabled"
         else:
             # Toggle
@@ -80,11 +62,7 @@ class DisplayCommands(CommandHandler):
             status = "enabled" if not current else "disabled"
             response = f"✓ Screen saver {status}"
 
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(response)
 
     def darkmode(self, args: str = "") -> Dict[str, Any]:
         """Toggle dark mode."""
@@ -101,14 +79,6 @@ class DisplayCommands(CommandHandler):
             response = f"✓ Dark mode {status}"
 
         # Force refresh to apply dark mode change
-        if self._loop:
-            asyncio.run_coroutine_threadsafe(
-                self.display.update(force=True),
-                self._loop
-            )
+        self._update_display(force=True)
 
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(response)
@@ -9,7 +9,7 @@ class FocusCommands(CommandHandler):
 
     def focus(self, args: str = "") -> Dict[str, Any]:
         if not self.focus_manager or not self.focus_manager.is_enabled:
-            return {"response": "Focus manager is not available.", "error": True}
+            return self._error("Focus manager is not available.")
 
         parts = args.split() if args else []
         sub = parts[0].lower() if parts else "status"
@@ -32,7 +32,7 @@ class FocusCommands(CommandHandler):
                 task_title=task.title if task else None,
             )
             if not result.get("ok"):
-                return {"response": result.get("error", "Could not start focus session"), "error": True}
+                return self._error(result.get("error", "Could not start focus session"))
             status = result["status"]
             return {
                 "response": self._format_status(status),
@@ -44,25 +44,25 @@ class FocusCommands(CommandHandler):
         if sub == "stop":
             result = self.focus_manager.stop(stopped_early=True)
             if not result.get("ok"):
-                return {"response": result.get("error", "No active session"), "error": True}
+                return self._error(result.get("error", "No active session"))
             return {"response": "Focus session stopped.", "status": "focus-idle", "focus": {"focus_active": False}}
 
         if sub == "pause":
             result = self.focus_manager.pause()
             if not result.get("ok"):
-                return {"response": result.get("error", "Unable to pause"), "error": True}
+                return self._error(result.get("error", "Unable to pause"))
             return {"response": self._format_status(result["status"]), "status": "focus-paused", "focus": self.focus_manager.get_display_snapshot()}
 
         if sub == "resume":
             result = self.focus_manager.resume()
             if not result.get("ok"):
-                return {"response": result.get("error", "Unable to resume"), "error": True}
+                return self._error(result.get("error", "Unable to resume"))
             return {"response": self._format_status(result["status"]), "status": "focus-active", "focus": self.focus_manager.get_display_snapshot()}
 
         if sub == "break":
             result = self.focus_manager.start_break()
             if not result.get("ok"):
-                return {"response": result.get("error", "Unable to start break"), "error": True}
+                return self._error(result.get("error", "Unable to start break"))
             return {"response": self._format_status(result["status"]), "status": "focus-break", "focus": self.focus_manager.get_display_snapshot()}
 
         if sub == "stats":
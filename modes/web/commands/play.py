@@ -5,13 +5,46 @@ from typing import Dict, Any
 
 from core.personality import Mood
 from core.progression import XPSource
-from . import CommandHandler
+from core.ui import ACTION_FACE_SEQUENCES
+from . import CommandHandler, progress_bar
 
 
 class PlayCommands(CommandHandler):
     """Handlers for play commands (/walk, /dance, /exercise, /play, /pet, /rest, /energy)."""
 
-    async def _play_action_web(
+    async def _animate_action(self, action_name: str) -> None:
+        """Play the emoji face animation for an action on the display."""
+        # Get emoji face sequence for this action
+        face_sequence = ACTION_FACE_SEQUENCES.get(
+            action_name,
+            ["(^_^)", "(^_~)", "(^_^)"]  # Default fallback
+        )
+
+        # Resolve the UI's animated face once (None if the display has no UI)
+        animated_face = getattr(getattr(self.display, "_ui", None), "animated_face", None)
+
+        for i, emoji_face in enumerate(face_sequence):
+            is_last = (i == len(face_sequence) - 1)
+
+            # Override the UI's face with this frame's action face (if UI is available)
+            if animated_face:
+                animated_face._current_action_face = emoji_face
+
+            # Show just the emoji face (no text, so face won't hide)
+            await self.display.update(
+                face="happy",
+                text="",  # Empty text - face will show
+                force=True,
+            )
+
+            if not is_last:
+                await asyncio.sleep(0.8)  # Animation delay between faces
+
+        # Clear action face override when done (if UI is available)
+        if animated_face:
+            animated_face._current_action_face = None
+
+    def _play_action_web(
         self,
         action_name: str,
         emote_text: str,
@@ -22,45 +55,19 @@ class PlayCommands(CommandHandler):
         """
         Execute a play action with emoji face animation and rewards (web version).
 
+        Rewards are applied immediately. The display animation (several
+        rate-limited e-ink refreshes) is scheduled on the event loop without
+        waiting, so the HTTP thread isn't held for its duration.
+
         Returns:
             (xp_gained, energy_change) tuple
         """
-        from core.ui import ACTION_FACE_SEQUENCES
-
         # Update interaction time
         self.personality._last_interaction = time.time()
 
-        # Get emoji face sequence for this action
-        face_sequence = ACTION_FACE_SEQUENCES.get(
-            action_name,
-            ["(^_^)", "(^_~)", "(^_^)"]  # Default fallback
-        )
-
         # Show emoji animation on display (if available)
         if self.display:
-            for i, emoji_face in enumerate(face_sequence):
-                is_last = (i == len(face_sequence) - 1)
-
-                # Show just the emoji face (no text, so face won't hide)
-                await self.display.update(
-                    face="happy",
-                    text="",  # Empty text - face will show
-                    force=True,
-                )
-
-                # Manually render the action face by updating the UI (if UI is available)
-                if hasattr(self.display, '_ui') and self.display._ui and hasattr(self.display._ui, 'animated_face'):
-                    if self.display._ui.animated_face:
-                        # Temporarily override to show action face
-                        self.display._ui.animated_face._current_action_face = emoji_face
-
-                if not is_last:
-                    await asyncio.sleep(0.8)  # Animation delay between faces
-
-            # Clear action face override when done (if UI is available)
-            if hasattr(self.display, '_ui') and self.display._ui and hasattr(self.display._ui, 'animated_face'):
-                if self.display._ui.animated_face:
-                    self.display._ui.animated_face._current_action_face = None
+            self._schedule(self._animate_action(action_name))
 
         # Boost mood and intensity
         old_mood = self.personality.mood.current
@@ -90,16 +97,13 @@ class PlayCommands(CommandHandler):
 
     def walk(self) -> Dict[str, Any]:
         """Go for a walk."""
-        xp_gained, energy_change = asyncio.run_coroutine_threadsafe(
-            self._play_action_web(
-                "walk",
-                "goes for a walk",
-                Mood.CURIOUS,
-                0.7,
-                XPSource.PLAY_WALK,
-            ),
-            self._loop
-        ).result(timeout=30.0)  # Increased for V4 display rate limiting (5s × 4 faces)
+        xp_gained, energy_change = self._play_action_web(
+            "walk",
+            "goes for a walk",
+            Mood.CURIOUS,
+            0.7,
+            XPSource.PLAY_WALK,
+        )
 
         response = f"*{self.personality.name} goes for a walk around the neighborhood*\n\n"
         if xp_gained > 0:
@@ -114,16 +118,13 @@ class PlayCommands(CommandHandler):
 
     def dance(self) -> Dict[str, Any]:
         """Dance around."""
-        xp_gained, energy_change = asyncio.run_coroutine_threadsafe(
-            self._play_action_web(
-                "dance",
-                "dances enthusiastically",
-                Mood.EXCITED,
-                0.9,
-                XPSource.PLAY_DANCE,
-            ),
-            self._loop
-        ).result(timeout=30.0)  # Increased for V4 display rate limiting (5s × 4 faces)
+        xp_gained, energy_change = self._play_action_web(
+            "dance",
+            "dances enthusiastically",
+            Mood.EXCITED,
+            0.9,
+            XPSource.PLAY_DANCE,
+        )
 
         response = f"*{self.personality.name} dances enthusiastically*\n\n"
         if xp_gained > 0:
@@ -138,16 +139,13 @@ class PlayCommands(CommandHandler):
 
     def exercise(self) -> Dict[str, Any]:
         """Exercise and stretch."""
-        xp_gained, energy_change = asyncio.run_coroutine_threadsafe(
-            self._play_action_web(
-                "exercise",
-                "does some stretches",
-                Mood.HAPPY,
-                0.8,
-                XPSource.PLAY_EXERCISE,
-            ),
-            self._loop
-        ).result(timeout=30.0)  # Increased for V4 display rate limiting (5s × 4 faces)
+        xp_gained, energy_change = self._play_action_web(
+            "exercise",
+            "does some stretches",
+            Mood.HAPPY,
+            0.8,
+            XPSource.PLAY_EXERCISE,
+        )
 
         response = f"*{self.personality.name} does some stretches and exercises*\n\n"
         if xp_gained > 0:
@@ -162,16 +160,13 @@ class PlayCommands(CommandHandler):
 
     def play(self) -> Dict[str, Any]:
         """Play with a toy."""
-        xp_gained, energy_change = asyncio.run_coroutine_threadsafe(
-            self._play_action_web(
-                "play",
-                "plays with a toy",
-                Mood.HAPPY,
-                0.8,
-                XPSource.PLAY_GENERAL,
-            ),
-            self._loop
-        ).result(timeout=30.0)  # Increased for V4 display rate limiting (5s × 4 faces)
+        xp_gained, energy_change = self._play_action_web(
+            "play",
+            "plays with a toy",
+            Mood.HAPPY,
+            0.8,
+            XPSource.PLAY_GENERAL,
+        )
 
         response = f"*{self.personality.name} plays with a toy*\n\n"
         if xp_gained > 0:
@@ -186,16 +181,13 @@ class PlayCommands(CommandHandler):
 
     def pet(self) -> Dict[str, Any]:
         """Get petted."""
-        xp_gained, energy_change = asyncio.run_coroutine_threadsafe(
-            self._play_action_web(
-                "pet",
-                "enjoys being petted",
-                Mood.GRATEFUL,
-                0.7,
-                XPSource.PLAY_PET,
-            ),
-            self._loop
-        ).result(timeout=30.0)  # Increased for V4 display rate limiting (5s × 4 faces)
+        xp_gained, energy_change = self._play_action_web(
+            "pet",
+            "enjoys being petted",
+            Mood.GRATEFUL,
+            0.7,
+            XPSource.PLAY_PET,
+        )
 
         response = f"*{self.personality.name} enjoys being petted*\n\n"
         if xp_gained > 0:
@@ -210,16 +202,13 @@ class PlayCommands(CommandHandler):
 
     def rest(self) -> Dict[str, Any]:
         """Take a short rest."""
-        xp_gained, energy_change = asyncio.run_coroutine_threadsafe(
-            self._play_action_web(
-                "rest",
-                "takes a short rest",
-                Mood.COOL,
-                0.4,
-                XPSource.PLAY_REST,
-            ),
-            self._loop
-        ).result(timeout=30.0)  # Increased for V4 display rate limiting (5s × 4 faces)
+        xp_gained, energy_change = self._play_action_web(
+            "rest",
+            "takes a short rest",
+            Mood.COOL,
+            0.4,
+            XPSource.PLAY_REST,
+        )
 
         response = f"*{self.personality.name} takes a short rest*\n\n"
         if xp_gained > 0:
@@ -239,11 +228,6 @@ class PlayCommands(CommandHandler):
         intensity = self.personality.mood.intensity
 
         # Create visual bar
-        bar_filled = int(energy * 10)
-        bar = "█" * bar_filled + "░" * (10 - bar_filled)
+        bar = progress_bar(energy)
 
-        return {
-            "response": f"Energy: [{bar}] {energy:.0%}\n\nMood: {mood.title()} (intensity: {intensity:.0%})\nMood base energy: {self.personality.mood.current.energy:.0%}\n\n*Tip: Play commands (/walk, /dance, /exercise) boost energy!*",
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(f"Energy: [{bar}] {energy:.0%}\n\nMood: {mood.title()} (intensity: {intensity:.0%})\nMood base energy: {self.personality.mood.current.energy:.0%}\n\n*Tip: Play commands (/walk, /dance, /exercise) boost energy!*")
@@ -1,4 +1,6 @@
 """Scheduler management commands."""
+import io
+from datetime import datetime
 from typing import Dict, Any
 
 from . import CommandHandler
@@ -9,54 +11,41 @@ class SchedulerCommands(CommandHandler):
 
     def schedule(self, args: str = "") -> Dict[str, Any]:
         """Manage scheduled tasks."""
-        if not hasattr(self, 'scheduler') or not self.scheduler:
-            return {
-                "response": "Scheduler not available.\n\nEnable in config.yml under 'scheduler.enabled: true'",
-                "face": self._get_face_str(),
-                "status": self.personality.get_status_line(),
-                "error": True
-            }
+        if not self.scheduler:
+            return self._envelope("Scheduler not available.\n\nEnable in config.yml under 'scheduler.enabled: true'", error=True)
 
         if not args:
             # List all scheduled tasks
             tasks = self.scheduler.list_tasks()
 
             if not tasks:
-                return {
-                    "response": "No scheduled tasks configured.\n\nAdd tasks in config.yml under 'scheduler.tasks'",
-                    "face": self._get_face_str(),
-                    "status": self.personality.get_status_line(),
-                }
+                return self._envelope("No scheduled tasks configured.\n\nAdd tasks in config.yml under 'scheduler.tasks'")
 
-            response = "SCHEDULED TASKS\n\n"
+            buf = io.StringIO()
+            write = buf.write
+            write("SCHEDULED TASKS\n\n")
             next_runs = self.scheduler.get_next_run_times()
 
             for task in tasks:
                 status_icon = "✓" if task.enabled else "✗"
-                response += f"{status_icon} {task.name}\n"
-                response += f"   Schedule: {task.schedule_expr}\n"
-                response += f"   Action:   {task.action}\n"
+                write(f"{status_icon} {task.name}\n")
+                write(f"   Schedule: {task.schedule_expr}\n")
+                write(f"   Action:   {task.action}\n")
 
                 if task.enabled:
                     next_run = next_runs.get(task.name, "Unknown")
-                    response += f"   Next run: {next_run}\n"
+                    write(f"   Next run: {next_run}\n")
 
                 if task.last_run > 0:
-                    import time
-                    from datetime import datetime
                     last_run_dt = datetime.fromtimestamp(task.last_run)
-                    response += f"   Last run: {last_run_dt.strftime('%Y-%m-%d %H:%M:%S')} ({task.run_count} times)\n"
+                    write(f"   Last run: {last_run_dt.strftime('%Y-%m-%d %H:%M:%S')} ({task.run_count} times)\n")
 
                 if task.last_error:
-                    response += f"   Error: {task.last_error}\n"
+                    write(f"   Error: {task.last_error}\n")
 
-                response += "\n"
+                write("\n")
 
-            return {
-                "response": response,
-                "face": self._get_face_str(),
-                "status": self.personality.get_status_line(),
-            }
+            return self._envelope(buf.getvalue())
 
         # Parse subcommands
         parts = args.split(maxsplit=1)
@@ -68,56 +57,23 @@ class SchedulerCommands(CommandHandler):
 
         elif subcmd == "enable":
             if len(parts) < 2:
-                return {
-                    "response": "Usage: /schedule enable <task_name>",
-                    "face": self._get_face_str(),
-                    "status": self.personality.get_status_line(),
-                    "error": True
-                }
+                return self._envelope("Usage: /schedule enable <task_name>", error=True)
 
             task_name = parts[1]
             if self.scheduler.enable_task(task_name):
-                return {
-                    "response": f"✓ Enabled: {task_name}",
-                    "face": self._get_face_str(),
-                    "status": self.personality.get_status_line(),
-                }
+                return self._envelope(f"✓ Enabled: {task_name}")
             else:
-                return {
-                    "response": f"Task not found: {task_name}",
-                    "face": self._get_face_str(),
-                    "status": self.personality.get_status_line(),
-                    "error": True
-                }
+                return self._envelope(f"Task not found: {task_name}", error=True)
 
         elif subcmd == "disable":
             if len(parts) < 2:
-                return {
-                    "response": "Usage: /schedule disable <task_name>",
-                    "face": self._get_face_str(),
-                    "status": self.personality.get_status_line(),
-                    "error": True
-                }
+                return self._envelope("Usage: /schedule disable <task_name>", error=True)
 
             task_name = parts[1]
             if self.scheduler.disable_task(task_name):
-                return {
-                    "response": f"✓ Disabled: {task_name}",
-                    "face": self._get_face_str(),
-                    "status": self.personality.get_status_line(),
-                }
+                return self._envelope(f"✓ Disabled: {task_name}")
             else:
-                return {
-                    "response": f"Task not found: {task_name}",
-                    "face": self._get_face_str(),
-                    "status": self.personality.get_status_line(),
-                    "error": True
-                }
+                return self._envelope(f"Task not found: {task_name}", error=True)
 
         else:
-            return {
-                "response": f"Unknown subcommand: {subcmd}\n\nAvailable commands:\n  /schedule           - List all scheduled tasks\n  /schedule list      - List all scheduled tasks\n  /schedule enable <name>  - Enable a task\n  /schedule disable <name> - Disable a task",
-                "face": self._get_face_str(),
-                "status": self.personality.get_status_line(),
-                "error": True
-            }
+            return self._envelope(f"Unknown subcommand: {subcmd}\n\nAvailable commands:\n  /schedule           - List all scheduled tasks\n  /schedule list      - List all scheduled tasks\n  /schedule enable <name>  - Enable a task\n  /schedule disable <name> - Disable a task", error=True)
@@ -1,61 +1,80 @@
 """System and network commands."""
-from typing import Dict, Any
+from functools import lru_cache
+from typing import Dict, Any, Optional, Tuple
 
+from core.system_stats import get_all_stats
 from . import CommandHandler
 
 
+@lru_cache(maxsize=32)
+def _render_config(
+    providers: Tuple[str, ...],
+    primary: Optional[Tuple[str, str, int]],
+    tokens_used: int,
+    daily_limit: int,
+) -> str:
+    """Render the /config listing; cached until providers or token usage change."""
+    lines = ["AI CONFIGURATION", "", f"Providers: {', '.join(providers)}"]
+    if primary:
+        name, model, max_tokens = primary
+        lines.append(f"Primary:   {name}")
+        lines.append(f"Model:     {model}")
+        lines.append(f"Max tokens: {max_tokens}")
+    lines.append("")
+    lines.append(f"Budget: {tokens_used}/{daily_limit} tokens today")
+    return "\n".join(lines)
+
+
+# /wifiscan signal bars: (minimum strength %, icon), strongest first
+_SIGNAL_ICONS = ((80, "▂▄▆█"), (60, "▂▄▆"), (40, "▂▄"), (20, "▂"))
+
+
+def _signal_icon(strength: int) -> str:
+    """Visual signal indicator for a scan result."""
+    for threshold, icon in _SIGNAL_ICONS:
+        if strength >= threshold:
+            return icon
+    return "○"
+
+
+def _security_badge(security: str) -> str:
+    """Security badge for a scan result ("Open" is shouted)."""
+    return "[OPEN]" if security == "Open" else f"[{security}]"
+
+
 class SystemCommands(CommandHandler):
     """Handlers for system commands (/system, /config, /bash, /wifi, /btcfg, /wifiscan)."""
 
     def system(self) -> Dict[str, Any]:
         """Show system stats."""
-        from core import system_stats
-
-        stats = system_stats.get_all_stats()
-        response = "SYSTEM STATUS\n\n"
-        response += f"CPU:    {stats['cpu']}%\n"
-        response += f"Memory: {stats['memory']}%\n"
-
+        stats = get_all_stats()
         temp = stats['temperature']
-        if temp > 0:
-            response += f"Temp:   {temp}°C\n"
-        else:
-            response += f"Temp:   --°C\n"
+        lines = [
+            "SYSTEM STATUS",
+            "",
+            f"CPU:    {stats['cpu']}%",
+            f"Memory: {stats['memory']}%",
+            f"Temp:   {temp}°C" if temp > 0 else "Temp:   --°C",
+            f"Uptime: {stats['uptime']}",
+        ]
 
-        response += f"Uptime: {stats['uptime']}"
-
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope("\n".join(lines))
 
     def config(self) -> Dict[str, Any]:
         """Show AI configuration."""
-        response = "AI CONFIGURATION\n\n"
-        response += f"Providers: {', '.join(self.brain.available_providers)}\n"
-
-        if self.brain.providers:
-            primary = self.brain.providers[0]
-            response += f"Primary:   {primary.name}\n"
-            response += f"Model:     {primary.model}\n"
-            response += f"Max tokens: {primary.max_tokens}\n"
-
+        providers = self.brain.providers
+        primary = (providers[0].name, providers[0].model, providers[0].max_tokens) if providers else None
         stats = self.brain.get_stats()
-        response += f"\nBudget: {stats['tokens_used_today']}/{stats['daily_limit']} tokens today"
-
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(_render_config(
+            tuple(stats["providers"]),
+            primary,
+            stats["tokens_used_today"],
+            stats["daily_limit"],
+        ))
 
     def bash(self, args: str) -> Dict[str, Any]:
         """Disable bash execution in web UI."""
-        return {
-            "response": "The /bash command is disabled in the web UI.",
-            "error": True,
-        }
+        return self._error("The /bash command is disabled in the web UI.")
 
     def wifi(self) -> Dict[str, Any]:
         """Show WiFi status and saved networks."""
@@ -126,47 +145,20 @@ class SystemCommands(CommandHandler):
         current = get_current_wifi()
 
         if not networks:
-            return {
-                "response": "No networks found or permission denied.\n\n*Tip: Scanning requires sudo access*",
-                "face": self.personality.face,
-                "error": True,
-            }
-
-        output = [f"**Nearby Networks ({len(networks)})**\n"]
-
-        for net in networks:
-            # Visual signal indicator
-            if net.signal_strength >= 80:
-                signal_icon = "▂▄▆█"
-            elif net.signal_strength >= 60:
-                signal_icon = "▂▄▆"
-            elif net.signal_strength >= 40:
-                signal_icon = "▂▄"
-            elif net.signal_strength >= 20:
-                signal_icon = "▂"
-            else:
-                signal_icon = "○"
-
-            # Connection indicator
-            connected = current.connected and current.ssid == net.ssid
-            conn_icon = "●" if connected else " "
-
-            # Security badge
-            if net.security == "Open":
-                security_badge = "[OPEN]"
-            elif net.security == "WPA3":
-                security_badge = "[WPA3]"
-            elif net.security == "WPA2":
-                security_badge = "[WPA2]"
-            else:
-                security_badge = f"[{net.security}]"
-
-            output.append(f"{conn_icon} {signal_icon} {net.signal_strength:3}% {security_badge} {net.ssid}")
-
-        output.append("")
-        output.append("*Use /btcfg to start BLE configuration service*")
+            return self._error("No networks found or permission denied.\n\n*Tip: Scanning requires sudo access*", face=self.personality.face)
+
+        connected_ssid = current.ssid if current.connected else None
+        rows = "\n".join(
+            f"{'●' if net.ssid == connected_ssid else ' '} {_signal_icon(net.signal_strength)} "
+            f"{net.signal_strength:3}% {_security_badge(net.security)} {net.ssid}"
+            for net in networks
+        )
+        response = (
+            f"**Nearby Networks ({len(networks)})**\n\n{rows}\n\n"
+            "*Use /btcfg to start BLE configuration service*"
+        )
 
         return {
-            "response": "\n".join(output),
+            "response": response,
             "face": self.personality.face,
         }
@@ -1,21 +1,36 @@
 """Task management commands."""
+import io
 import re
+from datetime import datetime
 from typing import Dict, Any
 
 from core.tasks import Task, TaskStatus, Priority
 from . import CommandHandler
 
 
+# Usage replies for /task and the task-id commands
+USAGE_TASK = (
+    "Usage:\n"
+    "  /task <title>           - Create a new task\n"
+    "  /task <id>              - Show task details\n"
+    "  /task <title> !high     - Create high-priority task\n"
+    "  /task <title> #tag      - Create task with tag"
+)
+USAGE_DONE = "Usage: /done <task_id>\n\nUse '/tasks' to see task IDs"
+USAGE_CANCEL = "Usage: /cancel <task_id>\n\nUse '/tasks' to see task IDs"
+USAGE_DELETE = (
+    "Usage: /delete <task_id>\n\nUse '/tasks' to see task IDs\n\n"
+    "**WARNING: This permanently deletes the task!**"
+)
+
+
 class TaskCommands(CommandHandler):
     """Handlers for task commands (/tasks, /task, /done, /cancel, /delete, /taskstats)."""
 
     def tasks(self, args: str = "") -> Dict[str, Any]:
         """List tasks with optional filters."""
         if not self.task_manager:
-            return {
-                "response": "Task manager not available.",
-                "error": True
-            }
+            return self._error("Task manager not available.")
 
         # Parse arguments for filters
         status_filter = None
@@ -34,11 +49,7 @@ class TaskCommands(CommandHandler):
         )
 
         if not tasks:
-            return {
-                "response": "No tasks found. Use the Tasks page to create tasks, or /task <title> to create via chat.",
-                "face": self._get_face_str(),
-                "status": self.personality.get_status_line(),
-            }
+            return self._envelope("No tasks found. Use the Tasks page to create tasks, or /task <title> to create via chat.")
 
         # Priority icons
         priority_icons = {
@@ -48,8 +59,10 @@ class TaskCommands(CommandHandler):
             Priority.URGENT: "‼",
         }
 
-        # Format tasks list
-        response = "TASKS\n\n"
+        # Format tasks list (the task list is unbounded, so write into one buffer)
+        buf = io.StringIO()
+        write = buf.write
+        write("TASKS\n\n")
         for task in tasks:
             # Status emoji
             if task.status == TaskStatus.COMPLETED:
@@ -65,30 +78,23 @@ class TaskCommands(CommandHandler):
             # Overdue indicator
             overdue = " [OVERDUE]" if task.is_overdue else ""
 
-            response += f"{status_emoji} {priority_icon} [{task.id[:8]}] {task.title}{overdue}\n"
+            write(f"{status_emoji} {priority_icon} [{task.id[:8]}] {task.title}{overdue}\n")
             if task.description:
-                response += f"   {task.description[:60]}{'...' if len(task.description) > 60 else ''}\n"
+                write(f"   {task.description[:60]}{'...' if len(task.description) > 60 else ''}\n")
 
-        response += f"\nTotal: {len(tasks)} tasks"
+        write(f"\nTotal: {len(tasks)} tasks")
         if status_filter:
-            response += f" ({status_filter.value})"
+            write(f" ({status_filter.value})")
 
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(buf.getvalue())
 
     def task(self, args: str) -> Dict[str, Any]:
         """Create or show a task."""
         if not self.task_manager:
-            return {"response": "Task manager not available.", "error": True}
+            return self._error("Task manager not available.")
 
         if not args:
-            return {
-                "response": "Usage:\n  /task <title>           - Create a new task\n  /task <id>              - Show task details\n  /task <title> !high     - Create high-priority task\n  /task <title> #tag      - Create task with tag",
-                "face": self._get_face_str(),
-            }
+            return self._envelope(USAGE_TASK)
 
         # Check if it's a task ID (8 or 36 characters UUID)
         if len(args) in [8, 36] and "-" in args or args.count("-") >= 3:
@@ -104,9 +110,9 @@ class TaskCommands(CommandHandler):
                     resp = f"Multiple tasks match '{args}'. Be more specific:\n"
                     for t in matching[:5]:
                         resp += f"  {t.id[:16]} - {t.title}\n"
-                    return {"response": resp, "error": True}
+                    return self._error(resp)
                 else:
-                    return {"response": f"Task not found: {args}", "error": True}
+                    return self._error(f"Task not found: {args}")
 
             return self._format_task_details(task)
 
@@ -132,7 +138,7 @@ class TaskCommands(CommandHandler):
         title = re.sub(r'#\w+', '', title).strip()
 
         if not title:
-            return {"response": "Task title cannot be empty", "error": True}
+            return self._error("Task title cannot be empty")
 
         # Create task
         task = self.task_manager.create_task(
@@ -159,22 +165,15 @@ class TaskCommands(CommandHandler):
         if result and result.get('xp_awarded'):
             response += f"\n+{result['xp_awarded']} XP"
 
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(response)
 
     def done(self, args: str) -> Dict[str, Any]:
         """Mark a task as complete."""
         if not self.task_manager:
-            return {"response": "Task manager not available.", "error": True}
+            return self._error("Task manager not available.")
 
         if not args:
-            return {
-                "response": "Usage: /done <task_id>\n\nUse '/tasks' to see task IDs",
-                "error": True
-            }
+            return self._error(USAGE_DONE)
 
         # Find task
         task = self.task_manager.get_task(args)
@@ -188,15 +187,12 @@ class TaskCommands(CommandHandler):
                 resp = f"Multiple tasks match. Be more specific:\n"
                 for t in matching[:5]:
                     resp += f"  {t.id[:16]} - {t.title}\n"
-                return {"response": resp, "error": True}
+                return self._error(resp)
             else:
-                return {"response": f"Task not found: {args}", "error": True}
+                return self._error(f"Task not found: {args}")
 
         if task.status == TaskStatus.COMPLETED:
-            return {
-                "response": "Task already completed!",
-                "face": self._get_face_str(),
-            }
+            return self._envelope("Task already completed!")
 
         # Complete the task
         task = self.task_manager.complete_task(task.id)
@@ -230,22 +226,15 @@ class TaskCommands(CommandHandler):
         xp_current = self.personality.progression.xp
         response += f"\n\nLevel {level} | {xp_current} XP"
 
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(response)
 
     def cancel(self, args: str) -> Dict[str, Any]:
         """Cancel a task."""
         if not self.task_manager:
-            return {"response": "Task manager not available.", "error": True}
+            return self._error("Task manager not available.")
 
         if not args:
-            return {
-                "response": "Usage: /cancel <task_id>\n\nUse '/tasks' to see task IDs",
-                "error": True
-            }
+            return self._error(USAGE_CANCEL)
 
         # Find task
         task = self.task_manager.get_task(args)
@@ -259,36 +248,26 @@ class TaskCommands(CommandHandler):
                 resp = f"Multiple tasks match. Be more specific:\n"
                 for t in matching[:5]:
                     resp += f"  {t.id[:16]} - {t.title}\n"
-                return {"response": resp, "error": True}
+                return self._error(resp)
             else:
-                return {"response": f"Task not found: {args}", "error": True}
+                return self._error(f"Task not found: {args}")
 
         if task.status == TaskStatus.CANCELLED:
-            return {
-                "response": "Task already cancelled!",
-                "face": self._get_face_str(),
-            }
+            return self._envelope("Task already cancelled!")
 
         # Cancel the task
         task.status = TaskStatus.CANCELLED
         self.task_manager.update_task(task)
 
-        return {
-            "response": f"✗ Task cancelled\n\n**{task.title}**",
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(f"✗ Task cancelled\n\n**{task.title}**")
 
     def delete(self, args: str) -> Dict[str, Any]:
         """Delete a task permanently."""
         if not self.task_manager:
-            return {"response": "Task manager not available.", "error": True}
+            return self._error("Task manager not available.")
 
         if not args:
-            return {
-                "response": "Usage: /delete <task_id>\n\nUse '/tasks' to see task IDs\n\n**WARNING: This permanently deletes the task!**",
-                "error": True
-            }
+            return self._error(USAGE_DELETE)
 
         # Find task
         task = self.task_manager.get_task(args)
@@ -302,29 +281,22 @@ class TaskCommands(CommandHandler):
                 resp = f"Multiple tasks match. Be more specific:\n"
                 for t in matching[:5]:
                     resp += f"  {t.id[:16]} - {t.title}\n"
-                return {"response": resp, "error": True}
+                return self._error(resp)
             else:
-                return {"response": f"Task not found: {args}", "error": True}
+                return self._error(f"Task not found: {args}")
 
         # Delete the task
         success = self.task_manager.delete_task(task.id)
 
         if success:
-            return {
-                "response": f"🗑 Task deleted permanently\n\n**{task.title}**",
-                "face": self._get_face_str(),
-                "status": self.personality.get_status_line(),
-            }
+            return self._envelope(f"🗑 Task deleted permanently\n\n**{task.title}**")
         else:
-            return {"response": "Failed to delete task", "error": True}
+            return self._error("Failed to delete task")
 
     def taskstats(self) -> Dict[str, Any]:
         """Show task statistics."""
         if not self.task_manager:
-            return {
-                "response": "Task manager not available.",
-                "error": True
-            }
+            return self._error("Task manager not available.")
 
         stats = self.task_manager.get_stats()
 
@@ -358,16 +330,10 @@ class TaskCommands(CommandHandler):
             streak_emoji = "🔥" if streak >= 7 else "✨"
             response += f"  {streak_emoji} {streak} day streak\n"
 
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(response)
 
     def _format_task_details(self, task: Task) -> Dict[str, Any]:
         """Format detailed task information."""
-        from datetime import datetime
-
         response = "**TASK DETAILS**\n\n"
         response += f"**{task.title}**\n\n"
         response += f"ID: `{task.id}`\n"
@@ -407,8 +373,4 @@ class TaskCommands(CommandHandler):
             completed = datetime.fromtimestamp(task.completed_at).strftime("%Y-%m-%d %H:%M")
             response += f"Completed: {completed}\n"
 
-        return {
-            "response": response,
-            "face": self._get_face_str(),
-            "status": self.personality.get_status_line(),
-        }
+        return self._envelope(response)
@@ -1,7 +1,10 @@
 """Utility commands (thoughts, find, memory, settings, backup, journal)."""
+import shutil
+from datetime import datetime
 from pathlib import Path
 from typing import Dict, Any
 
+from core.memory import MemoryStore
 from . import CommandHandler
 
 
@@ -43,7 +46,7 @@ class UtilityCommands(CommandHandler):
             return {"response": "Usage: `/find <keyword>`", "face": self.personality.face}
 
         if not self.task_manager:
-            return {"response": "Task manager not available.", "face": self.personality.face, "error": True}
+            return self._error("Task manager not available.", face=self.personality.face)
 
         query = args.strip().lower()
         all_tasks = self.task_manager.list_tasks()
@@ -75,8 +78,6 @@ class UtilityCommands(CommandHandler):
 
     def memory(self) -> Dict[str, Any]:
         """Show memory stats and recent entries."""
-        from core.memory import MemoryStore
-
         store = self.memory_store or MemoryStore()
         owns_store = self.memory_store is None
         try:
@@ -125,12 +126,9 @@ class UtilityCommands(CommandHandler):
 
     def backup(self) -> Dict[str, Any]:
         """Create a backup of Inkling data."""
-        import shutil
-        from datetime import datetime
-
         data_dir = Path("~/.inkling").expanduser()
         if not data_dir.exists():
-            return {"response": "No data directory found.", "face": self.personality.face, "error": True}
+            return self._error("No data directory found.", face=self.personality.face)
 
         timestamp = datetime.now().strftime("%Y%m%d_%H%M%S")
         backup_name = f"inkling_backup_{timestamp}"
@@ -149,7 +147,7 @@ class UtilityCommands(CommandHandler):
                 "face": "happy",
             }
         except Exception as e:
-            return {"response": f"Backup failed: {e}", "face": self.personality.face, "error": True}
+            return self._error(f"Backup failed: {e}", face=self.personality.face)
 
     def journal(self) -> Dict[str, Any]:
         """Show recent journal entries."""
@@ -0,0 +1,402 @@
+// Inkling web UI - files page script.
+let currentPath = '';
+let currentStorage = 'inkling';  // Track current storage location
+const statusEl = document.getElementById('status');
+const thoughtEl = document.getElementById('thought');
+
+// Apply saved theme with auto day/night support
+function getAutoTheme() {
+    const hour = new Date().getHours();
+    return (hour >= 20 || hour < 7) ? 'midnight' : 'cream';
+}
+const themeAuto = localStorage.getItem('inklingThemeAuto') === 'true';
+const theme = themeAuto ? getAutoTheme() : (localStorage.getItem('inklingTheme') || 'cream');
+document.documentElement.setAttribute('data-theme', theme);
+console.log('Theme initialized:', theme, 'Auto:', themeAuto);
+// Re-check auto theme every 5 minutes
+if (themeAuto) {
+    setInterval(() => {
+        const newTheme = getAutoTheme();
+        document.documentElement.setAttribute('data-theme', newTheme);
+        console.log('Auto theme updated:', newTheme);
+    }, 300000);
+}
+
+// Long-poll /api/state like the chat page: once we hold the current
+// ETag the server answers only when the state changes (or with a 304
+// after ~10s).
+let stateEtag = '';
+async function updateHeader() {
+    let delay = 0;
+    try {
+        const resp = await fetch(stateEtag ? '/api/state?wait=10' : '/api/state', {
+            headers: stateEtag ? {'If-None-Match': stateEtag} : {}
+        });
+        // Pause after a 304, longer if the server asks us to back off
+        delay = (Number(resp.headers.get('Retry-After')) || 1) * 1000;
+        if (resp.status !== 304) {
+            if (!resp.ok) throw new Error('HTTP ' + resp.status);
+            const data = await resp.json();
+            if (data.face) document.getElementById('face').textContent = data.face;
+            if (statusEl) statusEl.textContent = data.status || '';
+            if (thoughtEl) thoughtEl.textContent = data.thought || '';
+            stateEtag = resp.headers.get('ETag') || '';
+            delay = stateEtag ? 1000 : 5000;
+        }
+    } catch (e) {
+        delay = 5000;
+    }
+    setTimeout(updateHeader, delay);
+}
+
+updateHeader();
+
+function switchStorage() {
+    currentStorage = document.getElementById('storageSelect').value;
+    console.log('Switched to storage:', currentStorage);
+    loadFiles('');  // Reload from root of new storage
+}
+
+async function loadFiles(path = '') {
+    try {
+        console.log('Loading files from path:', path, 'storage:', currentStorage);
+        const response = await fetch(`/api/files/list?storage=${encodeURIComponent(currentStorage)}&path=${encodeURIComponent(path)}`);
+        const data = await response.json();
+        console.log('Received data:', data);
+
+        if (data.error) {
+            showError(data.error);
+            // Still show empty state
+            const errorLi = document.createElement('li');
+            errorLi.className = 'empty-state';
+            errorLi.textContent = 'Error: ' + data.error;
+            const fileList = document.getElementById('file-list');
+            fileList.innerHTML = '';
+            fileList.appendChild(errorLi);
+            return;
+        }
+
+        currentPath = data.path || '';
+        updateBreadcrumb(currentPath);
+        renderFileList(data.items);
+
+    } catch (error) {
+        console.error('Load files error:', error);
+        showError('Failed to load files: ' + error.message);
+        document.getElementById('file-list').innerHTML = '<li class="empty-state">Failed to load files</li>';
+    }
+}
+
+function updateBreadcrumb(path) {
+    const breadcrumb = document.getElementById('breadcrumb');
+
+    // Get storage root label
+    const storageRoot = currentStorage === 'inkling' ? '~/.inkling/' : 'SD Card/';
+
+    // Path segments are set as text, never parsed as markup
+    function crumb(label, target) {
+        const link = document.createElement('a');
+        link.href = '#';
+        link.textContent = label;
+        link.addEventListener('click', (e) => {
+            e.preventDefault();
+            loadFiles(target);
+        });
+        return link;
+    }
+
+    const nodes = [crumb(storageRoot, '')];
+    let buildPath = '';
+    (path || '').split('/').forEach(part => {
+        if (!part) return;
+        buildPath += (buildPath ? '/' : '') + part;
+        nodes.push(' / ', crumb(part, buildPath));
+    });
+    breadcrumb.replaceChildren(...nodes);
+}
+
+function renderFileList(items) {
+    const list = document.getElementById('file-list');
+
+    if (items.length === 0) {
+        list.innerHTML = `
+            <li class="empty-state">
+                <div style="padding: 2rem;">
+                    <p style="margin-bottom: 1rem;">📁 No files found in this directory</p>
+                    <p style="font-size: 0.9em; color: var(--muted);">
+                        Only .txt, .md, .csv, .json, and .log files are shown.<br>
+                        System files (.db, .pyc) are hidden.
+                    </p>
+                </div>
+            </li>
+        `;
+        return;
+    }
+
+    const itemTpl = document.getElementById('file-item-tpl').content;
+    const actionsTpl = document.getElementById('file-actions-tpl').content;
+    const fragment = document.createDocumentFragment();
+
+    function fileRow(name, meta, isDir) {
+        const li = itemTpl.firstElementChild.cloneNode(true);
+        const nameEl = li.querySelector('.file-name');
+        if (isDir) {
+            li.classList.add('directory');
+            nameEl.classList.add('directory');
+        }
+        nameEl.textContent = name;
+        li.querySelector('.file-meta').textContent = meta;
+        return li;
+    }
+
+    // Add parent directory link if not at root
+    if (currentPath) {
+        const parentPath = currentPath.split('/').slice(0, -1).join('/');
+        const li = fileRow('📁 ..', 'Parent directory', true);
+        li.onclick = () => loadFiles(parentPath);
+        fragment.appendChild(li);
+    }
+
+    // Render items
+    items.forEach(item => {
+        // File type icons
+        let icon = '📄';
+        if (item.type === 'dir') {
+            icon = '📁';
+        } else if (item.name.endsWith('.txt')) {
+            icon = '📄';
+        } else if (item.name.endsWith('.md')) {
+            icon = '📝';
+        } else if (item.name.endsWith('.json')) {
+            icon = '📊';
+        } else if (item.name.endsWith('.log')) {
+            icon = '📋';
+        } else if (item.name.endsWith('.csv')) {
+            icon = '📊';
+        }
+        const size = item.type === 'file' ? formatSize(item.size) : '';
+        const date = new Date(item.modified * 1000).toLocaleString();
+
+        const li = fileRow(`${icon} ${item.name}`, `${size} ${size && date ? '•' : ''} ${date}`, item.type === 'dir');
+
+        if (item.type === 'dir') {
+            li.onclick = () => loadFiles(item.path);
+        } else {
+            const actions = actionsTpl.firstElementChild.cloneNode(true);
+            actions.querySelector('[data-action="view"]').onclick = (e) => viewFile(item.path, e);
+            actions.querySelector('[data-action="edit"]').onclick = (e) => editFile(item.path, e);
+            actions.querySelector('[data-action="delete"]').onclick = (e) => deleteFile(item.path, item.name, e);
+            actions.querySelector('a').href = `/api/files/download?storage=${encodeURIComponent(currentStorage)}&path=${encodeURIComponent(item.path)}`;
+            li.appendChild(actions);
+        }
+
+        fragment.appendChild(li);
+    });
+
+    list.replaceChildren(fragment);
+}
+
+async function viewFile(path, event) {
+    event.stopPropagation();
+
+    try {
+        const response = await fetch(`/api/files/view?storage=${encodeURIComponent(currentStorage)}&path=${encodeURIComponent(path)}`);
+        const data = await response.json();
+
+        if (data.error) {
+            showError(data.error);
+            return;
+        }
+
+        document.getElementById('modal-title').textContent = data.name;
+        document.getElementById('file-content').textContent = data.content;
+        document.getElementById('file-modal').classList.add('active');
+
+    } catch (error) {
+        showError('Failed to view file: ' + error.message);
+    }
+}
+
+function closeModal() {
+    document.getElementById('file-modal').classList.remove('active');
+    // Clean up edit mode
+    const contentEl = document.getElementById('file-content');
+    contentEl.contentEditable = false;
+    contentEl.classList.remove('editable');
+    const modal = document.getElementById('file-modal');
+    const actionsDiv = modal.querySelector('.modal-actions');
+    if (actionsDiv) {
+        actionsDiv.remove();
+    }
+}
+
+let editMode = false;
+let currentEditPath = null;
+
+async function editFile(path, event) {
+    event.stopPropagation();
+
+    try {
+        const response = await fetch(`/api/files/view?storage=${encodeURIComponent(currentStorage)}&path=${encodeURIComponent(path)}`);
+        const data = await response.json();
+
+        if (data.error) {
+            showError(data.error);
+            return;
+        }
+
+        editMode = true;
+        currentEditPath = path;
+
+        document.getElementById('modal-title').textContent = data.name + ' (Editing)';
+        const contentEl = document.getElementById('file-content');
+        contentEl.contentEditable = true;
+        contentEl.classList.add('editable');
+        contentEl.textContent = data.content;
+
+        // Add save/cancel buttons
+        const modal = document.getElementById('file-modal');
+        let actionsDiv = modal.querySelector('.modal-actions');
+        if (!actionsDiv) {
+            actionsDiv = document.createElement('div');
+            actionsDiv.className = 'modal-actions';
+            modal.querySelector('.modal-content').appendChild(actionsDiv);
+        }
+        actionsDiv.innerHTML = `
+            <button class="btn" onclick="saveFile()">Save</button>
+            <button class="btn" onclick="cancelEdit()">Cancel</button>
+        `;
+
+        modal.classList.add('active');
+
+    } catch (error) {
+        showError('Failed to load file for editing: ' + error.message);
+    }
+}
+
+async function saveFile() {
+    if (!editMode || !currentEditPath) return;
+
+    const content = document.getElementById('file-content').textContent;
+
+    try {
+        const response = await fetch(`/api/files/edit?storage=${encodeURIComponent(currentStorage)}&path=${encodeURIComponent(currentEditPath)}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ content })
+        });
+
+        const data = await response.json();
+
+        if (data.error) {
+            showError(data.error);
+            return;
+        }
+
+        showSuccess('File saved successfully!');
+        cancelEdit();
+
+    } catch (error) {
+        showError('Failed to save file: ' + error.message);
+    }
+}
+
+function cancelEdit() {
+    editMode = false;
+    currentEditPath = null;
+    closeModal();
+}
+
+async function deleteFile(path, name, event) {
+    event.stopPropagation();
+
+    // Show confirmation dialog
+    const overlay = document.createElement('div');
+    overlay.className = 'confirm-dialog-overlay';
+
+    const dialog = document.getElementById('delete-dialog-tpl').content.firstElementChild.cloneNode(true);
+    dialog.querySelector('.delete-name').textContent = name;
+    dialog.querySelector('[data-action="cancel"]').addEventListener('click', () => {
+        dialog.remove();
+        overlay.remove();
+    });
+    const deleteBtn = dialog.querySelector('[data-action="delete"]');
+    deleteBtn.addEventListener('click', () => confirmDelete(path, deleteBtn));
+
+    document.body.appendChild(overlay);
+    document.body.appendChild(dialog);
+}
+
+async function confirmDelete(path, button) {
+    try {
+        const response = await fetch(`/api/files/delete?storage=${encodeURIComponent(currentStorage)}&path=${encodeURIComponent(path)}`, {
+            method: 'POST',
+            headers: {
+                'Content-Type': 'application/json',
+            },
+            body: JSON.stringify({ confirmed: true })
+        });
+
+        const data = await response.json();
+
+        if (data.error) {
+            showError(data.error);
+            return;
+        }
+
+        showSuccess(data.message);
+
+        // Close dialog
+        button.closest('.confirm-dialog').remove();
+        document.querySelector('.confirm-dialog-overlay').remove();
+
+        // Reload file list
+        loadFiles(currentPath);
+
+    } catch (error) {
+        showError('Failed to delete file: ' + error.message);
+    }
+}
+
+function formatSize(bytes) {
+    if (bytes === 0) return '0 B';
+    const k = 1024;
+    const sizes = ['B', 'KB', 'MB', 'GB'];
+    const i = Math.floor(Math.log(bytes) / Math.log(k));
+    return Math.round(bytes / Math.pow(k, i) * 100) / 100 + ' ' + sizes[i];
+}
+
+function showError(message) {
+    const container = document.getElementById('error-container');
+    const errorDiv = document.createElement('div');
+    errorDiv.className = 'error';
+    errorDiv.textContent = message;
+    container.innerHTML = '';
+    container.appendChild(errorDiv);
+    setTimeout(() => {
+        container.innerHTML = '';
+    }, 5000);
+}
+
+function showSuccess(message) {
+    const container = document.getElementById('error-container');
+    const successDiv = document.createElement('div');
+    successDiv.className = 'success';
+    successDiv.textContent = message;
+    container.replaceChildren(successDiv);
+    setTimeout(() => {
+        container.innerHTML = '';
+    }, 3000);
+}
+
+// Close modal on background click
+document.getElementById('file-modal').addEventListener('click', (e) => {
+    if (e.target.id === 'file-modal') {
+        closeModal();
+    }
+});
+
+// Load files on page load
+loadFiles();
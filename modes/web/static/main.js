@@ -0,0 +1,331 @@
+// Inkling web UI - chat page script. Loaded at the end of <body>.
+// Apply saved theme with auto day/night support
+function getAutoTheme() {
+    const hour = new Date().getHours();
+    return (hour >= 20 || hour < 7) ? 'midnight' : 'cream';
+}
+const themeAuto = localStorage.getItem('inklingThemeAuto') === 'true';
+const savedTheme = themeAuto ? getAutoTheme() : (localStorage.getItem('inklingTheme') || 'cream');
+document.documentElement.setAttribute('data-theme', savedTheme);
+console.log('Theme initialized:', savedTheme, 'Auto:', themeAuto);
+// Re-check auto theme every 5 minutes
+if (themeAuto) {
+    setInterval(() => {
+        const newTheme = getAutoTheme();
+        document.documentElement.setAttribute('data-theme', newTheme);
+        console.log('Auto theme updated:', newTheme);
+    }, 300000);
+}
+
+const messagesEl = document.getElementById('messages');
+const inputEl = document.getElementById('input');
+const sendBtn = document.getElementById('send');
+const faceEl = document.getElementById('face');
+const statusEl = document.getElementById('status');
+const thoughtEl = document.getElementById('thought');
+const connDot = document.getElementById('conn-dot');
+const focusTakeoverEl = document.getElementById('focus-takeover');
+const focusPhaseEl = document.getElementById('focus-phase');
+const focusTimerEl = document.getElementById('focus-timer');
+const focusTaskEl = document.getElementById('focus-task');
+const focusProgressFillEl = document.getElementById('focus-progress-fill');
+
+// Handle enter key
+inputEl.addEventListener('keypress', (e) => {
+    if (e.key === 'Enter') sendMessage();
+});
+
+// --- Toast notification system ---
+function showToast(message, type, duration) {
+    type = type || 'info';
+    duration = duration || 3000;
+    const container = document.getElementById('toast-container');
+    const toast = document.createElement('div');
+    toast.className = 'toast ' + type;
+    toast.textContent = message;
+    container.appendChild(toast);
+    setTimeout(function() { toast.classList.add('show'); }, 10);
+    setTimeout(function() {
+        toast.classList.remove('show');
+        setTimeout(function() { toast.remove(); }, 300);
+    }, duration);
+}
+
+// --- Markdown rendering ---
+function renderMarkdown(text) {
+    let html = escapeHtml(text);
+    // Code blocks (``` ... ```)
+    html = html.replace(/```(\w*)\n([\s\S]*?)```/g, function(m, lang, code) {
+        return '<pre><code>' + code.trim() + '</code></pre>';
+    });
+    // Inline code
+    html = html.replace(/`([^`]+)`/g, '<code>$1</code>');
+    // Bold
+    html = html.replace(/\*\*(.+?)\*\*/g, '<strong>$1</strong>');
+    // Italic
+    html = html.replace(/\*(.+?)\*/g, '<em>$1</em>');
+    // Headers (must be at start of line)
+    html = html.replace(/^### (.+)$/gm, '<h3>$1</h3>');
+    html = html.replace(/^## (.+)$/gm, '<h2>$1</h2>');
+    html = html.replace(/^# (.+)$/gm, '<h1>$1</h1>');
+    // Blockquote
+    html = html.replace(/^&gt; (.+)$/gm, '<blockquote>$1</blockquote>');
+    // Unordered list items
+    html = html.replace(/^[-*] (.+)$/gm, '<li>$1</li>');
+    html = html.replace(/(<li>.*<\/li>\n?)+/g, '<ul>$&</ul>');
+    // Line breaks (but not inside pre blocks)
+    html = html.replace(/\n/g, '<br>');
+    // Clean up extra <br> around block elements
+    html = html.replace(/<br>\s*(<\/?(?:pre|ul|ol|li|blockquote|h[1-3]))/g, '$1');
+    html = html.replace(/(<\/(?:pre|ul|ol|li|blockquote|h[1-3])>)\s*<br>/g, '$1');
+    return html;
+}
+
+// --- Chat message sending ---
+// Each message gets an id that is reused if the request has to be resent,
+// so the server answers a retry with the reply already in progress.
+// crypto.randomUUID() needs a secure context, which plain-HTTP LAN access isn't.
+function newRequestId() {
+    if (window.crypto && crypto.randomUUID) return crypto.randomUUID();
+    return Date.now().toString(36) + Math.random().toString(36).slice(2);
+}
+
+async function postChat(body) {
+    try {
+        return await fetch('/api/chat', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: body
+        });
+    } catch (e) {
+        // One retry on a dropped connection; the shared request_id keeps the
+        // server from asking the AI twice
+        return fetch('/api/chat', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: body
+        });
+    }
+}
+
+async function sendMessage() {
+    const text = inputEl.value.trim();
+    if (!text) return;
+
+    inputEl.value = '';
+    sendBtn.disabled = true;
+
+    addMessage('user', text);
+    showTypingIndicator();
+
+    try {
+        const resp = await postChat(JSON.stringify({message: text, request_id: newRequestId()}));
+        const data = await resp.json();
+
+        hideTypingIndicator();
+
+        if (data.error) {
+            addMessage('assistant', 'Error: ' + data.error);
+            showToast('Error: ' + data.error, 'error');
+        } else {
+            addMessage('assistant', data.response, data.meta);
+            updateState(data);
+        }
+    } catch (e) {
+        hideTypingIndicator();
+        addMessage('assistant', 'Connection error: ' + e.message);
+        showToast('Connection lost', 'error');
+    }
+
+    sendBtn.disabled = false;
+    inputEl.focus();
+}
+
+async function runCommand(cmd) {
+    sendBtn.disabled = true;
+
+    try {
+        const resp = await fetch('/api/command', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify({command: cmd})
+        });
+        const data = await resp.json();
+
+        if (data.error) {
+            addMessage('system', 'Error: ' + data.error);
+        } else {
+            addMessage('system', data.response);
+            updateState(data);
+        }
+    } catch (e) {
+        addMessage('system', 'Connection error: ' + e.message);
+        showToast('Connection lost', 'error');
+    }
+
+    sendBtn.disabled = false;
+}
+
+function sendCommand(cmd) {
+    inputEl.value = cmd;
+    sendMessage();
+}
+
+// Reading scrollHeight forces a layout, so scroll at most once per animation
+// frame instead of once per inserted bubble.
+let scrollPending = false;
+function scrollToBottom() {
+    if (scrollPending) return;
+    scrollPending = true;
+    requestAnimationFrame(function() {
+        scrollPending = false;
+        messagesEl.scrollTop = messagesEl.scrollHeight;
+    });
+}
+
+function addMessage(role, text, meta) {
+    const div = document.createElement('div');
+    div.className = 'message ' + role;
+
+    // Check if same sender as previous message for grouping
+    const lastMsg = messagesEl.lastElementChild;
+    if (lastMsg && lastMsg.classList.contains(role)) {
+        div.classList.add('same-sender');
+    }
+
+    // Markdown for assistant messages; user/system text is set as plain text,
+    // so the browser never parses it as HTML and nothing needs escaping
+    const textDiv = document.createElement('div');
+    textDiv.className = 'text';
+    if (role === 'assistant') {
+        textDiv.innerHTML = renderMarkdown(text);
+    } else {
+        textDiv.textContent = text;
+    }
+    div.appendChild(textDiv);
+    if (meta) {
+        const metaDiv = document.createElement('div');
+        metaDiv.className = 'meta';
+        metaDiv.textContent = meta;
+        div.appendChild(metaDiv);
+    }
+    messagesEl.appendChild(div);
+    scrollToBottom();
+}
+
+function showTypingIndicator() {
+    const div = document.createElement('div');
+    div.className = 'message assistant';
+    div.id = 'typing-indicator';
+    div.innerHTML = '<div class="typing-indicator"><span></span><span></span><span></span></div>';
+    messagesEl.appendChild(div);
+    scrollToBottom();
+}
+
+function hideTypingIndicator() {
+    const indicator = document.getElementById('typing-indicator');
+    if (indicator) indicator.remove();
+}
+
+function updateState(data) {
+    if (data.face && faceEl) faceEl.textContent = data.face;
+    if (data.status && statusEl) statusEl.textContent = data.status;
+    if (data.thought !== undefined && thoughtEl) thoughtEl.textContent = data.thought || '';
+    if (data.focus !== undefined) updateFocusTakeover(data.focus);
+}
+
+function formatTimer(sec) {
+    sec = Math.max(0, Math.floor(sec || 0));
+    const mm = Math.floor(sec / 60);
+    const ss = sec % 60;
+    return String(mm).padStart(2, '0') + ':' + String(ss).padStart(2, '0');
+}
+
+function updateFocusTakeover(focus) {
+    const active = !!(focus && focus.focus_active && focus.takeover_enabled !== false);
+    if (!active) {
+        focusTakeoverEl.classList.remove('active');
+        messagesEl.style.display = 'block';
+        return;
+    }
+    focusTakeoverEl.classList.add('active');
+    messagesEl.style.display = 'none';
+    focusPhaseEl.textContent = focus.focus_phase || 'FOCUS';
+    focusTimerEl.textContent = formatTimer(focus.focus_remaining_sec || 0);
+    focusTaskEl.textContent = focus.focus_task_label ? ('Task: ' + focus.focus_task_label) : '';
+    const pct = Math.max(0, Math.min(100, Math.round((focus.focus_progress || 0) * 100)));
+    focusProgressFillEl.style.width = pct + '%';
+}
+
+const HTML_ESCAPES = {'&': '&amp;', '<': '&lt;', '>': '&gt;', '"': '&quot;', "'": '&#39;'};
+function escapeHtml(text) {
+    return String(text).replace(/[&<>"']/g, c => HTML_ESCAPES[c]);
+}
+
+// --- Chat search ---
+function toggleSearch() {
+    const bar = document.getElementById('search-bar');
+    bar.classList.toggle('visible');
+    if (bar.classList.contains('visible')) {
+        document.getElementById('search-input').focus();
+    } else {
+        clearSearch();
+    }
+}
+
+function filterMessages(query) {
+    const q = query.toLowerCase();
+    document.querySelectorAll('.message').forEach(function(msg) {
+        const text = msg.textContent.toLowerCase();
+        msg.classList.toggle('hidden', q.length > 0 && text.indexOf(q) === -1);
+    });
+}
+
+function clearSearch() {
+    document.getElementById('search-input').value = '';
+    document.querySelectorAll('.message.hidden').forEach(function(msg) {
+        msg.classList.remove('hidden');
+    });
+    document.getElementById('search-bar').classList.remove('visible');
+}
+
+// --- Connection indicator + state long-polling ---
+// Once we hold the current ETag, the server parks the request until the
+// state changes (or ~10s pass and it answers 304), so updates show up
+// immediately without a fixed polling interval. If too many tabs are
+// already waiting, the server answers 304 at once with a Retry-After.
+let wasOffline = false;
+let stateEtag = '';
+async function pollState() {
+    let delay = 0;
+    try {
+        const resp = await fetch(stateEtag ? '/api/state?wait=10' : '/api/state', {
+            headers: stateEtag ? {'If-None-Match': stateEtag} : {}
+        });
+        // Pause after a 304, longer if the server asks us to back off
+        delay = (Number(resp.headers.get('Retry-After')) || 1) * 1000;
+        if (resp.status !== 304) {
+            if (!resp.ok) throw new Error('HTTP ' + resp.status);
+            updateState(await resp.json());
+            stateEtag = resp.headers.get('ETag') || '';
+            delay = stateEtag ? 1000 : 5000;  // Don't spin on rapid changes
+        }
+        connDot.classList.remove('offline');
+        connDot.title = 'Connected';
+        if (wasOffline) {
+            showToast('Reconnected', 'success');
+            wasOffline = false;
+        }
+    } catch (e) {
+        delay = 5000;
+        connDot.classList.add('offline');
+        connDot.title = 'Disconnected';
+        if (!wasOffline) {
+            showToast('Connection lost', 'error', 5000);
+            wasOffline = true;
+        }
+    }
+    setTimeout(pollState, delay);
+}
+// The page shell is static and cached; fill in live state right away
+pollState();
@@ -0,0 +1,291 @@
+// Inkling web UI - settings page script. Reads its data from #settings-data.
+// Load and apply saved theme with auto day/night support
+function getAutoTheme() {
+    const hour = new Date().getHours();
+    return (hour >= 20 || hour < 7) ? 'midnight' : 'cream';
+}
+const themeAutoEnabled = localStorage.getItem('inklingThemeAuto') === 'true';
+const savedTheme = themeAutoEnabled ? getAutoTheme() : (localStorage.getItem('inklingTheme') || 'cream');
+document.documentElement.setAttribute('data-theme', savedTheme);
+// FIX: Set dropdown to match the actually applied theme
+document.getElementById('theme').value = savedTheme;
+document.getElementById('theme-auto').checked = themeAutoEnabled;
+if (themeAutoEnabled) {
+    document.getElementById('theme').disabled = true;
+}
+// Debug: log the applied theme
+console.log('Theme applied:', savedTheme, 'Auto:', themeAutoEnabled);
+
+// Update theme status indicator
+function updateThemeStatus() {
+    const statusDiv = document.getElementById('theme-status');
+    const currentTheme = document.documentElement.getAttribute('data-theme') || 'cream';
+    const isAuto = localStorage.getItem('inklingThemeAuto') === 'true';
+    const themeName = document.querySelector(`#theme option[value="${currentTheme}"]`)?.textContent || currentTheme;
+    statusDiv.textContent = `Currently active: ${themeName}${isAuto ? ' (auto-selected)' : ''}`;
+}
+updateThemeStatus();
+
+const faceEl = document.getElementById('face');
+const statusEl = document.getElementById('status');
+const thoughtEl = document.getElementById('thought');
+
+// Theme change handler
+document.getElementById('theme').addEventListener('change', function() {
+    const theme = this.value;
+    document.documentElement.setAttribute('data-theme', theme);
+    localStorage.setItem('inklingTheme', theme);
+    updateThemeStatus();
+});
+
+// Auto-theme toggle
+document.getElementById('theme-auto').addEventListener('change', function() {
+    const auto = this.checked;
+    localStorage.setItem('inklingThemeAuto', auto ? 'true' : 'false');
+    document.getElementById('theme').disabled = auto;
+    if (auto) {
+        const hour = new Date().getHours();
+        const autoTheme = (hour >= 20 || hour < 7) ? 'midnight' : 'cream';
+        document.documentElement.setAttribute('data-theme', autoTheme);
+        localStorage.setItem('inklingTheme', autoTheme);
+        document.getElementById('theme').value = autoTheme;
+    }
+    updateThemeStatus();
+});
+
+// Reset theme button
+document.getElementById('reset-theme').addEventListener('click', function() {
+    // Clear all theme settings
+    localStorage.removeItem('inklingTheme');
+    localStorage.removeItem('inklingThemeAuto');
+    // Set to default
+    document.documentElement.setAttribute('data-theme', 'cream');
+    document.getElementById('theme').value = 'cream';
+    document.getElementById('theme-auto').checked = false;
+    document.getElementById('theme').disabled = false;
+    updateThemeStatus();
+    console.log('Theme reset to default (cream)');
+});
+
+// Restart button
+document.getElementById('restart-btn').addEventListener('click', async function() {
+    if (!confirm('⚠️ Restart Device?\n\nThis will restart the Inkling service and reboot the device. It will take about 30 seconds to come back online.\n\nContinue?')) {
+        return;
+    }
+
+    const btn = this;
+    btn.disabled = true;
+    btn.textContent = '⏳ Restarting...';
+
+    try {
+        const response = await fetch('/api/system/restart', { method: 'POST' });
+        const data = await response.json();
+
+        if (response.ok) {
+            btn.textContent = '✅ Restarting! Reconnecting in 30s...';
+            btn.style.background = '#5cb85c';
+
+            // Show countdown
+            let countdown = 30;
+            const interval = setInterval(() => {
+                countdown--;
+                btn.textContent = `⏳ Reconnecting in ${countdown}s...`;
+                if (countdown <= 0) {
+                    clearInterval(interval);
+                    window.location.reload();
+                }
+            }, 1000);
+        } else {
+            throw new Error(data.error || 'Restart failed');
+        }
+    } catch (err) {
+        alert('❌ Restart failed: ' + err.message);
+        btn.disabled = false;
+        btn.textContent = '🔄 Restart Device';
+    }
+});
+
+// Shutdown button
+document.getElementById('shutdown-btn').addEventListener('click', async function() {
+    if (!confirm('⚠️ SHUTDOWN DEVICE?\n\n⚠️ WARNING: This will completely shut down the device. You will need PHYSICAL ACCESS to power it back on.\n\nAre you absolutely sure?')) {
+        return;
+    }
+
+    // Double confirmation for shutdown
+    if (!confirm('🔴 FINAL CONFIRMATION\n\nThe device will shut down in 5 seconds.\n\nYou will need to physically unplug and replug the power to restart.\n\nProceed with shutdown?')) {
+        return;
+    }
+
+    const btn = this;
+    btn.disabled = true;
+    btn.textContent = '⏳ Shutting down...';
+
+    try {
+        const response = await fetch('/api/system/shutdown', { method: 'POST' });
+        const data = await response.json();
+
+        if (response.ok) {
+            btn.textContent = '✅ Shutting down now...';
+            btn.style.background = '#333';
+
+            // Show shutdown message
+            setTimeout(() => {
+                document.body.innerHTML = '<div style="display: flex; flex-direction: column; align-items: center; justify-content: center; min-height: 100vh; text-align: center; padding: 2rem;"><h1 style="font-size: 3rem; margin-bottom: 1rem;">💤</h1><h2>Device Shutting Down</h2><p style="margin-top: 1rem; color: var(--muted);">You can safely unplug the device now.</p></div>';
+            }, 2000);
+        } else {
+            throw new Error(data.error || 'Shutdown failed');
+        }
+    } catch (err) {
+        alert('❌ Shutdown failed: ' + err.message);
+        btn.disabled = false;
+        btn.textContent = '🔴 Shutdown Device';
+    }
+});
+
+// Long-poll /api/state like the chat page: once we hold the current ETag the
+// server answers only when the state changes (or with a 304 after ~10s).
+let stateEtag = '';
+async function updateHeader() {
+    let delay = 0;
+    try {
+        const resp = await fetch(stateEtag ? '/api/state?wait=10' : '/api/state', {
+            headers: stateEtag ? {'If-None-Match': stateEtag} : {}
+        });
+        // Pause after a 304, longer if the server asks us to back off
+        delay = (Number(resp.headers.get('Retry-After')) || 1) * 1000;
+        if (resp.status !== 304) {
+            if (!resp.ok) throw new Error('HTTP ' + resp.status);
+            const data = await resp.json();
+            if (data.face && faceEl) faceEl.textContent = data.face;
+            if (statusEl) statusEl.textContent = data.status || '';
+            if (thoughtEl) thoughtEl.textContent = data.thought || '';
+            stateEtag = resp.headers.get('ETag') || '';
+            delay = stateEtag ? 1000 : 5000;
+        }
+    } catch (e) {
+        delay = 5000;
+    }
+    setTimeout(updateHeader, delay);
+}
+
+updateHeader();
+
+// Handle "Use Default" checkbox for system prompt
+document.getElementById('use-default-prompt').addEventListener('change', function() {
+    const promptField = document.getElementById('system-prompt');
+    if (this.checked) {
+        promptField.value = '';
+        promptField.disabled = true;
+    } else {
+        promptField.disabled = false;
+        promptField.focus();
+    }
+});
+
+// Load current AI settings (embedded server-side, no extra round trip)
+(function applySettings(data) {
+    if (data.ai) {
+        document.getElementById('ai-primary').value = data.ai.primary || 'anthropic';
+        document.getElementById('anthropic-model').value = data.ai.anthropic?.model || 'claude-3-haiku-20240307';
+        document.getElementById('openai-model').value = data.ai.openai?.model || 'gpt-4o-mini';
+        document.getElementById('gemini-model').value = data.ai.gemini?.model || 'gemini-2.0-flash-exp';
+        document.getElementById('ollama-model').value = data.ai.ollama?.model || 'qwen3-coder-next';
+        document.getElementById('max-tokens').value = data.ai.budget?.max_tokens || 150;
+        document.getElementById('daily-tokens').value = data.ai.budget?.daily_tokens || 10000;
+
+        // Load system prompt
+        const customPrompt = data.ai.system_prompt || '';
+        document.getElementById('system-prompt').value = customPrompt;
+        document.getElementById('use-default-prompt').checked = !customPrompt;
+        document.getElementById('system-prompt').disabled = !customPrompt;
+    }
+    if (data.display) {
+        document.getElementById('display-dark-mode').checked = data.display.dark_mode || false;
+        document.getElementById('screensaver-enabled').checked = data.display.screensaver?.enabled || false;
+        document.getElementById('screensaver-timeout').value = data.display.screensaver?.idle_timeout_minutes || 5;
+    }
+})(JSON.parse(document.getElementById('settings-data').textContent));
+
+function updateSlider(name) {
+    const slider = document.getElementById(name);
+    const display = document.getElementById(name + '-val');
+    display.textContent = slider.value + '%';
+}
+
+async function saveSettings() {
+    const saveBtn = document.getElementById('save-btn');
+    const messageEl = document.getElementById('message');
+
+    saveBtn.disabled = true;
+    messageEl.classList.remove('show');
+
+    const settings = {
+        name: document.getElementById('name').value.trim(),
+        traits: {
+            curiosity: parseFloat(document.getElementById('curiosity').value) / 100,
+            cheerfulness: parseFloat(document.getElementById('cheerfulness').value) / 100,
+            verbosity: parseFloat(document.getElementById('verbosity').value) / 100,
+            playfulness: parseFloat(document.getElementById('playfulness').value) / 100,
+            empathy: parseFloat(document.getElementById('empathy').value) / 100,
+            independence: parseFloat(document.getElementById('independence').value) / 100,
+        },
+        display: {
+            dark_mode: document.getElementById('display-dark-mode').checked,
+            screensaver: {
+                enabled: document.getElementById('screensaver-enabled').checked,
+                idle_timeout_minutes: parseInt(document.getElementById('screensaver-timeout').value),
+            }
+        },
+        ai: {
+            primary: document.getElementById('ai-primary').value,
+            anthropic: {
+                model: document.getElementById('anthropic-model').value,
+            },
+            openai: {
+                model: document.getElementById('openai-model').value,
+            },
+            gemini: {
+                model: document.getElementById('gemini-model').value,
+            },
+            ollama: {
+                model: document.getElementById('ollama-model').value,
+            },
+            budget: {
+                daily_tokens: parseInt(document.getElementById('daily-tokens').value),
+                per_request_max: parseInt(document.getElementById('max-tokens').value),
+            },
+            system_prompt: document.getElementById('system-prompt').value.trim() || null,
+        }
+    };
+
+    // Validate name
+    if (!settings.name || settings.name.length === 0) {
+        messageEl.textContent = 'Error: Name cannot be empty';
+        messageEl.classList.add('show');
+        saveBtn.disabled = false;
+        return;
+    }
+
+    try {
+        const resp = await fetch('/api/settings', {
+            method: 'POST',
+            headers: {'Content-Type': 'application/json'},
+            body: JSON.stringify(settings)
+        });
+
+        const data = await resp.json();
+
+        if (resp.ok && data.success) {
+            messageEl.textContent = '✓ Settings saved! Personality changes applied. Restart to apply AI changes.';
+            messageEl.classList.add('show');
+        } else {
+            messageEl.textContent = 'Error: ' + (data.error || 'Failed to save settings');
+            messageEl.classList.add('show');
+        }
+    } catch (e) {
+        messageEl.textContent = 'Connection error: ' + e.message;
+        messageEl.classList.add('show');
+    }
+
+    saveBtn.disabled = false;
+}
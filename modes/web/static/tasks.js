@@ -0,0 +1,457 @@
+// Inkling web UI - tasks page script.
+// Load theme with auto day/night support
+function getAutoTheme() {
+    const hour = new Date().getHours();
+    return (hour >= 20 || hour < 7) ? 'midnight' : 'cream';
+}
+const themeAuto = localStorage.getItem('inklingThemeAuto') === 'true';
+const theme = themeAuto ? getAutoTheme() : (localStorage.getItem('inklingTheme') || 'cream');
+document.documentElement.setAttribute('data-theme', theme);
+console.log('Theme initialized:', theme, 'Auto:', themeAuto);
+// Re-check auto theme every 5 minutes
+if (themeAuto) {
+    setInterval(() => {
+        const newTheme = getAutoTheme();
+        document.documentElement.setAttribute('data-theme', newTheme);
+        console.log('Auto theme updated:', newTheme);
+    }, 300000);
+}
+
+let tasks = [];
+let searchQuery = '';
+let filterPriority = '';
+const faceEl = document.getElementById('face');
+const statusEl = document.getElementById('status');
+const thoughtEl = document.getElementById('thought');
+
+// Elements updated on every render, looked up once
+const statEls = {
+    total: document.getElementById('stat-total'),
+    pending: document.getElementById('stat-pending'),
+    in_progress: document.getElementById('stat-progress'),
+    completed: document.getElementById('stat-completed'),
+    overdue: document.getElementById('stat-overdue'),
+    streak: document.getElementById('stat-streak'),
+};
+const filterCountEl = document.getElementById('filter-count');
+const columnEls = {
+    pending: document.getElementById('tasks-pending'),
+    in_progress: document.getElementById('tasks-in_progress'),
+    completed: document.getElementById('tasks-completed'),
+};
+const columnCountEls = {
+    pending: document.getElementById('count-pending'),
+    in_progress: document.getElementById('count-progress'),
+    completed: document.getElementById('count-completed'),
+};
+const celebrationEl = document.getElementById('celebration');
+
+// Load tasks, stats and face in a single request. The ETag lets the
+// periodic refresh skip re-rendering while no task has changed.
+let tasksEtag = '';
+async function fetchTasks() {
+    try {
+        const res = await fetch('/api/tasks/bundle', {
+            headers: tasksEtag ? {'If-None-Match': tasksEtag} : {}
+        });
+        if (res.status === 304) return;
+        const data = await res.json();
+        tasksEtag = res.headers.get('ETag') || '';
+        tasks = data.tasks || [];
+        renderTasks();
+        if (data.stats) renderStats(data.stats);
+        if (data.state) renderFace(data.state);
+    } catch (err) {
+        console.error('Failed to load tasks:', err);
+    }
+}
+
+// Refreshes requested while one is in flight (e.g. moving several cards in a
+// row) share a single follow-up fetch instead of each starting their own.
+// The returned promise settles only after a fetch that began after the call.
+let tasksLoad = null;
+let tasksReload = false;
+function loadTasks() {
+    if (tasksLoad) {
+        tasksReload = true;
+        return tasksLoad;
+    }
+    tasksLoad = (async () => {
+        do {
+            tasksReload = false;
+            await fetchTasks();
+        } while (tasksReload);
+        tasksLoad = null;
+    })();
+    return tasksLoad;
+}
+
+// Render stats
+function renderStats(stats) {
+    statEls.total.textContent = stats.total || 0;
+    statEls.pending.textContent = stats.pending || 0;
+    statEls.in_progress.textContent = stats.in_progress || 0;
+    statEls.completed.textContent = stats.completed || 0;
+    statEls.overdue.textContent = stats.overdue || 0;
+    const streak = stats.current_streak || 0;
+    statEls.streak.innerHTML = streak > 0
+        ? '<span class="streak-fire">' + streak + 'd 🔥</span>'
+        : '<span style="color: var(--muted)">0d</span>';
+}
+
+// Render face
+function renderFace(data) {
+    faceEl.textContent = data.face || '(･_･)';
+    if (statusEl) statusEl.textContent = data.status || '';
+    if (thoughtEl) thoughtEl.textContent = data.thought || '';
+}
+
+// Long-poll /api/state like the chat page: once we hold the current
+// ETag the server answers only when the state changes (or with a 304
+// after ~10s).
+let stateEtag = '';
+async function updateFace() {
+    let delay = 0;
+    try {
+        const resp = await fetch(stateEtag ? '/api/state?wait=10' : '/api/state', {
+            headers: stateEtag ? {'If-None-Match': stateEtag} : {}
+        });
+        // Pause after a 304, longer if the server asks us to back off
+        delay = (Number(resp.headers.get('Retry-After')) || 1) * 1000;
+        if (resp.status !== 304) {
+            if (!resp.ok) throw new Error('HTTP ' + resp.status);
+            renderFace(await resp.json());
+            stateEtag = resp.headers.get('ETag') || '';
+            delay = stateEtag ? 1000 : 5000;
+        }
+    } catch (err) {
+        console.error('Face error:', err);
+        delay = 5000;
+    }
+    setTimeout(updateFace, delay);
+}
+
+// Render tasks
+function renderTasks() {
+    let filtered = tasks;
+    if (searchQuery) {
+        const q = searchQuery.toLowerCase();
+        filtered = filtered.filter(t =>
+            t.title.toLowerCase().includes(q) ||
+            (t.description && t.description.toLowerCase().includes(q)) ||
+            t.tags.some(tag => tag.toLowerCase().includes(q))
+        );
+    }
+    if (filterPriority) {
+        filtered = filtered.filter(t => t.priority === filterPriority);
+    }
+
+    if (searchQuery || filterPriority) {
+        filterCountEl.textContent = filtered.length + ' of ' + tasks.length + ' tasks';
+    } else {
+        filterCountEl.textContent = '';
+    }
+
+    const pending = filtered.filter(t => t.status === 'pending');
+    const inProgress = filtered.filter(t => t.status === 'in_progress');
+    const completed = filtered.filter(t => t.status === 'completed');
+
+    // Forget cards for tasks that no longer exist
+    const ids = new Set(tasks.map(t => t.id));
+    for (const id of cardCache.keys()) {
+        if (!ids.has(id)) cardCache.delete(id);
+    }
+
+    renderColumn('pending', pending);
+    renderColumn('in_progress', inProgress);
+    renderColumn('completed', completed);
+
+    columnCountEls.pending.textContent = pending.length;
+    columnCountEls.in_progress.textContent = inProgress.length;
+    columnCountEls.completed.textContent = completed.length;
+}
+
+// Render column. Cards are cloned from #task-card-tpl and kept per task
+// id, so a refresh only rebuilds the cards whose task actually changed.
+const cardTpl = document.getElementById('task-card-tpl').content.firstElementChild;
+const cardCache = new Map();  // task id -> {key, el}
+const PRIORITY_LABELS = {low: 'LOW', medium: 'MEDIUM', high: 'HIGH', urgent: 'URGENT'};
+
+function dueBadge(className, text) {
+    const span = document.createElement('span');
+    span.className = 'due-date ' + className;
+    span.textContent = text;
+    return span;
+}
+
+function taskCard(task) {
+    const key = JSON.stringify(task);
+    const cached = cardCache.get(task.id);
+    if (cached && cached.key === key) return cached.el;
+
+    const el = cardTpl.cloneNode(true);
+    el.dataset.id = task.id;
+    el.querySelector('.task-title').textContent = task.title;
+    const priorityEl = el.querySelector('.priority');
+    priorityEl.classList.add('priority-' + task.priority);
+    priorityEl.textContent = PRIORITY_LABELS[task.priority] || task.priority.toUpperCase();
+    const descriptionEl = el.querySelector('.task-description');
+    if (task.description) {
+        descriptionEl.textContent = task.description;
+    } else {
+        descriptionEl.remove();
+    }
+
+    const metaEl = el.querySelector('.task-meta');
+    task.tags.forEach(tag => {
+        const span = document.createElement('span');
+        span.className = 'tag';
+        span.textContent = '#' + tag;
+        metaEl.appendChild(span);
+    });
+    if (task.is_overdue) metaEl.appendChild(dueBadge('overdue', 'OVERDUE'));
+    if (task.days_until_due !== null && task.days_until_due >= 0 && task.days_until_due <= 3) {
+        metaEl.appendChild(dueBadge('due-soon', task.days_until_due + 'd left'));
+    }
+
+    const select = el.querySelector('.task-status-select');
+    select.querySelector(`option[value="${task.status}"]`).remove();
+    select.onchange = () => {
+        const newStatus = select.value;
+        select.value = '';  // The card may be reused if the move fails
+        changeStatus(task.id, newStatus);
+    };
+    el.querySelector('[data-action="edit"]').onclick = () => editTask(task.id);
+    el.querySelector('[data-action="delete"]').onclick = () => deleteTask(task.id);
+
+    cardCache.set(task.id, {key, el});
+    return el;
+}
+
+function renderColumn(status, taskList) {
+    const container = columnEls[status];
+
+    if (taskList.length === 0) {
+        container.innerHTML = '<div class="loading" style="color: var(--muted);">No tasks</div>';
+        return;
+    }
+
+    const cards = taskList.map(taskCard);
+    // Leave the column alone when it already shows exactly these cards
+    const current = container.children;
+    if (current.length === cards.length && cards.every((el, i) => current[i] === el)) return;
+    container.replaceChildren(...cards);
+}
+
+// Replace a task in the local list and re-render, returning the old entry
+function replaceTask(taskId, task) {
+    const index = tasks.findIndex(t => t.id === taskId);
+    if (index === -1) return null;
+    const old = tasks[index];
+    tasks = tasks.slice();
+    if (task) {
+        tasks[index] = task;
+    } else {
+        tasks.splice(index, 1);
+    }
+    renderTasks();
+    return {index, task: old};
+}
+
+// Put back a task removed or changed by replaceTask after the server refused
+function restoreTask(previous) {
+    tasks = tasks.filter(t => t.id !== previous.task.id);
+    tasks.splice(previous.index, 0, previous.task);
+    renderTasks();
+}
+
+async function changeStatus(taskId, newStatus) {
+    if (!newStatus) return;
+
+    // Move the card right away; the reload afterwards picks up stats and
+    // any fields the server set, and a refusal moves it back
+    const task = tasks.find(t => t.id === taskId);
+    const previous = task ? replaceTask(taskId, {...task, status: newStatus}) : null;
+
+    try {
+        const res = await fetch(`/api/tasks/${taskId}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ status: newStatus })
+        });
+
+        if (res.ok) {
+            await loadTasks();
+        } else {
+            if (previous) restoreTask(previous);
+            alert('Failed to update task status');
+        }
+    } catch (err) {
+        console.error('Failed to update task:', err);
+        if (previous) restoreTask(previous);
+        alert('Error updating task');
+    }
+}
+
+// Add task
+document.getElementById('quick-add-form').addEventListener('submit', async (e) => {
+    e.preventDefault();
+
+    const title = document.getElementById('new-task-title').value.trim();
+    const priority = document.getElementById('new-task-priority').value;
+
+    if (!title) return;
+
+    try {
+        const res = await fetch('/api/tasks', {
+            method: 'POST',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({ title, priority })
+        });
+
+        const data = await res.json();
+
+        if (data.success) {
+            document.getElementById('new-task-title').value = '';
+            await loadTasks();
+
+            if (data.celebration) {
+                showCelebration(data.celebration, data.xp_awarded || 0, '🎯');
+            }
+        }
+    } catch (err) {
+        console.error('Failed to create task:', err);
+    }
+});
+
+// Complete task
+async function completeTask(taskId) {
+    try {
+        const res = await fetch(`/api/tasks/${taskId}/complete`, {
+            method: 'POST'
+        });
+
+        const data = await res.json();
+
+        if (data.success) {
+            await loadTasks();
+
+            if (data.celebration) {
+                showCelebration(data.celebration, data.xp_awarded || 0, '🎉');
+            }
+        }
+    } catch (err) {
+        console.error('Failed to complete task:', err);
+    }
+}
+
+// Delete task
+async function deleteTask(taskId) {
+    if (!confirm('Delete this task?')) return;
+
+    const previous = replaceTask(taskId, null);
+
+    try {
+        const res = await fetch(`/api/tasks/${taskId}`, {
+            method: 'DELETE'
+        });
+
+        if (res.ok) {
+            await loadTasks();
+        } else {
+            if (previous) restoreTask(previous);
+            alert('Failed to delete task');
+        }
+    } catch (err) {
+        console.error('Failed to delete task:', err);
+        if (previous) restoreTask(previous);
+        alert('Error deleting task');
+    }
+}
+
+// Edit task modal
+function editTask(taskId) {
+    const task = tasks.find(t => t.id === taskId);
+    if (!task) return;
+
+    document.getElementById('edit-task-id').value = task.id;
+    document.getElementById('edit-title').value = task.title;
+    document.getElementById('edit-description').value = task.description || '';
+    document.getElementById('edit-priority').value = task.priority;
+    document.getElementById('edit-due-date').value = task.due_date ? task.due_date.split('T')[0] : '';
+    document.getElementById('edit-tags').value = (task.tags || []).join(', ');
+
+    document.getElementById('edit-modal').classList.add('show');
+}
+
+function closeEditModal() {
+    document.getElementById('edit-modal').classList.remove('show');
+}
+
+async function saveEdit() {
+    const taskId = document.getElementById('edit-task-id').value;
+    const title = document.getElementById('edit-title').value.trim();
+    if (!title) return;
+
+    const tagsStr = document.getElementById('edit-tags').value;
+    const tags = tagsStr ? tagsStr.split(',').map(t => t.trim()).filter(Boolean) : [];
+    const dueDate = document.getElementById('edit-due-date').value || null;
+
+    try {
+        const res = await fetch(`/api/tasks/${taskId}`, {
+            method: 'PUT',
+            headers: { 'Content-Type': 'application/json' },
+            body: JSON.stringify({
+                title: title,
+                description: document.getElementById('edit-description').value.trim(),
+                priority: document.getElementById('edit-priority').value,
+                due_date: dueDate,
+                tags: tags
+            })
+        });
+        if (res.ok) {
+            closeEditModal();
+            await loadTasks();
+        }
+    } catch (err) {
+        console.error('Failed to save task:', err);
+    }
+}
+
+// Close modal on backdrop click
+document.getElementById('edit-modal').addEventListener('click', function(e) {
+    if (e.target === this) closeEditModal();
+});
+
+// Close modal on Escape key
+document.addEventListener('keydown', function(e) {
+    if (e.key === 'Escape') closeEditModal();
+});
+
+// Show celebration
+function showCelebration(message, xp, emoji) {
+    document.getElementById('celebration-message').textContent = message;
+    document.getElementById('celebration-xp').textContent = xp > 0 ? `+${xp} XP` : '';
+    document.getElementById('celebration-emoji').textContent = emoji;
+    celebrationEl.classList.add('show');
+
+    setTimeout(() => {
+        celebrationEl.classList.remove('show');
+    }, 3000);
+}
+
+// Search and filter
+document.getElementById('task-search').addEventListener('input', function(e) {
+    searchQuery = e.target.value;
+    renderTasks();
+});
+
+document.getElementById('task-filter-priority').addEventListener('change', function(e) {
+    filterPriority = e.target.value;
+    renderTasks();
+});
+
+// Initial load
+loadTasks();
+updateFace();
+setInterval(loadTasks, 30000); // Refresh every 30s
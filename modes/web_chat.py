@@ -6,28 +6,54 @@ Runs a Bottle server on http://inkling.local:8081
 """
 
 import asyncio
+import copy
+import gzip
+import importlib.util
+import inspect
 import json
+import marshal
+import math
 import os
+import re
 import threading
 import hashlib
 import hmac
 import secrets
+import shutil
+import subprocess
 import time
+import traceback
+from concurrent.futures import Future
+from datetime import datetime
+from functools import lru_cache, partial
 from pathlib import Path
+from types import MappingProxyType
 from typing import Optional, Dict, Any
-from queue import Queue
 from collections import defaultdict
 
-from bottle import Bottle, request, response, static_file, template, redirect
+import bottle
+from bottle import Bottle, SimpleTemplate, request, response, static_file, redirect
+
+try:
+    import orjson
+except ImportError:
+    orjson = None  # Fall back to stdlib json
+
+try:
+    import brotli
+except ImportError:
+    brotli = None  # Pages are served gzipped only
 
 from core.brain import Brain, AllProvidersExhaustedError, QuotaExceededError
 from core.display import DisplayManager
 from core.personality import Personality
-from core.commands import COMMANDS, get_command, get_commands_by_category
+from core.commands import COMMANDS, get_commands_by_category
 from core.tasks import TaskManager, Task, TaskStatus, Priority
 from core.crypto import Identity
 from core.memory import MemoryStore
 from core.focus import FocusManager
+from core.storage import get_sd_card_path, is_storage_available
+from core.ui import FACES, MESSAGE_MAX_LINES, UNICODE_FACES, word_wrap
 
 # Command handlers
 from modes.web.commands.play import PlayCommands
@@ -43,6 +69,7 @@ from modes.web.commands.focus import FocusCommands
 
 # Template loading
 TEMPLATE_DIR = Path(__file__).parent / "web" / "templates"
+STATIC_DIR = Path(__file__).parent / "web" / "static"
 
 
 def _load_template(name: str) -> str:
@@ -53,20 +80,469 @@ def _load_template(name: str) -> str:
     return template_path.read_text()
 
 
-# HTML template for the web UI
-HTML_TEMPLATE = _load_template("main.html")
+# Compiled templates are cached here so restarts skip parsing/compiling
+TEMPLATE_CACHE_DIR = Path(os.path.expanduser("~")) / ".inkling" / "template_cache"
+
+
+class CachedSimpleTemplate(SimpleTemplate):
+    """SimpleTemplate whose compiled code object is cached on disk.
+
+    Nothing is compiled until the first render. The cache key covers the
+    template source, the Python bytecode magic and the Bottle version, so
+    stale entries are never loaded after an upgrade; when a template is
+    recompiled, older entries for the same template name are deleted. Once
+    compiled, the template text and translated Python are dropped, since
+    rendering only needs the code object. Any cache I/O failure falls back
+    to a normal compile.
+    """
+
+    @bottle.cached_property
+    def co(self):
+        source = self.source
+        if not source:
+            return super().co
+        prefix = f"{self.name or 'template'}-"
+        digest = hashlib.blake2b(source.encode("utf-8"), digest_size=16)
+        digest.update(importlib.util.MAGIC_NUMBER)
+        digest.update(bottle.__version__.encode())
+        cache_file = TEMPLATE_CACHE_DIR / f"{prefix}{digest.hexdigest()}.marshal"
+
+        try:
+            co = marshal.loads(cache_file.read_bytes())
+        except (OSError, ValueError, EOFError, TypeError):
+            co = compile(self.code, self.filename or "<string>", "exec")
+            try:
+                TEMPLATE_CACHE_DIR.mkdir(parents=True, exist_ok=True)
+                tmp_file = cache_file.with_suffix(f".{os.getpid()}.tmp")
+                tmp_file.write_bytes(marshal.dumps(co))
+                os.replace(tmp_file, cache_file)
+                for stale in TEMPLATE_CACHE_DIR.glob(f"{prefix}*.marshal"):
+                    if stale != cache_file:
+                        stale.unlink(missing_ok=True)
+            except OSError:
+                pass
+
+        self.source = None
+        self.__dict__.pop("code", None)
+        return co
+
+
+# Inline <script> blocks without attributes (skips CDN and JSON data blocks)
+_INLINE_SCRIPT_RE = re.compile(r"(<script>)(.*?)(</script>)", re.DOTALL)
+
 
+def _minify_js(source: str) -> str:
+    """Strip indentation, blank lines and whole-line // comments from JS.
 
-# Settings page template
-SETTINGS_TEMPLATE = _load_template("settings.html")
+    Line breaks are kept so automatic semicolon insertion still works, and
+    trailing comments are left alone since they may sit inside strings.
+    """
+    lines = []
+    for line in source.splitlines():
+        line = line.strip()
+        if not line or line.startswith("//"):
+            continue
+        lines.append(line)
+    return "\n".join(lines)
+
+
+def _minify_inline_scripts(html: str) -> str:
+    """Minify every inline <script> block in an HTML template once at load."""
+    return _INLINE_SCRIPT_RE.sub(
+        lambda m: f"{m.group(1)}\n{_minify_js(m.group(2))}\n{m.group(3)}",
+        html,
+    )
+
+
+# Blocks whose contents are whitespace-sensitive or handled separately
+_RAW_BLOCK_RE = re.compile(r"(<(script|style|pre|textarea)\b[^>]*>.*?</\2>)", re.DOTALL | re.IGNORECASE)
+_CSS_COMMENT_RE = re.compile(r"/\*.*?\*/", re.DOTALL)
+_HTML_COMMENT_RE = re.compile(r"<!--.*?-->", re.DOTALL)
+_LINE_BREAK_RE = re.compile(r"[ \t]*\n\s*")  # Trailing space, blank lines, indentation
+
+
+def _strip_lines(text: str) -> str:
+    """Drop indentation and blank lines, keeping a line break between lines."""
+    return _LINE_BREAK_RE.sub("\n", text)
+
+
+def _minify_markup(html: str) -> str:
+    """Strip indentation, blank lines and comments from markup and CSS.
+
+    Line breaks are kept, so whitespace between inline elements still
+    renders the same. <script> bodies (see _minify_inline_scripts) and
+    <pre>/<textarea> contents are left untouched.
+    """
+    parts = []
+    for i, part in enumerate(_RAW_BLOCK_RE.split(html)):
+        kind = i % 3
+        if kind == 2:
+            continue  # Tag-name group captured by the split
+        if kind == 0:
+            parts.append(_strip_lines(_HTML_COMMENT_RE.sub("", part)))
+        elif part[:6].lower() == "<style":
+            parts.append(_strip_lines(_CSS_COMMENT_RE.sub("", part)))
+        else:
+            parts.append(part)
+    return "".join(parts)
+
+
+# Command palette shown under the chat: (group title, [(label, command)])
+COMMAND_PALETTE = [
+    ("Info", [("Help", "/help"), ("Level", "/level"), ("Stats", "/stats"), ("History", "/history")]),
+    ("Personality", [("Mood", "/mood"), ("Energy", "/energy"), ("Traits", "/traits")]),
+    ("Tasks", [("List Tasks", "/tasks"), ("Stats", "/taskstats")]),
+    ("System", [
+        ("System", "/system"), ("Config", "/config"), ("Faces", "/faces"),
+        ("Refresh", "/refresh"), ("Clear", "/clear"),
+    ]),
+    ("Focus", [
+        ("Start", "/focus start"), ("Pause", "/focus pause"), ("Resume", "/focus resume"),
+        ("Stop", "/focus stop"), ("Stats", "/focus stats"),
+    ]),
+]
+
+
+def _render_palette(categories: Dict[str, list]) -> str:
+    """Render the command palette HTML, skipping commands not in the registry."""
+    registered = {cmd.name for cmds in categories.values() for cmd in cmds}
+    groups = []
+    for title, buttons in COMMAND_PALETTE:
+        rows = [
+            f"""                    <button onclick="runCommand('{command}')">{label}</button>"""
+            for label, command in buttons
+            if command[1:].split(" ", 1)[0] in registered
+        ]
+        if not rows:
+            continue
+        groups.append(
+            '            <div class="command-group">\n'
+            f"                <h4>{title}</h4>\n"
+            '                <div class="command-buttons">\n'
+            + "\n".join(rows)
+            + "\n                </div>\n"
+            "            </div>"
+        )
+    return "\n\n".join(groups)
 
 
-TASKS_TEMPLATE = _load_template("tasks.html")
+# Rendered once; the command registry is static for the life of the process
+_PALETTE_HTML = _render_palette(get_commands_by_category())
 
-LOGIN_TEMPLATE = _load_template("login.html")
 
+def _compile_page_template(name: str, minify_scripts: bool = False) -> CachedSimpleTemplate:
+    """Load and minify a page template; it is compiled on first render.
 
-FILES_TEMPLATE = _load_template("files.html")
+    The template holds the minified text only until then, after which just
+    the compiled code object stays resident.
+    """
+    source = _load_template(name)
+    if minify_scripts:
+        source = _minify_inline_scripts(source)
+    return CachedSimpleTemplate(source=_minify_markup(source), name=Path(name).stem)
+
+
+# Page templates, compiled once on first use; routes call .render() directly
+HTML_TPL = _compile_page_template("main.html", minify_scripts=True)
+SETTINGS_TPL = _compile_page_template("settings.html", minify_scripts=True)
+TASKS_TPL = _compile_page_template("tasks.html")
+LOGIN_TPL = _compile_page_template("login.html")
+FILES_TPL = _compile_page_template("files.html")
+
+
+class StaticPage:
+    """A fully rendered page with its compressed encodings and a strong ETag.
+
+    ``br`` is only built when the optional brotli package is installed.
+    """
+
+    __slots__ = ("body", "gz", "br", "etag")
+
+    def __init__(self, html: str):
+        self.body = html.encode("utf-8")
+        self.gz = gzip.compress(self.body, 9)
+        self.br = brotli.compress(self.body, quality=11) if brotli is not None else None
+        self.etag = f'"{hashlib.blake2b(self.body, digest_size=8).hexdigest()}"'
+
+
+# Theme palette shared by every page, served once and cached by the browser
+INKLING_CSS = StaticPage((STATIC_DIR / "inkling.css").read_text())
+
+
+def _load_css(name: str) -> StaticPage:
+    """Load a page stylesheet, minified once like inline <style> blocks."""
+    return StaticPage(_strip_lines(_CSS_COMMENT_RE.sub("", (STATIC_DIR / name).read_text())))
+
+
+def _load_js(name: str) -> StaticPage:
+    """Load a page script, minified once like inline <script> blocks."""
+    return StaticPage(_minify_js((STATIC_DIR / name).read_text()))
+
+
+# Per-page stylesheets and scripts
+MAIN_CSS = _load_css("main.css")
+MAIN_JS = _load_js("main.js")
+SETTINGS_CSS = _load_css("settings.css")
+SETTINGS_JS = _load_js("settings.js")
+TASKS_CSS = _load_css("tasks.css")
+TASKS_JS = _load_js("tasks.js")
+FILES_CSS = _load_css("files.css")
+FILES_JS = _load_js("files.js")
+
+# Public assets under /static/: name -> (page, content type)
+STATIC_ASSETS = {
+    "inkling.css": (INKLING_CSS, "text/css; charset=UTF-8"),
+    "main.css": (MAIN_CSS, "text/css; charset=UTF-8"),
+    "main.js": (MAIN_JS, "text/javascript; charset=UTF-8"),
+    "settings.css": (SETTINGS_CSS, "text/css; charset=UTF-8"),
+    "settings.js": (SETTINGS_JS, "text/javascript; charset=UTF-8"),
+    "tasks.css": (TASKS_CSS, "text/css; charset=UTF-8"),
+    "tasks.js": (TASKS_JS, "text/javascript; charset=UTF-8"),
+    "files.css": (FILES_CSS, "text/css; charset=UTF-8"),
+    "files.js": (FILES_JS, "text/javascript; charset=UTF-8"),
+}
+
+
+def _static_url(name: str) -> str:
+    """URL for a static asset, versioned by its ETag so it can be cached forever."""
+    version = STATIC_ASSETS[name][0].etag.strip('"')
+    return f"/static/{name}?v={version}"
+
+
+# Faces shown in the web UI: Unicode where available, ASCII otherwise. Shared
+# read-only by every WebChatMode instead of being merged per instance.
+WEB_FACES = MappingProxyType({**FACES, **UNICODE_FACES})
+_DEFAULT_FACE = WEB_FACES["default"]
+_SAD_FACE = WEB_FACES["sad"]
+
+# Every page links the shared theme with a ?v= URL, so a theme change
+# reaches browsers as soon as the page is reloaded
+_THEME_URL = _static_url("inkling.css")
+
+# Chat page shell parameters, fixed for the life of the process
+_INDEX_PARAMS = {
+    "palette_html": _PALETTE_HTML,
+    "css_url": _static_url("main.css"),
+    "js_url": _static_url("main.js"),
+}
+_SETTINGS_ASSET_URLS = {
+    "css_url": _static_url("settings.css"),
+    "js_url": _static_url("settings.js"),
+}
+_TASKS_ASSET_URLS = {
+    "css_url": _static_url("tasks.css"),
+    "js_url": _static_url("tasks.js"),
+}
+_FILES_ASSET_URLS = {
+    "css_url": _static_url("files.css"),
+    "js_url": _static_url("files.js"),
+}
+
+# The login form has no per-device content until a failed attempt adds an error
+@lru_cache(maxsize=None)
+def _login_page() -> "StaticPage":
+    """Render the login form once, on the first visit."""
+    return StaticPage(LOGIN_TPL.render(error=None, theme_url=_THEME_URL))
+
+
+def _etag_matches(etag: str, if_none_match: str) -> bool:
+    """Check an If-None-Match header value against a strong ETag."""
+    if not if_none_match:
+        return False
+    if if_none_match.strip() == "*":
+        return True
+    candidates = (tag.strip() for tag in if_none_match.split(","))
+    return any(tag.removeprefix("W/") == etag for tag in candidates)
+
+
+def _accepts_encoding(accept_encoding: str, coding: str) -> bool:
+    """Check whether an Accept-Encoding header allows a content coding.
+
+    A coding listed with q=0 is refused, as is anything covered only by a
+    "*;q=0" wildcard. Tokens with an unreadable q-value are ignored.
+    """
+    wildcard = None
+    for token in accept_encoding.lower().split(","):
+        name, _, params = token.partition(";")
+        name = name.strip()
+        q = 1.0
+        for param in params.split(";"):
+            key, _, value = param.partition("=")
+            if key.strip() == "q":
+                try:
+                    q = float(value)
+                except ValueError:
+                    q = None
+        if q is None:
+            continue
+        if name == coding:
+            return q > 0
+        if name == "*":
+            wildcard = q > 0
+    return bool(wildcard)
+
+
+def _json_dumps(obj: Any) -> bytes:
+    """Serialize to UTF-8 JSON bytes, using orjson when it is installed."""
+    if orjson is not None:
+        return orjson.dumps(obj, option=orjson.OPT_NON_STR_KEYS)
+    return json.dumps(obj).encode("utf-8")
+
+
+# /api/state has a fixed schema, so only the field values are serialized
+_STATE_TEMPLATE = b'{"face":%s,"status":%s,"mood":%s,"thought":%s,"focus":%s}'
+_NO_FOCUS_JSON = _json_dumps({"focus_active": False})
+
+
+def _request_json() -> Any:
+    """Parse the JSON request body like bottle's request.json, using orjson when it is installed."""
+    if orjson is None:
+        return request.json
+    if request.content_type.lower().split(";")[0] not in ("application/json", "application/json-rpc"):
+        return None
+    body = request.body.read(request.MEMFILE_MAX + 1)
+    if len(body) > request.MEMFILE_MAX:
+        raise bottle.HTTPError(413, "Request entity too large")
+    if not body:
+        return None
+    try:
+        return orjson.loads(body)
+    except orjson.JSONDecodeError:
+        raise bottle.HTTPError(400, "Invalid JSON")
+
+
+def _jresp(obj: Any) -> bytes:
+    """Set the JSON content type and return the serialized body."""
+    response.content_type = "application/json"
+    return _json_dumps(obj)
+
+
+# On-the-fly gzip for dynamic text responses. Level 1 keeps the CPU cost low
+# on a Pi; bodies below GZIP_MIN_BYTES aren't worth a gzip header, and bodies
+# above GZIP_MAX_BYTES (file downloads) are streamed as-is.
+GZIP_MIN_BYTES = 1024
+GZIP_MAX_BYTES = 1024 * 1024
+GZIP_LEVEL = 1
+_GZIP_CONTENT_TYPES = ("text/", "application/json", "application/javascript")
+
+
+class GzipMiddleware:
+    """WSGI middleware that gzips large text/JSON responses for clients that accept it.
+
+    Responses that already have a Content-Encoding (pre-compressed pages),
+    have no Content-Length, or fall outside the size window pass through
+    untouched, as do anything but a plain 200 and file downloads: a 206
+    range's Content-Range counts uncompressed bytes, and resumed downloads
+    need the file's own bytes. A strong ETag on a re-encoded body is
+    weakened, since it no longer names those exact bytes.
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    def __call__(self, environ, start_response):
+        if (
+            not _accepts_encoding(environ.get("HTTP_ACCEPT_ENCODING", ""), "gzip")
+            or environ.get("REQUEST_METHOD") == "HEAD"
+        ):
+            return self.app(environ, start_response)
+
+        captured = []
+
+        def capture(status, headers, exc_info=None):
+            captured[:] = [status, headers, exc_info]
+
+        body_iter = self.app(environ, capture)
+        status, headers, exc_info = captured
+        names = {name.lower(): value for name, value in headers}
+        try:
+            length = int(names.get("content-length", ""))
+        except ValueError:
+            length = -1
+        if (
+            not status.startswith("200")
+            or "content-encoding" in names
+            or "content-range" in names
+            or names.get("content-disposition", "").lower().startswith("attachment")
+            or not GZIP_MIN_BYTES <= length <= GZIP_MAX_BYTES
+            or not names.get("content-type", "").startswith(_GZIP_CONTENT_TYPES)
+        ):
+            start_response(status, headers, exc_info)
+            return body_iter
+
+        try:
+            body = gzip.compress(b"".join(body_iter), GZIP_LEVEL)
+        finally:
+            if hasattr(body_iter, "close"):
+                body_iter.close()
+        rewritten = []
+        for name, value in headers:
+            lower = name.lower()
+            if lower == "content-length":
+                continue
+            if lower == "etag" and not value.startswith("W/"):
+                value = "W/" + value
+            elif lower == "vary" and "accept-encoding" not in value.lower():
+                value += ", Accept-Encoding"
+            rewritten.append((name, value))
+        headers = rewritten + [("Content-Encoding", "gzip"), ("Content-Length", str(len(body)))]
+        if "vary" not in names:
+            headers.append(("Vary", "Accept-Encoding"))
+        start_response(status, headers, exc_info)
+        return [body]
+
+
+# Where each /api/settings field lands in config.local.yml:
+# (path in the request payload, path in the config, merge dicts instead of replacing)
+_SETTINGS_TO_CONFIG = (
+    (("name",), ("device", "name"), False),
+    (("traits",), ("personality",), True),
+    (("display", "dark_mode"), ("display", "dark_mode"), False),
+    (("display", "screensaver"), ("display", "screensaver"), True),
+    (("ai", "primary"), ("ai", "primary"), False),
+    (("ai", "anthropic"), ("ai", "anthropic"), True),
+    (("ai", "openai"), ("ai", "openai"), True),
+    (("ai", "gemini"), ("ai", "gemini"), True),
+    (("ai", "ollama"), ("ai", "ollama"), True),
+    (("ai", "budget"), ("ai", "budget"), True),
+)
+
+_MISSING = object()
+
+
+def _dig(data: dict, path: tuple) -> Any:
+    """Return the value at a nested key path, or _MISSING if any key is absent."""
+    for key in path:
+        if not isinstance(data, dict) or key not in data:
+            return _MISSING
+        data = data[key]
+    return data
+
+
+# Chat limits: at most CHAT_WORKERS brain calls run at once, and up to
+# CHAT_QUEUE_SIZE more requests wait for a turn before new ones are turned away
+CHAT_WORKERS = 2
+THINK_TIMEOUT_SECONDS = 30  # Enforced on the event loop, which cancels the AI call
+CHAT_TIMEOUT_SECONDS = 35  # Longest a waiting request holds out for a turn
+CHAT_QUEUE_SIZE = 16
+
+# Slow, read-only commands (subprocess/psutil calls) where concurrent
+# identical requests share one run instead of each starting their own
+COALESCED_COMMANDS = frozenset({"system", "wifi", "wifiscan"})
+
+# /api/state?wait=N long-poll: upper bound on N. Waiting requests sleep until
+# the state is recomputed and found changed (after each POST and mood tick)
+STATE_MAX_WAIT_SECONDS = 10
+# Retry-After sent when too many long-polls are already waiting
+STATE_BUSY_RETRY_SECONDS = 5
+
+# How often the idle loop in run() lets the personality's mood decay. The
+# decay is scaled by elapsed time, so this only trades wakeups for latency.
+MOOD_TICK_SECONDS = 5.0
+
+# Auth cookies already checked this run. Every polled request re-sends the
+# cookie, so remembering good tokens skips the HMAC after the first check.
+AUTH_TOKEN_CACHE_SIZE = 256
 
 
 class WebChatMode:
@@ -108,13 +584,21 @@ class WebChatMode:
             self._web_password = os.environ.get("SERVER_PW", "")
         self._auth_enabled = bool(self._web_password)
         # Generate a secret key for signing cookies (persistent per session)
-        self._secret_key = secrets.token_hex(32)
+        self._secret_key = secrets.token_hex(32).encode()
+        self._verified_tokens: set = set()
 
         # Rate limiting for login attempts
         self._login_attempts: Dict[str, list] = defaultdict(list)
         self._login_max_attempts = 5
         self._login_window_seconds = 300  # 5 minutes
 
+        # Optional Unix domain socket (for a local nginx/Caddy reverse proxy)
+        self._unix_socket = self._config.get("web", {}).get("unix_socket") or None
+
+        # Waitress worker threads; a request waiting on a chat reply holds one,
+        # the rest keep serving state polls and page loads
+        self._server_threads = max(1, int(self._config.get("web", {}).get("threads", 6)))
+
         # Detect HTTPS (ngrok always uses HTTPS)
         ngrok_config = self._config.get("network", {}).get("ngrok", {})
         self._use_secure_cookies = ngrok_config.get("enabled", False)
@@ -122,15 +606,45 @@ class WebChatMode:
         self._app = Bottle()
         self._running = False
         self._loop: Optional[asyncio.AbstractEventLoop] = None
-        self._message_queue: Queue = Queue()
-
-        # Performance optimizations: gzip compression and caching
+        # Fire-and-forget display work started by _schedule(); holds strong
+        # references so the loop can't drop a task before it finishes
+        self._background_tasks: set = set()
+        # Latest not-yet-rendered display.update() arguments; bursts of
+        # updates collapse into this while a render is in progress
+        self._pending_display: Optional[Dict[str, Any]] = None
+        self._display_draining = False
+        self._display_lock = threading.Lock()
+        # Pre-rendered page shells: page -> (cache key, StaticPage)
+        self._shells: Dict[str, tuple] = {}
+
+        # Last /api/state payload and when it changed (for ETag/Last-Modified)
+        self._state_lock = threading.Lock()
+        self._state_changed = threading.Condition(self._state_lock)
+        # Each parked long-poll holds a Waitress thread, so only half of them
+        # may wait at once; the rest stay free for chat, pages and the API
+        self._state_waiters = threading.BoundedSemaphore(max(1, self._server_threads // 2))
+        self._state_body: Optional[bytes] = None
+        self._state_mtime = 0
+        self._state_etag = ""
+
+        # Parsed config.local.yml as (file signature, dict), filled on first save
+        self._local_config: Optional[tuple] = None
+
+        # Chat admission: each request waits on its own HTTP thread for one of
+        # CHAT_WORKERS think slots. Bounded so a burst of requests gets a
+        # "busy" reply instead of piling up behind the AI.
+        self._chat_pending = threading.BoundedSemaphore(CHAT_WORKERS + CHAT_QUEUE_SIZE)
+        self._think_slots = threading.BoundedSemaphore(CHAT_WORKERS)
+
+        # In-flight coalesced commands: key -> Future shared by all callers
+        self._inflight: Dict[str, Future] = {}
+        self._inflight_lock = threading.Lock()
+
+        # Performance optimizations: response caching headers
         self._setup_performance_hooks()
 
-        # Import faces from UI module
-        # Use Unicode faces for web (better appearance), with ASCII fallback
-        from core.ui import FACES, UNICODE_FACES
-        self._faces = {**FACES, **UNICODE_FACES}  # Unicode takes precedence
+        self._faces = WEB_FACES  # Shared, read-only (see WEB_FACES)
+        self._face_cache = (None, "")  # (mood, face_str) of the last lookup
 
         # Set display mode
         self.display.set_mode("WEB")
@@ -146,58 +660,28 @@ class WebChatMode:
         self._utility_cmds = UtilityCommands(self)
         self._focus_cmds = FocusCommands(self)
 
+        # Resolve slash-command handlers once instead of on every dispatch
+        self._commands = self._build_command_table()
+
         self._setup_routes()
 
     def _setup_performance_hooks(self):
-        """Setup performance optimization hooks for gzip compression and caching."""
-        from bottle import hook
-        import gzip
-        from io import BytesIO
-
-        @hook('after_request')
-        def enable_gzip():
-            """Compress responses with gzip if client supports it."""
-            accept_encoding = request.environ.get('HTTP_ACCEPT_ENCODING', '')
-            if 'gzip' not in accept_encoding:
-                return
+        """Setup response hooks for caching (gzip is applied by GzipMiddleware)."""
 
-            # Only compress text responses
-            content_type = response.content_type
-            if not (content_type.startswith('text/') or
-                   content_type.startswith('application/json')):
-                return
-
-            # Get response body
-            body = response.body
-            if isinstance(body, str):
-                body = body.encode('utf-8')
-            elif isinstance(body, (list, tuple)):
-                body = b''.join(
-                    b if isinstance(b, bytes) else b.encode('utf-8')
-                    for b in body
-                )
-            else:
-                # Already bytes or other type
-                if not isinstance(body, bytes):
-                    return
-
-            # Compress response body
-            compressed = BytesIO()
-            with gzip.GzipFile(fileobj=compressed, mode='wb') as f:
-                f.write(body)
-
-            response.body = compressed.getvalue()
-            response.set_header('Content-Encoding', 'gzip')
-            response.set_header('Content-Length', len(response.body))
-
-        @hook('after_request')
+        @self._app.hook('after_request')
         def set_cache_headers():
-            """Add caching headers for static content."""
+            """Add caching headers unless the route already chose its own."""
+            # Anything posted may have changed the face/status/thought
+            if request.method == 'POST':
+                self._refresh_state()
+            if 'Cache-Control' in response.headers:
+                return
             path = request.path
 
-            # Cache templates for 5 minutes (they rarely change during a session)
+            # Pages embed live state and sit behind auth: let the browser keep
+            # them but revalidate on every navigation
             if path in ['/', '/settings', '/tasks', '/files']:
-                response.set_header('Cache-Control', 'public, max-age=300')
+                response.set_header('Cache-Control', 'private, no-cache')
 
             # Don't cache API endpoints (always fresh data)
             elif path.startswith('/api/'):
@@ -208,7 +692,7 @@ class WebChatMode:
         # Simple HMAC-based token
         message = f"authenticated:{secrets.token_hex(16)}"
         signature = hmac.new(
-            self._secret_key.encode(),
+            self._secret_key,
             message.encode(),
             hashlib.sha256
         ).hexdigest()
@@ -218,16 +702,24 @@ class WebChatMode:
         """Verify an authentication token."""
         if not token:
             return False
+        if token in self._verified_tokens:
+            return True
         try:
             message, signature = token.rsplit("|", 1)
             expected_signature = hmac.new(
-                self._secret_key.encode(),
+                self._secret_key,
                 message.encode(),
                 hashlib.sha256
             ).hexdigest()
-            return hmac.compare_digest(signature, expected_signature)
+            if not hmac.compare_digest(signature, expected_signature):
+                return False
         except Exception:
             return False
+        # Only valid tokens are remembered, so junk cookies can't grow it
+        if len(self._verified_tokens) >= AUTH_TOKEN_CACHE_SIZE:
+            self._verified_tokens.clear()
+        self._verified_tokens.add(token)
+        return True
 
     def _check_auth(self) -> bool:
         """Check if the user is authenticated."""
@@ -247,8 +739,7 @@ class WebChatMode:
         """Check authentication for API routes. Returns error JSON or None."""
         if not self._check_auth():
             response.status = 401
-            response.content_type = "application/json"
-            return json.dumps({"error": "Authentication required"})
+            return _jresp({"error": "Authentication required"})
         return None
 
     @staticmethod
@@ -283,12 +774,27 @@ class WebChatMode:
     def _setup_routes(self) -> None:
         """Set up Bottle routes."""
 
+        @self._app.route("/static/<name>")
+        def static_asset(name):
+            # Public: the login page needs its stylesheet before the user has a session
+            asset = STATIC_ASSETS.get(name)
+            if asset is None:
+                response.status = 404
+                return ""
+            page, content_type = asset
+            # A ?v= URL names exactly this content, so it never needs revalidating
+            if request.query.get("v") == page.etag.strip('"'):
+                cache_control = "public, max-age=31536000, immutable"
+            else:
+                cache_control = "public, max-age=86400"
+            return self._serve_page(page, content_type, cache_control)
+
         @self._app.route("/login")
         def login_page():
             """Show login page."""
             if self._check_auth():
                 return redirect("/")
-            return template(LOGIN_TEMPLATE, error=None)
+            return self._serve_page(_login_page())
 
         @self._app.route("/login", method="POST")
         def login_post():
@@ -297,7 +803,7 @@ class WebChatMode:
 
             # Rate limiting
             if not self._check_rate_limit(ip):
-                return template(LOGIN_TEMPLATE, error="Too many attempts. Try again later.")
+                return LOGIN_TPL.render(error="Too many attempts. Try again later.", theme_url=_THEME_URL)
 
             password = request.forms.get("password", "")
 
@@ -312,7 +818,7 @@ class WebChatMode:
             else:
                 # Wrong password — record attempt
                 self._record_login_attempt(ip)
-                return template(LOGIN_TEMPLATE, error="Invalid password")
+                return LOGIN_TPL.render(error="Invalid password", theme_url=_THEME_URL)
 
         @self._app.route("/logout")
         def logout():
@@ -325,40 +831,33 @@ class WebChatMode:
             auth_check = self._require_auth()
             if auth_check:
                 return auth_check
-            return template(
-                HTML_TEMPLATE,
-                name=self.personality.name,
-                face=self._get_face_str(),
-                status=self.personality.get_status_line(),
-                thought=self.personality.last_thought or "",
-            )
+            return self._serve_page(self._get_shell("index", HTML_TPL, **_INDEX_PARAMS))
 
         @self._app.route("/settings")
         def settings_page():
             auth_check = self._require_auth()
             if auth_check:
                 return auth_check
-            return template(
-                SETTINGS_TEMPLATE,
-                name=self.personality.name,
-                face=self._get_face_str(),
-                traits=self.personality.traits.to_dict(),
-                status=self.personality.get_status_line(),
-                thought=self.personality.last_thought or "",
-            )
+            # Embed the settings payload so the page doesn't need a second
+            # round trip to /api/settings. "<" is escaped so user-provided
+            # strings (e.g. system prompt) can't close the <script> tag.
+            # The shell is only re-rendered (and re-gzipped) when the
+            # settings themselves change; live state comes from /api/state.
+            settings_json = _json_dumps(self._get_settings_dict()).decode("utf-8").replace("<", "\\u003c")
+            return self._serve_page(self._get_shell(
+                "settings",
+                SETTINGS_TPL,
+                trait_pct={k: int(v * 100) for k, v in self.personality.traits.to_dict().items()},
+                settings_json=settings_json,
+                **_SETTINGS_ASSET_URLS,
+            ))
 
         @self._app.route("/tasks")
         def tasks_page():
             auth_check = self._require_auth()
             if auth_check:
                 return auth_check
-            return template(
-                TASKS_TEMPLATE,
-                name=self.personality.name,
-                face=self._get_face_str(),
-                status=self.personality.get_status_line(),
-                thought=self.personality.last_thought or "",
-            )
+            return self._serve_page(self._get_shell("tasks", TASKS_TPL, **_TASKS_ASSET_URLS))
 
         @self._app.route("/files")
         def files_page():
@@ -372,132 +871,115 @@ class WebChatMode:
             if sd_config.get("enabled", False):
                 sd_path = sd_config.get("path")
                 if sd_path == "auto":
-                    from core.storage import get_sd_card_path
                     sd_available = get_sd_card_path() is not None
                 else:
-                    from core.storage import is_storage_available
                     sd_available = is_storage_available(sd_path) if sd_path else False
 
-            return template(
-                FILES_TEMPLATE,
-                name=self.personality.name,
-                face=self._get_face_str(),
-                sd_available=sd_available,
-                status=self.personality.get_status_line(),
-                thought=self.personality.last_thought or "",
-            )
+            return self._serve_page(self._get_shell("files", FILES_TPL, sd_available=sd_available, **_FILES_ASSET_URLS))
 
         @self._app.route("/api/chat", method="POST")
         def chat():
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
-            data = request.json or {}
+            data = _request_json() or {}
             message = data.get("message", "").strip()
 
             if not message:
-                return json.dumps({"error": "Empty message"})
+                return _jresp({"error": "Empty message"})
 
             # Handle commands
             if message.startswith("/"):
                 result = self._handle_command_sync(message)
-                return json.dumps(result)
+                return _jresp(result)
 
             # Handle chat
-            result = self._handle_chat_sync(message)
-            return json.dumps(result)
+            result = self._submit_chat(message, str(data.get("request_id") or "")[:64])
+            return _jresp(result)
 
         @self._app.route("/api/command", method="POST")
         def command():
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
-            data = request.json or {}
+            data = _request_json() or {}
             cmd = data.get("command", "").strip()
 
             if not cmd:
-                return json.dumps({"error": "Empty command"})
+                return _jresp({"error": "Empty command"})
 
             result = self._handle_command_sync(cmd)
-            return json.dumps(result)
+            return _jresp(result)
 
         @self._app.route("/api/state")
         def state():
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
+            body, mtime, etag = self._get_state_json()
+            if_none_match = request.headers.get("If-None-Match", "")
+
+            # ?wait=N turns a poll the client is already up to date on into a
+            # long-poll that returns as soon as the state changes
+            try:
+                wait = float(request.query.get("wait") or 0)
+            except ValueError:
+                wait = 0
+            # nan/inf would slip through the clamp and spin the wait loop
+            wait = min(max(wait, 0), STATE_MAX_WAIT_SECONDS) if math.isfinite(wait) else 0
+            if wait and _etag_matches(etag, if_none_match):
+                if self._state_waiters.acquire(blocking=False):
+                    try:
+                        body, mtime, etag = self._wait_for_state_change(etag, wait)
+                    finally:
+                        self._state_waiters.release()
+                else:
+                    # Every waiter slot is taken: answer now and have the
+                    # client come back later instead of tying up a thread
+                    response.set_header("Retry-After", str(STATE_BUSY_RETRY_SECONDS))
+
+            # Polled every few seconds: allow conditional revalidation, but
+            # stop proxies from buffering or re-encoding the response
+            response.set_header("Cache-Control", "no-cache, no-transform")
+            response.set_header("X-Accel-Buffering", "no")
+            response.set_header("ETag", etag)
+            response.set_header("Last-Modified", bottle.http_date(mtime))
+
+            # If-None-Match takes precedence over If-Modified-Since
+            if if_none_match:
+                not_modified = _etag_matches(etag, if_none_match)
+            else:
+                since = bottle.parse_date(request.headers.get("If-Modified-Since", ""))
+                not_modified = bool(since and since >= mtime)
+            if not_modified:
+                response.status = 304
+                return ""
+
             response.content_type = "application/json"
-            return json.dumps({
-                "face": self._get_face_str(),
-                "status": self.personality.get_status_line(),
-                "mood": self.personality.mood.current.value,
-                "thought": self.personality.last_thought or "",
-                "focus": self.focus_manager.get_display_snapshot() if self.focus_manager else {"focus_active": False},
-            })
+            return body
 
         @self._app.route("/api/settings", method="GET")
         def get_settings():
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
-
-            # Get AI config from Brain
-            ai_config = {
-                "primary": self.brain.config.get("primary", "anthropic"),
-                "anthropic": {
-                    "model": self.brain.config.get("anthropic", {}).get("model", "claude-3-haiku-20240307"),
-                },
-                "openai": {
-                    "model": self.brain.config.get("openai", {}).get("model", "gpt-4o-mini"),
-                },
-                "gemini": {
-                    "model": self.brain.config.get("gemini", {}).get("model", "gemini-2.0-flash-exp"),
-                },
-                "ollama": {
-                    "model": self.brain.config.get("ollama", {}).get("model", "qwen3-coder-next"),
-                },
-                "budget": {
-                    "daily_tokens": self.brain.budget.daily_limit,
-                    "max_tokens": self.brain.config.get("budget", {}).get("per_request_max", 150),
-                },
-                "system_prompt": self.brain.config.get("system_prompt", ""),
-            }
-
-            # Get display config
-            display_config = {
-                "dark_mode": self.display._dark_mode,
-                "screensaver": {
-                    "enabled": self.display._screensaver_enabled,
-                    "idle_timeout_minutes": self.display._screensaver_idle_minutes,
-                }
-            }
-
-            return json.dumps({
-                "name": self.personality.name,
-                "traits": self.personality.traits.to_dict(),
-                "ai": ai_config,
-                "display": display_config,
-            })
+            return _jresp(self._get_settings_dict())
 
         @self._app.route("/api/settings", method="POST")
         def save_settings():
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
-            data = request.json or {}
+            data = _request_json() or {}
 
             try:
                 # Update personality name
                 if "name" in data:
                     name = data["name"].strip()
                     if not name:
-                        return json.dumps({"success": False, "error": "Name cannot be empty"})
+                        return _jresp({"success": False, "error": "Name cannot be empty"})
                     if len(name) > 20:
-                        return json.dumps({"success": False, "error": "Name too long (max 20 characters)"})
+                        return _jresp({"success": False, "error": "Name too long (max 20 characters)"})
                     self.personality.name = name
 
                 # Update traits (validate 0.0-1.0 range)
@@ -515,11 +997,7 @@ class WebChatMode:
                     # Apply dark mode
                     if "dark_mode" in display_settings:
                         self.display._dark_mode = display_settings["dark_mode"]
-                        if self._loop:
-                            asyncio.run_coroutine_threadsafe(
-                                self.display.update(force=True),
-                                self._loop
-                            )
+                        self._update_display(force=True)
 
                     # Apply screensaver settings
                     if "screensaver" in display_settings:
@@ -535,10 +1013,10 @@ class WebChatMode:
                 # Save to config.local.yml
                 self._save_config_file(data)
 
-                return json.dumps({"success": True})
+                return _jresp({"success": True})
 
             except Exception as e:
-                return json.dumps({"success": False, "error": str(e)})
+                return _jresp({"success": False, "error": str(e)})
 
         # Task Management API Routes
         @self._app.route("/api/tasks", method="GET")
@@ -546,10 +1024,9 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             if not self.task_manager:
-                return json.dumps({"error": "Task manager not available"})
+                return _jresp({"error": "Task manager not available"})
 
             # Parse query parameters
             status_param = request.query.get("status")
@@ -567,7 +1044,7 @@ class WebChatMode:
                 project=project_param
             )
 
-            return json.dumps({
+            return _jresp({
                 "tasks": [self._task_to_dict(t) for t in tasks]
             })
 
@@ -576,16 +1053,15 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             if not self.task_manager:
-                return json.dumps({"error": "Task manager not available"})
+                return _jresp({"error": "Task manager not available"})
 
-            data = request.json or {}
+            data = _request_json() or {}
             title = data.get("title", "").strip()
 
             if not title:
-                return json.dumps({"error": "Task title is required"})
+                return _jresp({"error": "Task title is required"})
 
             try:
                 priority = Priority(data.get("priority", "medium"))
@@ -595,7 +1071,6 @@ class WebChatMode:
             # Parse due date if provided
             due_date = None
             if "due_in_days" in data:
-                import time
                 days = float(data["due_in_days"])
                 due_date = time.time() + (days * 86400)
 
@@ -615,7 +1090,7 @@ class WebChatMode:
                 {"priority": task.priority.value, "title": task.title}
             )
 
-            return json.dumps({
+            return _jresp({
                 "success": True,
                 "task": self._task_to_dict(task),
                 "celebration": result.get("message") if result else None,
@@ -627,18 +1102,17 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             if not self.task_manager:
-                return json.dumps({"error": "Task manager not available"})
+                return _jresp({"error": "Task manager not available"})
 
             task = self.task_manager.get_task(task_id)
 
             if not task:
                 response.status = 404
-                return json.dumps({"error": "Task not found"})
+                return _jresp({"error": "Task not found"})
 
-            return json.dumps({
+            return _jresp({
                 "task": self._task_to_dict(task)
             })
 
@@ -647,16 +1121,15 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             if not self.task_manager:
-                return json.dumps({"error": "Task manager not available"})
+                return _jresp({"error": "Task manager not available"})
 
             task = self.task_manager.complete_task(task_id)
 
             if not task:
                 response.status = 404
-                return json.dumps({"error": "Task not found"})
+                return _jresp({"error": "Task not found"})
 
             # Calculate if on-time
             was_on_time = (
@@ -674,7 +1147,7 @@ class WebChatMode:
                 }
             )
 
-            return json.dumps({
+            return _jresp({
                 "success": True,
                 "task": self._task_to_dict(task),
                 "celebration": result.get("message") if result else None,
@@ -686,18 +1159,17 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             if not self.task_manager:
-                return json.dumps({"error": "Task manager not available"})
+                return _jresp({"error": "Task manager not available"})
 
             task = self.task_manager.get_task(task_id)
 
             if not task:
                 response.status = 404
-                return json.dumps({"error": "Task not found"})
+                return _jresp({"error": "Task not found"})
 
-            data = request.json or {}
+            data = _request_json() or {}
 
             # Update fields
             if "title" in data:
@@ -716,9 +1188,8 @@ class WebChatMode:
                     pass
             if "due_date" in data:
                 if data["due_date"]:
-                    from datetime import datetime as dt
                     try:
-                        task.due_date = dt.fromisoformat(data["due_date"]).timestamp()
+                        task.due_date = datetime.fromisoformat(data["due_date"]).timestamp()
                     except (ValueError, TypeError):
                         pass
                 else:
@@ -730,7 +1201,7 @@ class WebChatMode:
 
             self.task_manager.update_task(task)
 
-            return json.dumps({
+            return _jresp({
                 "success": True,
                 "task": self._task_to_dict(task)
             })
@@ -740,40 +1211,59 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             if not self.task_manager:
-                return json.dumps({"error": "Task manager not available"})
+                return _jresp({"error": "Task manager not available"})
 
             deleted = self.task_manager.delete_task(task_id)
 
             if not deleted:
                 response.status = 404
-                return json.dumps({"error": "Task not found"})
+                return _jresp({"error": "Task not found"})
 
-            return json.dumps({"success": True})
+            return _jresp({"success": True})
 
         @self._app.route("/api/tasks/stats", method="GET")
         def get_task_stats():
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             if not self.task_manager:
-                return json.dumps({"error": "Task manager not available"})
+                return _jresp({"error": "Task manager not available"})
 
-            stats = self.task_manager.get_stats()
+            return _jresp({
+                "stats": self._get_task_stats()
+            })
 
-            # Include streak from progression
-            try:
-                stats["current_streak"] = self.personality.progression.current_streak
-            except Exception:
-                stats["current_streak"] = 0
+        @self._app.route("/api/tasks/bundle", method="GET")
+        def get_tasks_bundle():
+            """Everything the Tasks page needs on load, in one round-trip."""
+            auth_err = self._require_api_auth()
+            if auth_err:
+                return auth_err
 
-            return json.dumps({
-                "stats": stats
-            })
+            if not self.task_manager:
+                return _jresp({"error": "Task manager not available"})
+
+            tasks_body = _json_dumps([self._task_to_dict(t) for t in self.task_manager.list_tasks()])
+            stats_body = _json_dumps(self._get_task_stats())
+
+            # The ETag covers tasks and stats only: the page's periodic refresh
+            # gets a bodiless 304 until a task changes, while face/status come
+            # from its /api/state long-poll.
+            digest = hashlib.blake2b(tasks_body, digest_size=8)
+            digest.update(stats_body)
+            etag = f'"{digest.hexdigest()}"'
+            response.set_header("ETag", etag)
+            if _etag_matches(etag, request.headers.get("If-None-Match", "")):
+                response.status = 304
+                return b""
+
+            # State is already serialized; splice it in rather than re-encoding
+            state_body, _, _ = self._get_state_json()
+            response.content_type = "application/json"
+            return b'{"tasks":%s,"stats":%s,"state":%s}' % (tasks_body, stats_body, state_body)
 
         def get_base_dir(storage: str) -> Optional[str]:
             """Get base directory for storage location."""
@@ -789,7 +1279,6 @@ class WebChatMode:
                 sd_path = sd_config.get("path")
                 if sd_path == "auto":
                     # Auto-detect SD card
-                    from core.storage import get_sd_card_path
                     detected_path = get_sd_card_path()
                     return detected_path
                 else:
@@ -803,7 +1292,6 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             # Get storage and path from query params
             storage = request.query.get("storage", "inkling")
@@ -813,18 +1301,18 @@ class WebChatMode:
                 # Get base directory for storage location
                 base_dir = get_base_dir(storage)
                 if not base_dir:
-                    return json.dumps({"error": f"Storage '{storage}' not available"})
+                    return _jresp({"error": f"Storage '{storage}' not available"})
                 base_dir_real = os.path.realpath(base_dir)
 
                 if path:
                     full_path = self._safe_resolve_path(base_dir, path)
                     if not full_path:
-                        return json.dumps({"error": "Invalid path"})
+                        return _jresp({"error": "Invalid path"})
                 else:
                     full_path = base_dir_real
 
                 if not os.path.exists(full_path):
-                    return json.dumps({"error": "Path not found"})
+                    return _jresp({"error": "Path not found"})
 
                 # List files and directories
                 items = []
@@ -850,14 +1338,14 @@ class WebChatMode:
                 # Sort: directories first, then by name
                 items.sort(key=lambda x: (x["type"] != "dir", x["name"]))
 
-                return json.dumps({
+                return _jresp({
                     "success": True,
                     "path": os.path.relpath(full_path, base_dir_real) if full_path != base_dir_real else "",
                     "items": items,
                 })
 
             except Exception as e:
-                return json.dumps({"error": "Failed to list files"})
+                return _jresp({"error": "Failed to list files"})
 
         @self._app.route("/api/files/view", method="GET")
         def view_file():
@@ -865,25 +1353,24 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             storage = request.query.get("storage", "inkling")
             path = request.query.get("path", "")
             if not path:
-                return json.dumps({"error": "No path specified"})
+                return _jresp({"error": "No path specified"})
 
             try:
                 # Get base directory for storage location
                 base_dir = get_base_dir(storage)
                 if not base_dir:
-                    return json.dumps({"error": f"Storage '{storage}' not available"})
+                    return _jresp({"error": f"Storage '{storage}' not available"})
 
                 full_path = self._safe_resolve_path(base_dir, path)
                 if not full_path:
-                    return json.dumps({"error": "Invalid path"})
+                    return _jresp({"error": "Invalid path"})
 
                 if not os.path.isfile(full_path):
-                    return json.dumps({"error": "Not a file"})
+                    return _jresp({"error": "Not a file"})
 
                 # Check file extension - support common code and text files
                 SUPPORTED_EXTENSIONS = {
@@ -903,19 +1390,19 @@ class WebChatMode:
 
                 ext = os.path.splitext(full_path)[1].lower()
                 if ext not in SUPPORTED_EXTENSIONS and ext != '':  # Allow extensionless files
-                    return json.dumps({"error": f"File type '{ext}' not supported for viewing"})
+                    return _jresp({"error": f"File type '{ext}' not supported for viewing"})
 
                 # Read file (limit size to prevent memory issues)
                 max_size = 1024 * 1024  # 1MB
                 file_size = os.path.getsize(full_path)
 
                 if file_size > max_size:
-                    return json.dumps({"error": f"File too large ({file_size} bytes, max 1MB)"})
+                    return _jresp({"error": f"File too large ({file_size} bytes, max 1MB)"})
 
                 with open(full_path, 'r', encoding='utf-8', errors='ignore') as f:
                     content = f.read()
 
-                return json.dumps({
+                return _jresp({
                     "success": True,
                     "content": content,
                     "name": os.path.basename(full_path),
@@ -923,7 +1410,7 @@ class WebChatMode:
                 })
 
             except Exception as e:
-                return json.dumps({"error": "Failed to read file"})
+                return _jresp({"error": "Failed to read file"})
 
         @self._app.route("/api/files/download")
         def download_file():
@@ -961,35 +1448,34 @@ class WebChatMode:
         @self._app.route("/api/files/edit", method="POST")
         def edit_file():
             """Edit/update file contents."""
-            response.content_type = "application/json"
 
             storage = request.query.get("storage", "inkling")
             path = request.query.get("path", "")
 
             if not path:
-                return json.dumps({"error": "No path specified"})
+                return _jresp({"error": "No path specified"})
 
             try:
                 # Get request body (new file content)
-                data = request.json
+                data = _request_json()
                 if not data or "content" not in data:
-                    return json.dumps({"error": "No content provided"})
+                    return _jresp({"error": "No content provided"})
 
                 new_content = data["content"]
 
                 # Get base directory for storage location
                 base_dir = get_base_dir(storage)
                 if not base_dir:
-                    return json.dumps({"error": f"Storage '{storage}' not available"})
+                    return _jresp({"error": f"Storage '{storage}' not available"})
 
                 full_path = os.path.normpath(os.path.join(base_dir, path))
 
                 # Security: Ensure path is within base directory
                 if not full_path.startswith(base_dir):
-                    return json.dumps({"error": "Invalid path"})
+                    return _jresp({"error": "Invalid path"})
 
                 if not os.path.isfile(full_path):
-                    return json.dumps({"error": "Not a file"})
+                    return _jresp({"error": "Not a file"})
 
                 # Check file extension (same as view endpoint)
                 SUPPORTED_EXTENSIONS = {
@@ -1009,66 +1495,64 @@ class WebChatMode:
 
                 ext = os.path.splitext(full_path)[1].lower()
                 if ext not in SUPPORTED_EXTENSIONS and ext != '':
-                    return json.dumps({"error": f"File type '{ext}' cannot be edited"})
+                    return _jresp({"error": f"File type '{ext}' cannot be edited"})
 
                 # Create backup before editing
                 backup_path = full_path + ".bak"
-                import shutil
                 shutil.copy2(full_path, backup_path)
 
                 # Write new content
                 with open(full_path, 'w', encoding='utf-8') as f:
                     f.write(new_content)
 
-                return json.dumps({
+                return _jresp({
                     "success": True,
                     "message": f"File '{os.path.basename(full_path)}' updated successfully",
                     "backup": os.path.basename(backup_path)
                 })
 
             except Exception as e:
-                return json.dumps({"error": str(e)})
+                return _jresp({"error": str(e)})
 
         @self._app.route("/api/files/delete", method="POST")
         def delete_file():
             """Delete a file with confirmation."""
-            response.content_type = "application/json"
 
             storage = request.query.get("storage", "inkling")
             path = request.query.get("path", "")
 
             if not path:
-                return json.dumps({"error": "No path specified"})
+                return _jresp({"error": "No path specified"})
 
             try:
                 # Get request body (confirmation flag)
-                data = request.json
+                data = _request_json()
                 if not data or not data.get("confirmed", False):
-                    return json.dumps({"error": "Deletion not confirmed"})
+                    return _jresp({"error": "Deletion not confirmed"})
 
                 # Get base directory for storage location
                 base_dir = get_base_dir(storage)
                 if not base_dir:
-                    return json.dumps({"error": f"Storage '{storage}' not available"})
+                    return _jresp({"error": f"Storage '{storage}' not available"})
 
                 full_path = os.path.normpath(os.path.join(base_dir, path))
 
                 # Security: Ensure path is within base directory
                 if not full_path.startswith(base_dir):
-                    return json.dumps({"error": "Invalid path"})
+                    return _jresp({"error": "Invalid path"})
 
                 if not os.path.exists(full_path):
-                    return json.dumps({"error": "File not found"})
+                    return _jresp({"error": "File not found"})
 
                 # Prevent deleting critical system files
                 filename = os.path.basename(full_path)
                 if filename in ['tasks.db', 'conversation.json', 'memory.db', 'personality.json']:
-                    return json.dumps({"error": "Cannot delete system file"})
+                    return _jresp({"error": "Cannot delete system file"})
 
                 # Delete the file
                 if os.path.isfile(full_path):
                     os.remove(full_path)
-                    return json.dumps({
+                    return _jresp({
                         "success": True,
                         "message": f"File '{filename}' deleted successfully"
                     })
@@ -1076,15 +1560,15 @@ class WebChatMode:
                     # Optional: Allow directory deletion (empty only)
                     if len(os.listdir(full_path)) == 0:
                         os.rmdir(full_path)
-                        return json.dumps({
+                        return _jresp({
                             "success": True,
                             "message": f"Directory '{filename}' deleted successfully"
                         })
                     else:
-                        return json.dumps({"error": "Directory not empty"})
+                        return _jresp({"error": "Directory not empty"})
 
             except Exception as e:
-                return json.dumps({"error": str(e)})
+                return _jresp({"error": str(e)})
 
         @self._app.route("/api/system/restart", method="POST")
         def restart_device():
@@ -1092,18 +1576,16 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             try:
-                import subprocess
                 # Run sudo reboot in background to allow response to be sent
                 subprocess.Popen(["sudo", "reboot"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                return json.dumps({
+                return _jresp({
                     "success": True,
                     "message": "Device restarting... Please wait 30 seconds."
                 })
             except Exception as e:
-                return json.dumps({
+                return _jresp({
                     "success": False,
                     "error": f"Failed to restart: {str(e)}"
                 })
@@ -1114,26 +1596,22 @@ class WebChatMode:
             auth_err = self._require_api_auth()
             if auth_err:
                 return auth_err
-            response.content_type = "application/json"
 
             try:
-                import subprocess
                 # Run sudo shutdown in background to allow response to be sent
                 subprocess.Popen(["sudo", "shutdown", "-h", "now"], stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
-                return json.dumps({
+                return _jresp({
                     "success": True,
                     "message": "Device shutting down... Goodbye!"
                 })
             except Exception as e:
-                return json.dumps({
+                return _jresp({
                     "success": False,
                     "error": f"Failed to shutdown: {str(e)}"
                 })
 
     def _task_to_dict(self, task: Task) -> Dict[str, Any]:
         """Convert Task to JSON-serializable dict."""
-        from datetime import datetime
-
         data = {
             "id": task.id,
             "title": task.title,
@@ -1160,85 +1638,236 @@ class WebChatMode:
 
         return data
 
+    def _get_task_stats(self) -> Dict[str, Any]:
+        """Task counts plus the current streak, for the Tasks page header."""
+        stats = self.task_manager.get_stats()
+
+        # Include streak from progression
+        try:
+            stats["current_streak"] = self.personality.progression.current_streak
+        except Exception:
+            stats["current_streak"] = 0
+
+        return stats
+
     def _get_face_str(self) -> str:
-        """Get current face as string."""
-        face_name = self.personality.face
-        return self._faces.get(face_name, self._faces["default"])
+        """Get current face as string (memoized until the mood changes).
+
+        The face name is derived purely from the current mood, so a cache hit
+        is a single identity check instead of resolving the face property.
+        """
+        mood = self.personality.mood.current
+        cached = self._face_cache
+        if cached[0] is mood:
+            return cached[1]
+        face_str = self._faces.get(mood.face, _DEFAULT_FACE)
+        self._face_cache = (mood, face_str)
+        return face_str
+
+    def _get_shell(self, page: str, tpl: SimpleTemplate, **params) -> "StaticPage":
+        """Return the pre-rendered shell for a page, rebuilding it on change.
+
+        Shells only bake in the device name and page-specific params; live
+        face/status/thought are left at defaults and filled in by the page's
+        first /api/state call.
+        """
+        key = (self.personality.name, tuple(sorted(params.items())))
+        cached = self._shells.get(page)
+        if cached is None or cached[0] != key:
+            html = tpl.render(
+                name=self.personality.name,
+                face=_DEFAULT_FACE,
+                status="",
+                thought="",
+                theme_url=_THEME_URL,
+                **params,
+            )
+            cached = (key, StaticPage(html))
+            self._shells[page] = cached
+        return cached[1]
+
+    @staticmethod
+    def _serve_page(
+        page: "StaticPage",
+        content_type: str = "text/html; charset=UTF-8",
+        cache_control: str = "private, no-cache",
+    ) -> bytes:
+        """Send a pre-rendered page, honouring If-None-Match, brotli and gzip."""
+        response.set_header("ETag", page.etag)
+        response.set_header("Cache-Control", cache_control)
+        response.set_header("Vary", "Accept-Encoding")
+        if _etag_matches(page.etag, request.headers.get("If-None-Match", "")):
+            response.status = 304
+            return b""
+        response.content_type = content_type
+        accept_encoding = request.headers.get("Accept-Encoding", "")
+        if page.br is not None and _accepts_encoding(accept_encoding, "br"):
+            response.set_header("Content-Encoding", "br")
+            return page.br
+        if _accepts_encoding(accept_encoding, "gzip"):
+            response.set_header("Content-Encoding", "gzip")
+            return page.gz
+        return page.body
+
+    def _get_state_json(self) -> tuple:
+        """Serialize the polled UI state and track when it last changed.
+
+        Returns (json_body, mtime, etag). mtime is in whole seconds (the
+        resolution of HTTP dates) and always moves forward on change, so two
+        changes in the same second can't be hidden behind one Last-Modified
+        value. Long-polling requests are woken whenever a change is seen.
+        """
+        body = _STATE_TEMPLATE % (
+            _json_dumps(self._get_face_str()),
+            _json_dumps(self.personality.get_status_line()),
+            _json_dumps(self.personality.mood.current.value),
+            _json_dumps(self.personality.last_thought or ""),
+            _json_dumps(self.focus_manager.get_display_snapshot()) if self.focus_manager else _NO_FOCUS_JSON,
+        )
+        with self._state_lock:
+            if body != self._state_body:
+                self._state_body = body
+                self._state_mtime = max(int(time.time()), self._state_mtime + 1)
+                self._state_etag = f'"{hashlib.blake2b(body, digest_size=8).hexdigest()}"'
+                self._state_changed.notify_all()
+            return body, self._state_mtime, self._state_etag
+
+    def _wait_for_state_change(self, etag: str, timeout: float) -> tuple:
+        """Block until the state no longer matches etag, or timeout expires.
+
+        The state is not re-read while waiting: _refresh_state() (after each
+        POST and on the mood tick) recomputes it once and wakes every waiter
+        if it changed. One last read on the way out catches anything else.
+
+        Returns the latest (json_body, mtime, etag).
+        """
+        deadline = time.monotonic() + timeout
+        self._get_state_json()
+        with self._state_changed:
+            # Checked under the lock, so a change between the read above and
+            # the wait below can't be missed
+            while self._state_etag == etag:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                self._state_changed.wait(remaining)
+        return self._get_state_json()
+
+    def _refresh_state(self) -> None:
+        """Recompute the polled state, waking long-polls if it changed."""
+        self._get_state_json()
+
+    def _get_settings_dict(self) -> Dict[str, Any]:
+        """Build the settings payload shared by /settings and /api/settings."""
+        # Get AI config from Brain
+        ai_config = {
+            "primary": self.brain.config.get("primary", "anthropic"),
+            "anthropic": {
+                "model": self.brain.config.get("anthropic", {}).get("model", "claude-3-haiku-20240307"),
+            },
+            "openai": {
+                "model": self.brain.config.get("openai", {}).get("model", "gpt-4o-mini"),
+            },
+            "gemini": {
+                "model": self.brain.config.get("gemini", {}).get("model", "gemini-2.0-flash-exp"),
+            },
+            "ollama": {
+                "model": self.brain.config.get("ollama", {}).get("model", "qwen3-coder-next"),
+            },
+            "budget": {
+                "daily_tokens": self.brain.budget.daily_limit,
+                "max_tokens": self.brain.config.get("budget", {}).get("per_request_max", 150),
+            },
+            "system_prompt": self.brain.config.get("system_prompt", ""),
+        }
+
+        # Get display config
+        display_config = {
+            "dark_mode": self.display._dark_mode,
+            "screensaver": {
+                "enabled": self.display._screensaver_enabled,
+                "idle_timeout_minutes": self.display._screensaver_idle_minutes,
+            }
+        }
+
+        return {
+            "name": self.personality.name,
+            "traits": self.personality.traits.to_dict(),
+            "ai": ai_config,
+            "display": display_config,
+        }
 
     def _save_config_file(self, new_settings: dict) -> None:
         """Save settings to config.local.yml"""
-        from pathlib import Path
         import yaml
 
+        # Prefer the libyaml C bindings; PyYAML silently falls back to the
+        # pure-Python parser/emitter otherwise
+        loader = getattr(yaml, "CSafeLoader", yaml.SafeLoader)
+        dumper = getattr(yaml, "CSafeDumper", yaml.SafeDumper)
+
         config_file = Path("config.local.yml")
 
-        # Load existing config or start fresh
-        if config_file.exists():
+        # Load existing config (cached until the file changes on disk)
+        original = self._load_local_config(config_file, loader)
+        config = copy.deepcopy(original)
+
+        for src, dest, merge in _SETTINGS_TO_CONFIG:
+            value = _dig(new_settings, src)
+            if value is _MISSING:
+                continue
+            *parents, leaf = dest
+            node = config
+            for key in parents:
+                node = node.setdefault(key, {})
+            if merge:
+                node.setdefault(leaf, {}).update(value)
+            else:
+                node[leaf] = value
+
+        # An empty system prompt means "use the default"
+        if _dig(new_settings, ("ai", "system_prompt")) is not _MISSING:
+            config.setdefault("ai", {})["system_prompt"] = new_settings["ai"]["system_prompt"] or None
+
+        # Nothing changed: skip the write entirely
+        if config == original:
+            return
+
+        # Write to a temp file and swap it in so a crash mid-write can't
+        # leave a truncated config behind
+        tmp_file = config_file.with_name(config_file.name + ".tmp")
+        with open(tmp_file, 'w') as f:
+            yaml.dump(config, f, Dumper=dumper, default_flow_style=False)
+        os.replace(tmp_file, config_file)
+        self._local_config = (self._file_signature(config_file), config)
+
+    @staticmethod
+    def _file_signature(path: Path) -> Optional[tuple]:
+        """Return (mtime_ns, size) for path, or None if it doesn't exist."""
+        try:
+            st = path.stat()
+        except FileNotFoundError:
+            return None
+        return (st.st_mtime_ns, st.st_size)
+
+    def _load_local_config(self, config_file: Path, loader) -> dict:
+        """Return the parsed config.local.yml, re-reading it only when it changed.
+
+        Other components (e.g. the scheduler) also write this file, so the
+        cache is keyed on the file's mtime and size rather than trusted forever.
+        The returned dict is shared with the cache and must not be mutated.
+        """
+        import yaml
+
+        signature = self._file_signature(config_file)
+        if signature is None:
+            return {}
+        cached = self._local_config
+        if cached is None or cached[0] != signature:
             with open(config_file) as f:
-                config = yaml.safe_load(f) or {}
-        else:
-            config = {}
-
-        # Update device name
-        if "name" in new_settings:
-            if "device" not in config:
-                config["device"] = {}
-            config["device"]["name"] = new_settings["name"]
-
-        # Update personality traits
-        if "traits" in new_settings:
-            if "personality" not in config:
-                config["personality"] = {}
-            config["personality"].update(new_settings["traits"])
-
-        # Update display settings
-        if "display" in new_settings:
-            if "display" not in config:
-                config["display"] = {}
-
-            display_settings = new_settings["display"]
-
-            # Update dark mode
-            if "dark_mode" in display_settings:
-                config["display"]["dark_mode"] = display_settings["dark_mode"]
-
-            # Update screensaver settings
-            if "screensaver" in display_settings:
-                if "screensaver" not in config["display"]:
-                    config["display"]["screensaver"] = {}
-                config["display"]["screensaver"].update(display_settings["screensaver"])
-
-        # Update AI configuration
-        if "ai" in new_settings:
-            if "ai" not in config:
-                config["ai"] = {}
-
-            ai_settings = new_settings["ai"]
-
-            # Update primary provider
-            if "primary" in ai_settings:
-                config["ai"]["primary"] = ai_settings["primary"]
-
-            # Update provider-specific settings
-            for provider in ["anthropic", "openai", "gemini", "ollama"]:
-                if provider in ai_settings:
-                    if provider not in config["ai"]:
-                        config["ai"][provider] = {}
-                    config["ai"][provider].update(ai_settings[provider])
-
-            # Update budget settings
-            if "budget" in ai_settings:
-                if "budget" not in config["ai"]:
-                    config["ai"]["budget"] = {}
-                config["ai"]["budget"].update(ai_settings["budget"])
-
-            # Update system prompt (optional)
-            if "system_prompt" in ai_settings:
-                config["ai"]["system_prompt"] = ai_settings["system_prompt"] or None
-
-        # Write back to file
-        with open(config_file, 'w') as f:
-            yaml.dump(config, f, default_flow_style=False)
+                cached = (signature, yaml.load(f, Loader=loader) or {})
+            self._local_config = cached
+        return cached[1]
 
     # Command handlers (all prefixed with _cmd_)
 
@@ -1412,89 +2041,236 @@ class WebChatMode:
 
     def _handle_command_sync(self, command: str) -> Dict[str, Any]:
         """Handle slash commands (sync wrapper)."""
-        parts = command.split(maxsplit=1)
-        cmd_name = parts[0].lower().lstrip("/")
-        args = parts[1] if len(parts) > 1 else ""
+        # Callers pass a stripped "/name args" string (the slash is optional)
+        start = 1 if command.startswith("/") else 0
+        end = command.find(" ", start)
+        if end == -1:
+            cmd_name, args = command[start:].lower(), ""
+        else:
+            cmd_name, args = command[start:end].lower(), command[end + 1:].lstrip()
 
-        # Look up command in registry
-        cmd_obj = get_command(cmd_name)
-        if not cmd_obj:
+        # Look up command in the prevalidated dispatch table
+        entry = self._commands.get(cmd_name)
+        if not entry:
             return {"response": f"Unknown command: /{cmd_name}", "error": True}
-
-        # Check requirements
-        if cmd_obj.requires_brain and not self.brain:
-            return {"response": "This command requires AI features.", "error": True}
-
-        if cmd_obj.requires_api and not self.api_client:
-            return {"response": "This command requires social features (set api_base in config).", "error": True}
-
-        # Get handler method
-        handler_name = f"_cmd_{cmd_obj.name}"
-        handler = getattr(self, handler_name, None)
-        if not handler:
-            return {"response": f"Command handler not implemented: {cmd_obj.name}", "error": True}
+        handler, takes_args = entry
 
         # Call handler with args if needed
         try:
-            if cmd_obj.name in ("face", "dream", "ask", "schedule", "bash", "task", "done", "cancel", "delete", "tasks", "find", "focus"):
-                return handler(args) if args or cmd_obj.name in ("tasks", "schedule", "find") else handler()
-            else:
-                return handler()
+            return handler(args) if takes_args else handler()
         except Exception as e:
-            import traceback
             error_msg = f"Command error: {str(e)}"
             traceback.print_exc()  # Print to server logs
             return {"response": error_msg, "error": True}
 
+    def _build_command_table(self) -> Dict[str, tuple]:
+        """Map each registered command name to (handler, takes_args).
+
+        Requirements are checked here, once: commands that can't run in this
+        session (no brain, no social API client, no _cmd_<name> method) get a
+        handler that just builds their error reply. Coalesced commands are
+        pre-wrapped in _single_flight. takes_args is True when the handler has
+        an `args` parameter, in which case it is always passed (possibly empty).
+        """
+        table = {}
+        for cmd in COMMANDS:
+            handler = getattr(self, f"_cmd_{cmd.name}", None)
+            if cmd.requires_brain and not self.brain:
+                error = "This command requires AI features."
+            elif cmd.requires_api:
+                # Web mode has no social API client
+                error = "This command requires social features (set api_base in config)."
+            elif handler is None:
+                error = f"Command handler not implemented: {cmd.name}"
+            else:
+                error = None
+
+            if error is not None:
+                # dict(**kw) hands each caller a fresh reply to mutate
+                table[cmd.name] = (partial(dict, response=error, error=True), False)
+            elif cmd.name in COALESCED_COMMANDS:
+                table[cmd.name] = (partial(self._single_flight, cmd.name, handler), False)
+            else:
+                table[cmd.name] = (handler, "args" in inspect.signature(handler).parameters)
+        return table
+
+    def _schedule(self, coro) -> None:
+        """Run a coroutine on the event loop without waiting for its result.
+
+        For fire-and-forget work from HTTP threads (display refreshes,
+        animations). Unlike run_coroutine_threadsafe(), no concurrent Future
+        is allocated and chained to the task just to be thrown away.
+
+        Before run() has started (no loop yet) or after the loop has closed,
+        the work is dropped, so callers don't need to check for a loop.
+        """
+        loop = self._loop
+        if loop is None:
+            coro.close()
+            return
+        try:
+            loop.call_soon_threadsafe(self._start_background_task, coro)
+        except RuntimeError:
+            # Loop already closed during shutdown; drop the work quietly
+            coro.close()
+
+    def _update_display(self, **kwargs: Any) -> None:
+        """Schedule display.update(**kwargs), collapsing bursts of updates.
+
+        Updates requested while another is queued or rendering are merged
+        into a single pending one (later values win; force sticks if any
+        caller asked for it), so the panel redraws once per burst.
+        """
+        if self._loop is None:
+            return
+        with self._display_lock:
+            pending = self._pending_display
+            if pending is not None:
+                merged = {**pending, **kwargs}
+                if pending.get("force"):
+                    merged["force"] = True
+                kwargs = merged
+            self._pending_display = kwargs
+            if self._display_draining:
+                return
+            self._display_draining = True
+        self._schedule(self._drain_display_updates())
+
+    async def _drain_display_updates(self) -> None:
+        """Render pending display updates until none are left."""
+        while True:
+            with self._display_lock:
+                payload, self._pending_display = self._pending_display, None
+                if payload is None:
+                    self._display_draining = False
+                    return
+            try:
+                await self.display.update(**payload)
+            except Exception as e:
+                print(f"[Web] Display update failed: {e}")
+
+    def _start_background_task(self, coro) -> None:
+        """Create a task for coro (runs on the event loop thread)."""
+        task = self._loop.create_task(coro)
+        self._background_tasks.add(task)
+        task.add_done_callback(self._background_tasks.discard)
+
+    def _single_flight(self, key: str, fn) -> Any:
+        """Run fn(), or share the result of an identical call already running."""
+        with self._inflight_lock:
+            future = self._inflight.get(key)
+            leader = future is None
+            if leader:
+                future = Future()
+                self._inflight[key] = future
+
+        if not leader:
+            return future.result()
+
+        try:
+            result = fn()
+        except Exception as e:
+            future.set_exception(e)
+            raise
+        else:
+            future.set_result(result)
+            return result
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+
+    def _submit_chat(self, message: str, request_id: str = "") -> Dict[str, Any]:
+        """Answer a chat message once a think slot is free.
+
+        A resend carrying the request_id of a message still being answered
+        shares that reply rather than asking the AI twice and adding the
+        message to the history twice. Messages without an id, or with the same
+        text but a different id, are always answered separately.
+        """
+        if not request_id:
+            return self._queue_chat(message)
+        return self._single_flight(f"chat:{request_id}", lambda: self._queue_chat(message))
+
+    def _queue_chat(self, message: str) -> Dict[str, Any]:
+        """Wait for a think slot, then answer one message on this thread."""
+        if not self._chat_pending.acquire(blocking=False):
+            return {
+                "response": "I'm busy with other messages right now. Try again shortly!",
+                "face": _SAD_FACE,
+                "status": "busy",
+                "error": True,
+            }
+        try:
+            if not self._think_slots.acquire(timeout=CHAT_TIMEOUT_SECONDS):
+                return {
+                    "response": "I'm still thinking... please try again in a moment.",
+                    "face": _SAD_FACE,
+                    "status": "timeout",
+                    "error": True,
+                }
+            try:
+                return self._handle_chat_sync(message)
+            finally:
+                self._think_slots.release()
+        finally:
+            self._chat_pending.release()
+
     def _handle_chat_sync(self, message: str) -> Dict[str, Any]:
         """Handle chat message (sync wrapper for async brain)."""
+        personality = self.personality
+        display = self.display
+
         # Increment chat count
-        self.display.increment_chat_count()
+        display.increment_chat_count()
 
         try:
-            # Run async think in sync context
+            # Run async think in sync context. The timeout is applied on the
+            # loop so a hung provider call is cancelled, not just abandoned.
             future = asyncio.run_coroutine_threadsafe(
-                self.brain.think(
-                    user_message=message,
-                    system_prompt=self.personality.get_system_prompt(
-                        custom_prompt=self._config.get("ai", {}).get("system_prompt")
+                asyncio.wait_for(
+                    self.brain.think(
+                        user_message=message,
+                        system_prompt=personality.get_system_prompt(
+                            custom_prompt=self._config.get("ai", {}).get("system_prompt")
+                        ),
                     ),
+                    timeout=THINK_TIMEOUT_SECONDS,
                 ),
                 self._loop
             )
-            result = future.result(timeout=30)
+            try:
+                result = future.result(timeout=THINK_TIMEOUT_SECONDS + 2)
+            except TimeoutError:
+                future.cancel()
+                raise
 
-            self.personality.on_success(0.5)
-            xp_awarded = self.personality.on_interaction(
+            personality.on_success(0.5)
+            xp_awarded = personality.on_interaction(
                 positive=True,
                 chat_quality=result.chat_quality,
                 user_message=message,
             )
 
             # Update display with Pwnagotchi UI (with pagination for long messages)
-            from core.ui import word_wrap, MESSAGE_MAX_LINES
             # Use 32 chars/line to better match pixel-based rendering (250px display ~32-35 chars)
             lines = word_wrap(result.content, 32)
+            face = personality.face
             if len(lines) > MESSAGE_MAX_LINES:
                 # Use paginated display for long responses
-                asyncio.run_coroutine_threadsafe(
-                    self.display.show_message_paginated(
+                self._schedule(
+                    display.show_message_paginated(
                         text=result.content,
-                        face=self.personality.face,
-                        page_delay=self.display.pagination_loop_seconds,
+                        face=face,
+                        page_delay=display.pagination_loop_seconds,
                         loop=True,
-                    ),
-                    self._loop
+                    )
                 )
             else:
                 # Single page display
-                asyncio.run_coroutine_threadsafe(
-                    self.display.update(
-                        face=self.personality.face,
-                        text=result.content,
-                        mood_text=self.personality.mood.current.value.title(),
-                    ),
-                    self._loop
+                self._update_display(
+                    face=face,
+                    text=result.content,
+                    mood_text=personality.mood.current.value.title(),
                 )
 
             return {
@@ -1505,32 +2281,41 @@ class WebChatMode:
                     else f"{result.provider} | {result.tokens_used} tokens"
                 ),
                 "face": self._get_face_str(),
-                "status": self.personality.get_status_line(),
+                "status": personality.get_status_line(),
             }
 
         except QuotaExceededError:
-            self.personality.on_failure(0.7)
+            personality.on_failure(0.7)
             return {
                 "response": "I've used too many words today. Let's chat tomorrow!",
-                "face": self._faces["sad"],
+                "face": _SAD_FACE,
                 "status": "quota exceeded",
                 "error": True,
             }
 
         except AllProvidersExhaustedError:
-            self.personality.on_failure(0.8)
+            personality.on_failure(0.8)
             return {
                 "response": "I'm having trouble thinking right now...",
-                "face": self._faces["sad"],
+                "face": _SAD_FACE,
                 "status": "AI error",
                 "error": True,
             }
 
+        except TimeoutError:
+            personality.on_failure(0.5)
+            return {
+                "response": "That took too long to think about. Try again?",
+                "face": _SAD_FACE,
+                "status": "timeout",
+                "error": True,
+            }
+
         except Exception as e:
-            self.personality.on_failure(0.5)
+            personality.on_failure(0.5)
             return {
                 "response": f"Error: {str(e)}",
-                "face": self._faces["sad"],
+                "face": _SAD_FACE,
                 "status": "error",
                 "error": True,
             }
@@ -1573,7 +2358,10 @@ class WebChatMode:
         )
         await self.display.start_auto_refresh()
 
-        print(f"\nWeb UI available at http://{self.host}:{self.port}")
+        if self._unix_socket:
+            print(f"\nWeb UI listening on unix:{self._unix_socket} (serve via reverse proxy)")
+        else:
+            print(f"\nWeb UI available at http://{self.host}:{self.port}")
         if ngrok_url:
             print(f"Public URL: {ngrok_url}")
         if self._auth_enabled:
@@ -1583,12 +2371,17 @@ class WebChatMode:
         # Run Bottle in a thread using Waitress (multi-threaded production server)
         def run_server():
             from waitress import serve
+            if self._unix_socket:
+                # Bind to a Unix socket instead of TCP; a reverse proxy
+                # (nginx/Caddy) on the same host handles client connections
+                listen = {"unix_socket": self._unix_socket, "unix_socket_perms": "660"}
+            else:
+                listen = {"host": self.host, "port": self.port}
             serve(
-                self._app,
-                host=self.host,
-                port=self.port,
-                threads=6,  # Handle 6 concurrent requests (huge improvement over single-threaded default)
+                GzipMiddleware(self._app),
+                threads=self._server_threads,  # Concurrent requests (default 6)
                 channel_timeout=30,
+                **listen,
             )
 
         server_thread = threading.Thread(target=run_server, daemon=True)
@@ -1597,8 +2390,11 @@ class WebChatMode:
         # Keep the async loop running
         try:
             while self._running:
-                await asyncio.sleep(1)
+                await asyncio.sleep(MOOD_TICK_SECONDS)
                 self.personality.update()
+                # Wake /api/state long-polls if the mood (or anything the
+                # AI or heartbeat changed since the last tick) moved
+                await asyncio.to_thread(self._refresh_state)
         finally:
             await self.display.stop_auto_refresh()
             # Disconnect ngrok tunnel on exit
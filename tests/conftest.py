@@ -5,11 +5,22 @@ Shared pytest fixtures for the test suite.
 """
 
 import os
+import sys
 import tempfile
 import pytest
 from pathlib import Path
 
 
+@pytest.fixture(autouse=True)
+def template_cache_dir(tmp_path, monkeypatch):
+    """Keep compiled web UI templates out of the real home directory."""
+    cache_dir = tmp_path / "template_cache"
+    web_chat = sys.modules.get("modes.web_chat")
+    if web_chat is not None:
+        monkeypatch.setattr(web_chat, "TEMPLATE_CACHE_DIR", cache_dir)
+    return cache_dir
+
+
 @pytest.fixture
 def temp_data_dir():
     """Create a temporary directory for test data."""
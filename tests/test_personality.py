@@ -246,6 +246,21 @@ class TestPersonality:
         personality.mood.set_mood(Mood.SLEEPY, 0.5)
         assert personality.energy == 0.05  # 0.1 * 0.5
 
+    def test_update_decay_scales_with_elapsed_time(self, personality):
+        """Mood decay should not depend on how often update() is called."""
+        from core.personality import Mood
+
+        personality.mood.set_mood(Mood.EXCITED, 0.9)
+        for _ in range(12):
+            personality.update(elapsed=5.0)
+        once_a_minute = personality.mood.intensity
+
+        personality.mood.set_mood(Mood.EXCITED, 0.9)
+        personality.update(elapsed=60.0)
+
+        assert personality.mood.intensity == pytest.approx(once_a_minute)
+        assert personality.mood.intensity == pytest.approx(0.9 - personality.mood_decay_rate)
+
     def test_mood_change_callback(self, personality):
         """Test mood change callbacks."""
         from core.personality import Mood
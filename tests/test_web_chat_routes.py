@@ -0,0 +1,1172 @@
+"""Tests for the web chat Bottle app and its template helpers."""
+
+import io
+import json
+import threading
+import time
+from types import SimpleNamespace
+from wsgiref.util import setup_testing_defaults
+
+import pytest
+
+import modes.web_chat as web_chat
+from modes.web_chat import CachedSimpleTemplate, WebChatMode, _minify_js
+
+
+class _DisplayStub:
+    """Minimal display stub for WebChatMode route tests."""
+
+    def __init__(self):
+        self._dark_mode = False
+        self._screensaver_enabled = False
+        self._screensaver_idle_minutes = 5.0
+
+    def set_mode(self, _mode):
+        return None
+
+
+class _BrainStub:
+    """Minimal brain stub exposing the config/budget used by settings."""
+
+    def __init__(self):
+        self.config = {"primary": "anthropic", "system_prompt": "</script><b>hi</b>"}
+        self.budget = SimpleNamespace(daily_limit=10000)
+        self._messages = []
+
+    def recent_messages(self, limit=10):
+        return self._messages[-limit:]
+
+
+def _call(app, path, method="GET", headers=None, body=None, raw_body=None):
+    """Invoke a WSGI app and return (status, headers, body_bytes)."""
+    environ = {}
+    setup_testing_defaults(environ)
+    path, _, query = path.partition("?")
+    environ["PATH_INFO"] = path
+    environ["QUERY_STRING"] = query
+    environ["REQUEST_METHOD"] = method
+    if body is not None or raw_body is not None:
+        data = raw_body if raw_body is not None else json.dumps(body).encode()
+        environ["CONTENT_TYPE"] = "application/json"
+        environ["CONTENT_LENGTH"] = str(len(data))
+        environ["wsgi.input"] = io.BytesIO(data)
+    for key, value in (headers or {}).items():
+        environ["HTTP_" + key.upper().replace("-", "_")] = value
+
+    captured = {}
+
+    def start_response(status, response_headers, exc_info=None):
+        captured["status"] = status
+        captured["headers"] = dict(response_headers)
+
+    chunks = app(environ, start_response)
+    payload = b"".join(c if isinstance(c, bytes) else c.encode() for c in chunks)
+    return captured["status"], captured["headers"], payload
+
+
+@pytest.fixture
+def web_mode(personality):
+    return WebChatMode(brain=_BrainStub(), display=_DisplayStub(), personality=personality)
+
+
+def test_settings_page_embeds_settings_json(web_mode):
+    """The settings page should ship its payload inline instead of fetching it."""
+    status, _, body = _call(web_mode._app, "/settings")
+    html = body.decode()
+
+    assert status.startswith("200")
+    assert 'id="settings-data"' in html
+    assert "fetch('/api/settings')" not in html
+
+    start = html.index('type="application/json">') + len('type="application/json">')
+    end = html.index("</script>", start)
+    data = json.loads(html[start:end])
+    assert data["name"] == "TestInkling"
+    assert data["ai"]["system_prompt"] == "</script><b>hi</b>"
+
+
+def test_chat_route_answers_message(web_mode, monkeypatch):
+    """/api/chat should answer through _handle_chat_sync inside a think slot."""
+    seen = {}
+
+    def fake_handle_chat(message):
+        seen["message"] = message
+        seen["free_slots"] = web_mode._think_slots._value
+        return {"response": "hi", "face": "(^_^)", "status": "ok"}
+
+    monkeypatch.setattr(web_mode, "_handle_chat_sync", fake_handle_chat)
+
+    status, _, body = _call(web_mode._app, "/api/chat", method="POST", body={"message": "hello"})
+
+    assert status.startswith("200")
+    assert json.loads(body)["response"] == "hi"
+    assert seen["message"] == "hello"
+    assert seen["free_slots"] == web_chat.CHAT_WORKERS - 1
+
+
+def test_minify_js_strips_comments_and_indentation():
+    source = """
+        // Apply theme
+        const url = 'http://example.com'; // keep trailing comments
+
+        function f() {
+            return 1;
+        }
+    """
+    assert _minify_js(source) == (
+        "const url = 'http://example.com'; // keep trailing comments\n"
+        "function f() {\n"
+        "return 1;\n"
+        "}"
+    )
+
+
+def test_index_renders_command_palette(web_mode):
+    status, _, body = _call(web_mode._app, "/")
+    html = body.decode()
+
+    assert status.startswith("200")
+    assert "runCommand('/help')" in html
+    assert "runCommand('/focus start')" in html
+    assert "{{!palette_html}}" not in html
+
+
+def test_cached_template_reuses_compiled_code(template_cache_dir, monkeypatch):
+    source = "Hello {{name}}!\n"
+    first = CachedSimpleTemplate(source=source)
+    assert first.render(name="Inkling") == "Hello Inkling!\n"
+
+    cache_files = list(template_cache_dir.glob("*.marshal"))
+    assert len(cache_files) == 1
+
+    def no_compile(*args, **kwargs):
+        raise AssertionError("cached template was recompiled")
+
+    monkeypatch.setattr(web_chat, "compile", no_compile, raising=False)
+    second = CachedSimpleTemplate(source=source)
+    assert second.render(name="Bot") == "Hello Bot!\n"
+    assert second.source is None
+
+
+def test_cached_template_compiles_lazily_and_prunes_stale_entries(template_cache_dir):
+    old = CachedSimpleTemplate(source="Old {{name}}\n", name="page")
+    assert not template_cache_dir.exists()  # Nothing compiled before first render
+    old.render(name="x")
+    assert len(list(template_cache_dir.glob("page-*.marshal"))) == 1
+
+    other = CachedSimpleTemplate(source="Other\n", name="other")
+    other.render()
+    new = CachedSimpleTemplate(source="New {{name}}\n", name="page")
+    assert new.render(name="x") == "New x\n"
+
+    page_files = list(template_cache_dir.glob("page-*.marshal"))
+    assert len(page_files) == 1
+    assert len(list(template_cache_dir.glob("other-*.marshal"))) == 1
+
+
+def test_state_supports_if_modified_since(web_mode):
+    status, headers, body = _call(web_mode._app, "/api/state")
+    assert status.startswith("200")
+    assert headers["Cache-Control"] == "no-cache, no-transform"
+    assert headers["X-Accel-Buffering"] == "no"
+    assert json.loads(body)["mood"] == web_mode.personality.mood.current.value
+
+    last_modified = headers["Last-Modified"]
+    status, _, body = _call(web_mode._app, "/api/state", headers={"If-Modified-Since": last_modified})
+    assert status.startswith("304")
+    assert body == b""
+
+
+def test_state_last_modified_advances_on_change(web_mode):
+    _, headers, _ = _call(web_mode._app, "/api/state")
+    first = headers["Last-Modified"]
+
+    web_mode.personality.last_thought = "something new"
+    status, headers, _ = _call(web_mode._app, "/api/state", headers={"If-Modified-Since": first})
+    assert status.startswith("200")
+    assert headers["Last-Modified"] != first
+
+
+def test_pages_revalidate_instead_of_public_caching(web_mode):
+    _, headers, _ = _call(web_mode._app, "/")
+    assert headers["Cache-Control"] == "private, no-cache"
+
+
+@pytest.mark.parametrize("path", ["/", "/settings", "/tasks", "/files", "/login"])
+def test_pages_render(web_mode, path):
+    status, _, body = _call(web_mode._app, path)
+    if path == "/login":
+        # Auth is disabled, so the login page bounces to the chat page
+        assert status.startswith("303") or status.startswith("302")
+    else:
+        assert status.startswith("200")
+        assert "TestInkling" in body.decode()
+
+
+def test_template_sources_remain_readable():
+    assert web_chat._load_template("main.html").startswith("<!DOCTYPE html>")
+    assert "{{name}}" in web_chat._load_template("tasks.html")
+
+
+def test_index_shell_is_gzipped_with_etag(web_mode):
+    import gzip
+
+    status, headers, body = _call(web_mode._app, "/", headers={"Accept-Encoding": "gzip, br"})
+    assert status.startswith("200")
+    assert headers["Content-Encoding"] == "gzip"
+    assert "TestInkling" in gzip.decompress(body).decode()
+
+    etag = headers["Etag"]
+    status, _, body = _call(web_mode._app, "/", headers={"If-None-Match": etag})
+    assert status.startswith("304")
+    assert body == b""
+
+
+def test_refused_encodings_are_not_served(web_mode):
+    status, headers, body = _call(web_mode._app, "/", headers={"Accept-Encoding": "gzip;q=0, br;q=0"})
+    assert status.startswith("200")
+    assert "Content-Encoding" not in headers
+    assert b"TestInkling" in body
+
+    _, headers, _ = _call(web_mode._app, "/", headers={"Accept-Encoding": "br;q=0, *"})
+    assert headers["Content-Encoding"] == "gzip"
+
+    _, headers, _ = _call(web_mode._app, "/", headers={"Accept-Encoding": "*;q=0"})
+    assert "Content-Encoding" not in headers
+
+    app = web_chat.GzipMiddleware(web_mode._app)
+    _, headers, _ = _call(
+        app, "/api/command", method="POST", body={"command": "/help"}, headers={"Accept-Encoding": "gzip; q=0"}
+    )
+    assert "Content-Encoding" not in headers
+
+
+def test_index_shell_rebuilds_when_name_changes(web_mode):
+    _, headers, _ = _call(web_mode._app, "/")
+    old_etag = headers["Etag"]
+
+    web_mode.personality.name = "Renamed"
+    status, headers, body = _call(web_mode._app, "/", headers={"If-None-Match": old_etag})
+    assert status.startswith("200")
+    assert headers["Etag"] != old_etag
+    assert "Renamed" in body.decode()
+
+
+def test_settings_shell_rebuilds_only_when_settings_change(web_mode):
+    _, headers, _ = _call(web_mode._app, "/settings")
+    etag = headers["Etag"]
+    status, _, _ = _call(web_mode._app, "/settings", headers={"If-None-Match": etag})
+    assert status.startswith("304")
+
+    web_mode.personality.traits.curiosity = 0.12
+    status, headers, body = _call(web_mode._app, "/settings", headers={"If-None-Match": etag})
+    assert status.startswith("200")
+    assert headers["Etag"] != etag
+    assert 'id="curiosity-val">12%' in body.decode()
+
+
+def test_login_page_is_prerendered(web_mode):
+    web_mode._auth_enabled = True
+    status, headers, body = _call(web_mode._app, "/login")
+    assert status.startswith("200")
+    assert body == web_chat._login_page().body
+    assert 'class="error"' not in body.decode()
+
+    status, _, _ = _call(web_mode._app, "/login", headers={"If-None-Match": headers["Etag"]})
+    assert status.startswith("304")
+
+
+def test_auth_token_verification_is_cached(web_mode, monkeypatch):
+    token = web_mode._create_auth_token()
+    assert web_mode._verify_auth_token(token)
+    assert not web_mode._verify_auth_token(token[:-1] + "x")
+    assert not web_mode._verify_auth_token("garbage")
+    assert web_mode._verified_tokens == {token}
+
+    # A remembered token no longer needs the HMAC
+    monkeypatch.setattr(web_chat.hmac, "new", None)
+    assert web_mode._verify_auth_token(token)
+
+
+@pytest.mark.parametrize("use_orjson", [True, False])
+def test_api_responses_are_json_bytes(web_mode, monkeypatch, use_orjson):
+    if not use_orjson:
+        monkeypatch.setattr(web_chat, "orjson", None)
+    elif web_chat.orjson is None:
+        pytest.skip("orjson not installed")
+
+    status, headers, body = _call(web_mode._app, "/api/settings")
+    assert status.startswith("200")
+    assert headers["Content-Type"] == "application/json"
+    assert json.loads(body)["name"] == "TestInkling"
+
+    status, headers, body = _call(web_mode._app, "/api/chat", method="POST", body={"message": ""})
+    assert headers["Content-Type"] == "application/json"
+    assert json.loads(body) == {"error": "Empty message"}
+
+    status, _, _ = _call(web_mode._app, "/api/chat", method="POST", raw_body=b'{"message": ')
+    assert status.startswith("400")
+
+
+def test_face_str_follows_mood_changes(web_mode):
+    from core.personality import Mood
+
+    web_mode.personality.mood.set_mood(Mood.HAPPY, 0.8)
+    happy = web_mode._get_face_str()
+    assert web_mode._get_face_str() is happy
+
+    web_mode.personality.mood.set_mood(Mood.SAD, 0.8)
+    assert web_mode._get_face_str() == web_mode._faces[Mood.SAD.face]
+
+
+def test_state_etag_revalidation(web_mode):
+    _, headers, _ = _call(web_mode._app, "/api/state")
+    etag = headers["Etag"]
+
+    status, _, body = _call(web_mode._app, "/api/state", headers={"If-None-Match": etag})
+    assert status.startswith("304")
+    assert body == b""
+
+    web_mode.personality.last_thought = "changed"
+    status, headers, body = _call(web_mode._app, "/api/state", headers={"If-None-Match": etag})
+    assert status.startswith("200")
+    assert headers["Etag"] != etag
+    assert json.loads(body)["thought"] == "changed"
+
+
+def test_state_long_poll_returns_on_change(web_mode):
+    _, headers, _ = _call(web_mode._app, "/api/state")
+    etag = headers["Etag"]
+
+    def change():
+        web_mode.personality.last_thought = "woke up"
+        web_mode._refresh_state()
+
+    timer = threading.Timer(0.1, change)
+    timer.start()
+    started = time.monotonic()
+    try:
+        status, _, body = _call(web_mode._app, "/api/state?wait=5", headers={"If-None-Match": etag})
+    finally:
+        timer.cancel()
+
+    assert status.startswith("200")
+    assert json.loads(body)["thought"] == "woke up"
+    assert time.monotonic() - started < 2
+
+
+def test_state_long_poll_answers_at_once_when_waiters_are_full(web_mode):
+    _, headers, _ = _call(web_mode._app, "/api/state")
+    # Default 6 threads leave room for 3 parked long-polls
+    for _ in range(3):
+        assert web_mode._state_waiters.acquire(blocking=False)
+    assert not web_mode._state_waiters.acquire(blocking=False)
+
+    started = time.monotonic()
+    status, headers, _ = _call(web_mode._app, "/api/state?wait=5", headers={"If-None-Match": headers["Etag"]})
+    assert status.startswith("304")
+    assert headers["Retry-After"] == str(web_chat.STATE_BUSY_RETRY_SECONDS)
+    assert time.monotonic() - started < 1
+
+
+@pytest.mark.parametrize("wait", ["nan", "inf", "-inf"])
+def test_state_long_poll_ignores_non_finite_wait(web_mode, wait):
+    _, headers, _ = _call(web_mode._app, "/api/state")
+    status, _, _ = _call(web_mode._app, f"/api/state?wait={wait}", headers={"If-None-Match": headers["Etag"]})
+    assert status.startswith("304")
+
+
+def test_state_long_poll_does_not_recompute_while_idle(web_mode, monkeypatch):
+    _, headers, _ = _call(web_mode._app, "/api/state")
+    calls = []
+    original = web_mode._get_state_json
+    monkeypatch.setattr(web_mode, "_get_state_json", lambda: calls.append(1) or original())
+
+    status, _, _ = _call(web_mode._app, "/api/state?wait=1", headers={"If-None-Match": headers["Etag"]})
+    assert status.startswith("304")
+    # The route's read, one before waiting and one after the timeout
+    assert len(calls) == 3
+
+
+def test_save_config_file_merges_into_local_config(web_mode, tmp_path, monkeypatch):
+    import yaml
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.local.yml").write_text("device:\n  name: Old\nweb:\n  port: 9000\n")
+
+    web_mode._save_config_file({"name": "New", "traits": {"curiosity": 0.9}})
+
+    config = yaml.safe_load((tmp_path / "config.local.yml").read_text())
+    assert config == {"device": {"name": "New"}, "web": {"port": 9000}, "personality": {"curiosity": 0.9}}
+    assert not (tmp_path / "config.local.yml.tmp").exists()
+
+
+def test_save_config_file_skips_noop_writes(web_mode, tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    config_file = tmp_path / "config.local.yml"
+
+    written = []
+    real_replace = web_chat.os.replace
+    monkeypatch.setattr(web_chat.os, "replace", lambda *args: (written.append(args), real_replace(*args)))
+
+    web_mode._save_config_file({"name": "Same"})
+    web_mode._save_config_file({"name": "Same"})
+    assert len(written) == 1
+
+    # Edits made by other writers are picked up rather than overwritten
+    config_file.write_text("device:\n  name: Same\nscheduler:\n  enabled: true\n")
+    web_mode._save_config_file({"name": "Other"})
+    assert "scheduler" in config_file.read_text()
+
+
+def test_chat_queue_rejects_when_full(web_mode, monkeypatch):
+    monkeypatch.setattr(web_mode, "_handle_chat_sync", lambda message: {"response": "ok"})
+    for _ in range(web_chat.CHAT_WORKERS + web_chat.CHAT_QUEUE_SIZE):
+        web_mode._chat_pending.acquire()
+
+    result = web_mode._submit_chat("one too many")
+
+    assert result["status"] == "busy"
+    assert result["error"] is True
+
+
+def test_chat_bounds_concurrent_think_calls(web_mode, monkeypatch):
+    release = threading.Event()
+    lock = threading.Lock()
+    running = []
+    peak = []
+
+    def slow_chat(message):
+        with lock:
+            running.append(message)
+            peak.append(len(running))
+        release.wait(5)
+        with lock:
+            running.remove(message)
+        return {"response": f"re: {message}"}
+
+    monkeypatch.setattr(web_mode, "_handle_chat_sync", slow_chat)
+    threads = [
+        threading.Thread(target=web_mode._submit_chat, args=(f"msg {i}",))
+        for i in range(web_chat.CHAT_WORKERS + 2)
+    ]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.1)
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(peak) == len(threads)
+    assert max(peak) == web_chat.CHAT_WORKERS
+
+
+def test_resent_chat_shares_one_reply(web_mode, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_chat(message):
+        calls.append(message)
+        started.set()
+        release.wait(5)
+        return {"response": f"re: {message}"}
+
+    monkeypatch.setattr(web_mode, "_handle_chat_sync", slow_chat)
+    results = []
+    first = threading.Thread(target=lambda: results.append(web_mode._submit_chat("hi", "req-1")))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=lambda: results.append(web_mode._submit_chat("hi", "req-1")))
+    second.start()
+    threading.Event().wait(0.05)  # Let the second request join the first
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == ["hi"]
+    assert results == [{"response": "re: hi"}] * 2
+
+
+def test_same_text_with_new_request_id_is_answered_again(web_mode, monkeypatch):
+    started = threading.Event()
+    release = threading.Event()
+    calls = []
+
+    def slow_chat(message):
+        calls.append(message)
+        started.set()
+        release.wait(5)
+        return {"response": f"re: {message}"}
+
+    monkeypatch.setattr(web_mode, "_handle_chat_sync", slow_chat)
+    first = threading.Thread(target=web_mode._submit_chat, args=("yes", "req-1"))
+    first.start()
+    assert started.wait(5)
+    second = threading.Thread(target=web_mode._submit_chat, args=("yes", "req-2"))
+    second.start()
+    time.sleep(0.05)
+    release.set()
+    first.join(5)
+    second.join(5)
+
+    assert calls == ["yes", "yes"]
+
+
+def test_play_command_does_not_wait_for_display_animation(web_mode):
+    import asyncio
+
+    gate = threading.Event()
+    first_frame = threading.Event()
+
+    async def slow_update(**kwargs):
+        gate.wait(5)  # Stand-in for a rate-limited e-ink refresh
+        first_frame.set()
+
+    web_mode.display.update = slow_update
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    web_mode._loop = loop
+    try:
+        status, _, body = _call(web_mode._app, "/api/command", method="POST", body={"command": "/walk"})
+        assert not gate.is_set()
+        gate.set()
+        assert first_frame.wait(5)  # The animation still runs on the event loop
+    finally:
+        gate.set()
+
+        async def cancel_animation():
+            for task in asyncio.all_tasks():
+                if task is not asyncio.current_task():
+                    task.cancel()
+
+        asyncio.run_coroutine_threadsafe(cancel_animation(), loop).result(5)
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+    assert status.startswith("200")
+    assert "goes for a walk" in json.loads(body)["response"]
+    assert web_mode.personality.mood.current.value == "curious"
+
+
+def test_concurrent_slow_commands_share_one_run(web_mode, monkeypatch):
+    release = threading.Event()
+    calls = []
+
+    def slow_scan():
+        calls.append(threading.current_thread().name)
+        release.wait(5)
+        return {"response": "2 networks"}
+
+    monkeypatch.setattr(web_mode._system_cmds, "wifiscan", slow_scan)
+
+    results = []
+    threads = [
+        threading.Thread(target=lambda: results.append(web_mode._handle_command_sync("/wifiscan")))
+        for _ in range(3)
+    ]
+    for thread in threads:
+        thread.start()
+    while not web_mode._inflight:
+        threading.Event().wait(0.01)
+    threading.Event().wait(0.2)  # Let the followers attach to the in-flight call
+    release.set()
+    for thread in threads:
+        thread.join(5)
+
+    assert len(calls) == 1
+    assert results == [{"response": "2 networks"}] * 3
+    assert web_mode._inflight == {}
+
+
+def test_state_body_is_valid_json_with_escaping(web_mode):
+    web_mode.personality.last_thought = 'quote " backslash \\ newline \n'
+
+    _, _, body = _call(web_mode._app, "/api/state")
+    data = json.loads(body)
+
+    assert data["thought"] == 'quote " backslash \\ newline \n'
+    assert data["focus"] == {"focus_active": False} or "focus_active" in data["focus"]
+    assert set(data) == {"face", "status", "mood", "thought", "focus"}
+
+
+def test_save_config_file_maps_all_settings_fields(web_mode, tmp_path, monkeypatch):
+    import yaml
+
+    monkeypatch.chdir(tmp_path)
+    (tmp_path / "config.local.yml").write_text(
+        "ai:\n  anthropic:\n    api_key: keep-me\n  system_prompt: old\n"
+    )
+
+    web_mode._save_config_file({
+        "name": "Inky",
+        "display": {"dark_mode": True, "screensaver": {"enabled": True}},
+        "ai": {
+            "primary": "openai",
+            "anthropic": {"model": "claude-3-haiku-20240307"},
+            "budget": {"daily_tokens": 5000},
+            "system_prompt": "",
+        },
+    })
+
+    config = yaml.safe_load((tmp_path / "config.local.yml").read_text())
+    assert config == {
+        "device": {"name": "Inky"},
+        "display": {"dark_mode": True, "screensaver": {"enabled": True}},
+        "ai": {
+            "primary": "openai",
+            "anthropic": {"api_key": "keep-me", "model": "claude-3-haiku-20240307"},
+            "budget": {"daily_tokens": 5000},
+            "system_prompt": None,
+        },
+    }
+
+
+def test_shared_stylesheet_is_cacheable(web_mode):
+    status, headers, body = _call(web_mode._app, "/static/inkling.css")
+    assert status.startswith("200")
+    assert headers["Content-Type"].startswith("text/css")
+    assert headers["Cache-Control"] == "public, max-age=86400"
+    assert b'[data-theme="midnight"]' in body
+
+    status, _, _ = _call(web_mode._app, "/static/inkling.css", headers={"If-None-Match": headers["Etag"]})
+    assert status.startswith("304")
+
+
+@pytest.mark.parametrize("name", ["main.html", "settings.html", "tasks.html", "files.html", "login.html"])
+def test_templates_link_shared_stylesheet(name):
+    source = web_chat._load_template(name)
+    assert '<link rel="stylesheet" href="{{theme_url}}">' in source
+    assert "[data-theme=" not in source
+
+
+@pytest.mark.parametrize("path", ["/", "/settings", "/tasks", "/files", "/login"])
+def test_pages_link_versioned_shared_stylesheet(web_mode, path):
+    web_mode._auth_enabled = True
+    web_mode._check_auth = lambda: path != "/login"
+    _, _, body = _call(web_mode._app, path)
+    theme_url = web_chat._static_url("inkling.css")
+    assert f'<link rel="stylesheet" href="{theme_url}">' in body.decode()
+
+    status, headers, _ = _call(web_mode._app, theme_url)
+    assert status.startswith("200")
+    assert headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+
+def test_chat_timeout_cancels_think_on_the_loop(web_mode, monkeypatch):
+    import asyncio
+
+    cancelled = threading.Event()
+
+    async def hung_think(**kwargs):
+        try:
+            await asyncio.sleep(60)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    web_mode.brain.think = hung_think
+    monkeypatch.setattr(web_chat, "THINK_TIMEOUT_SECONDS", 0.05)
+    web_mode.display.increment_chat_count = lambda: None
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    web_mode._loop = loop
+    try:
+        result = web_mode._handle_chat_sync("hello?")
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+    assert result["status"] == "timeout"
+    assert cancelled.is_set()
+
+
+def test_minify_markup_keeps_scripts_and_preformatted_text():
+    from modes.web_chat import _minify_markup
+
+    html = """<html>
+        <!-- layout -->
+        <style>
+            /* theme */
+            body {
+                color: red;
+            }
+        </style>
+        <p>
+            Hello <b>there</b>
+        </p>
+        <textarea>
+  keep   this
+        </textarea>
+        <script>
+            const s = `
+                line`;
+        </script>
+    </html>"""
+    assert _minify_markup(html) == (
+        "<html>\n"
+        "<style>\nbody {\ncolor: red;\n}\n</style>\n"
+        "<p>\nHello <b>there</b>\n</p>\n"
+        "<textarea>\n  keep   this\n        </textarea>\n"
+        "<script>\n            const s = `\n                line`;\n        </script>\n"
+        "</html>"
+    )
+
+
+def test_traits_and_level_reflect_changes(web_mode):
+    first = web_mode._handle_command_sync("/traits")["response"]
+    assert web_mode._handle_command_sync("/traits")["response"] is first  # Served from cache
+
+    web_mode.personality.traits.curiosity = 0.1
+    changed = web_mode._handle_command_sync("/traits")["response"]
+    assert "Curiosity:    [█░░░░░░░░░] 10%" in changed
+
+    before = web_mode._handle_command_sync("/level")["response"]
+    web_mode.personality.progression.xp += 50
+    assert web_mode._handle_command_sync("/level")["response"] != before
+
+
+def test_chat_page_assets_use_versioned_urls(web_mode):
+    _, _, body = _call(web_mode._app, "/")
+    html = body.decode()
+    css_url, js_url = web_chat._static_url("main.css"), web_chat._static_url("main.js")
+    assert f'href="{css_url}"' in html
+    assert f'<script src="{js_url}"></script>' in html
+    assert "<style>" not in html
+
+    status, headers, body = _call(web_mode._app, js_url)
+    assert status.startswith("200")
+    assert headers["Content-Type"].startswith("text/javascript")
+    assert headers["Cache-Control"] == "public, max-age=31536000, immutable"
+    assert b"function pollState()" in body
+
+    status, _, _ = _call(web_mode._app, "/static/missing.js")
+    assert status.startswith("404")
+
+
+def test_settings_page_assets_use_versioned_urls(web_mode):
+    _, _, body = _call(web_mode._app, "/settings")
+    html = body.decode()
+    assert f'href="{web_chat._static_url("settings.css")}"' in html
+    assert f'<script src="{web_chat._static_url("settings.js")}"></script>' in html
+    assert "<style>" not in html
+
+    status, _, body = _call(web_mode._app, web_chat._static_url("settings.js"))
+    assert status.startswith("200")
+    assert b"settings-data" in body
+
+
+@pytest.mark.parametrize("page", ["tasks", "files"])
+def test_tasks_and_files_assets_use_versioned_urls(web_mode, page):
+    _, _, body = _call(web_mode._app, "/" + page)
+    html = body.decode()
+    assert f'href="{web_chat._static_url(page + ".css")}"' in html
+    assert f'<script src="{web_chat._static_url(page + ".js")}"></script>' in html
+    assert "<style>" not in html
+    assert "<script>" not in html
+
+    status, headers, _ = _call(web_mode._app, web_chat._static_url(page + ".js"))
+    assert status.startswith("200")
+    assert headers["Cache-Control"] == "public, max-age=31536000, immutable"
+
+
+def test_static_assets_prefer_brotli_when_available(web_mode, monkeypatch):
+    from types import SimpleNamespace
+
+    fake_brotli = SimpleNamespace(compress=lambda data, quality: b"br:" + data)
+    monkeypatch.setattr(web_chat, "brotli", fake_brotli)
+    page = web_chat.StaticPage("body { color: red; }")
+    monkeypatch.setitem(web_chat.STATIC_ASSETS, "test.css", (page, "text/css; charset=UTF-8"))
+
+    _, headers, body = _call(web_mode._app, "/static/test.css", headers={"Accept-Encoding": "gzip, br"})
+    assert headers["Content-Encoding"] == "br"
+    assert body == b"br:body { color: red; }"
+
+    _, headers, body = _call(web_mode._app, "/static/test.css", headers={"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    assert body == page.gz
+
+
+def test_gzip_middleware_compresses_large_json_only(web_mode):
+    import gzip
+
+    app = web_chat.GzipMiddleware(web_mode._app)
+    status, headers, body = _call(
+        app, "/api/command", method="POST", body={"command": "/help"}, headers={"Accept-Encoding": "gzip"}
+    )
+    assert status.startswith("200")
+    assert headers["Content-Encoding"] == "gzip"
+    assert int(headers["Content-Length"]) == len(body)
+    assert "INKLING COMMANDS" in json.loads(gzip.decompress(body))["response"]
+
+    # Small bodies and already-compressed pages pass through unchanged
+    _, headers, _ = _call(app, "/api/state", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in headers
+    _, headers, body = _call(app, "/", headers={"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    assert "TestInkling" in gzip.decompress(body).decode()
+
+
+def _text_app(status, extra_headers):
+    """A WSGI app returning a 2 KB text/plain body with the given status and headers."""
+    body = b"x" * 2048
+
+    def app(environ, start_response):
+        start_response(status, [
+            ("Content-Type", "text/plain; charset=UTF-8"),
+            ("Content-Length", str(len(body))),
+            *extra_headers,
+        ])
+        return [body]
+
+    return app
+
+
+@pytest.mark.parametrize("status, extra_headers", [
+    ("206 Partial Content", [("Content-Range", "bytes 0-2047/4096")]),
+    ("200 OK", [("Content-Disposition", 'attachment; filename="notes.txt"')]),
+    ("404 Not Found", []),
+])
+def test_gzip_middleware_leaves_ranges_and_downloads_alone(status, extra_headers):
+    app = web_chat.GzipMiddleware(_text_app(status, extra_headers))
+    _, headers, body = _call(app, "/", headers={"Accept-Encoding": "gzip"})
+    assert "Content-Encoding" not in headers
+    assert body == b"x" * 2048
+
+
+def test_gzip_middleware_weakens_etag_and_extends_vary():
+    app = web_chat.GzipMiddleware(_text_app("200 OK", [("ETag", '"abc"'), ("Vary", "Cookie")]))
+    _, headers, _ = _call(app, "/", headers={"Accept-Encoding": "gzip"})
+    assert headers["Content-Encoding"] == "gzip"
+    assert headers["ETag"] == 'W/"abc"'
+    assert headers["Vary"] == "Cookie, Accept-Encoding"
+
+
+@pytest.mark.parametrize("path", ["/api/state", "/api/settings", "/", "/static/inkling.css"])
+def test_responses_carry_content_length(web_mode, path):
+    _, headers, body = _call(web_mode._app, path, headers={"Accept-Encoding": "gzip"})
+    assert int(headers["Content-Length"]) == len(body)
+
+
+def test_file_list_rows_are_cloned_from_templates():
+    import re
+
+    source = web_chat._load_template("files.html")
+    script = (web_chat.STATIC_DIR / "files.js").read_text()
+    for tpl in ("file-item-tpl", "file-actions-tpl", "delete-dialog-tpl"):
+        assert f'<template id="{tpl}">' in source
+        assert f"getElementById('{tpl}')" in script
+    # File names and paths must never be interpolated into markup or inline
+    # handlers: innerHTML only takes literals without ${...} substitutions,
+    # never a variable, and no on*="..." attribute may contain one either
+    assert not re.search(r"innerHTML\s*[+]?=\s*`[^`]*\$\{", script)
+    assert not re.search(r"innerHTML\s*[+]?=\s*[\w(]", script)
+    assert not re.search(r"\bon\w+=\"[^\"]*\$\{", source + script)
+
+
+def test_task_cards_are_cloned_from_a_template():
+    script = (web_chat.STATIC_DIR / "tasks.js").read_text()
+    assert '<template id="task-card-tpl">' in web_chat._load_template("tasks.html")
+    assert "getElementById('task-card-tpl')" in script
+    # Task titles, descriptions and tags must never be parsed as markup
+    assert "taskList.map(task => `" not in script
+    assert "#${tag}" not in script
+
+
+def test_tasks_bundle_matches_individual_endpoints(personality, tmp_path):
+    from core.tasks import TaskManager
+
+    task_manager = TaskManager(db_path=str(tmp_path / "tasks.db"))
+    task_manager.create_task(title="Water the plants")
+    web_mode = WebChatMode(
+        brain=_BrainStub(), display=_DisplayStub(), personality=personality, task_manager=task_manager,
+    )
+
+    status, headers, body = _call(web_mode._app, "/api/tasks/bundle")
+    bundle = json.loads(body)
+    assert status.startswith("200")
+    assert headers["Content-Type"].startswith("application/json")
+    assert bundle["tasks"] == json.loads(_call(web_mode._app, "/api/tasks")[2])["tasks"]
+    assert bundle["stats"] == json.loads(_call(web_mode._app, "/api/tasks/stats")[2])["stats"]
+    assert bundle["state"] == json.loads(_call(web_mode._app, "/api/state")[2])
+
+
+def test_tasks_bundle_revalidates_until_a_task_changes(personality, tmp_path):
+    from core.tasks import TaskManager
+
+    task_manager = TaskManager(db_path=str(tmp_path / "tasks.db"))
+    web_mode = WebChatMode(
+        brain=_BrainStub(), display=_DisplayStub(), personality=personality, task_manager=task_manager,
+    )
+
+    _, headers, _ = _call(web_mode._app, "/api/tasks/bundle")
+    etag = headers["Etag"]
+    # State changes alone don't invalidate the task list
+    web_mode.personality.last_thought = "something new"
+    status, _, body = _call(web_mode._app, "/api/tasks/bundle", headers={"If-None-Match": etag})
+    assert status.startswith("304")
+    assert body == b""
+
+    task_manager.create_task(title="Water the plants")
+    status, headers, body = _call(web_mode._app, "/api/tasks/bundle", headers={"If-None-Match": etag})
+    assert status.startswith("200")
+    assert headers["Etag"] != etag
+    assert json.loads(body)["tasks"][0]["title"] == "Water the plants"
+
+
+def test_faces_lists_one_face_per_line(web_mode):
+    from core.ui import FACES
+
+    lines = web_mode._handle_command_sync("/faces")["response"].split("\n")
+    assert lines[:2] == ["AVAILABLE FACES", ""]
+    assert lines[2:] == [f"{name:12} {face}" for name, face in sorted(FACES.items())]
+
+
+def test_faces_listing_is_rendered_once(web_mode):
+    from modes.web.commands.display import FACES_TEXT
+
+    assert web_mode._handle_command_sync("/faces")["response"] is FACES_TEXT
+    assert web_mode._handle_command_sync("/faces")["response"] is FACES_TEXT
+
+
+def test_command_envelope_carries_face_status_and_extras(web_mode):
+    handler = web_mode._info_cmds
+    envelope = handler._envelope("hi", error=True)
+    assert envelope == {
+        "response": "hi",
+        "face": web_mode._get_face_str(),
+        "status": web_mode.personality.get_status_line(),
+        "error": True,
+    }
+
+
+def test_command_args_follow_handler_signature(web_mode):
+    assert web_mode._commands["faces"][1] is False
+    assert web_mode._commands["darkmode"][1] is True
+
+    # Handlers with an args parameter always get it, even when empty
+    assert web_mode._handle_command_sync("/face")["response"].startswith("Usage: /face")
+    web_mode._handle_command_sync("/darkmode on")
+    assert web_mode.display._dark_mode is True
+    web_mode._handle_command_sync("/darkmode on")
+    assert web_mode.display._dark_mode is True
+
+
+def test_schedule_runs_coroutine_on_loop_without_a_future(web_mode):
+    import asyncio
+
+    ran = threading.Event()
+
+    async def work():
+        ran.set()
+
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    web_mode._loop = loop
+    try:
+        assert web_mode._schedule(work()) is None
+        assert ran.wait(2)
+        loop.call_soon_threadsafe(lambda: None)  # Let the done callback run
+        threading.Event().wait(0.05)
+        assert web_mode._background_tasks == set()
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+
+def test_schedule_after_loop_closed_drops_work(web_mode):
+    import asyncio
+
+    started = []
+
+    async def work():
+        started.append(True)
+
+    loop = asyncio.new_event_loop()
+    loop.close()
+    web_mode._loop = loop
+
+    coro = work()
+    web_mode._schedule(coro)  # Must not raise from a late HTTP request
+
+    assert coro.cr_frame is None  # Closed, so no "never awaited" warning
+    assert started == []
+
+
+def test_display_helpers_tolerate_missing_loop(web_mode):
+    web_mode._loop = None
+
+    async def work():
+        pass
+
+    coro = work()
+    web_mode._schedule(coro)
+    assert coro.cr_frame is None
+
+    web_mode._update_display(force=True)
+    assert web_mode._display_draining is False
+    assert web_mode._handle_command_sync("/refresh")["response"] == "Display refreshed."
+
+
+def test_unavailable_commands_reply_with_fresh_errors(personality):
+    mode = WebChatMode(brain=None, display=_DisplayStub(), personality=personality)
+
+    first = mode._handle_command_sync("/history")
+    assert first == {"response": "This command requires AI features.", "error": True}
+    first["response"] = "changed"
+    assert mode._handle_command_sync("/history")["response"] == "This command requires AI features."
+
+
+def test_config_listing_tracks_token_usage(web_mode):
+    used = {"n": 10}
+    web_mode.brain.providers = [SimpleNamespace(name="anthropic", model="haiku", max_tokens=150)]
+    web_mode.brain.get_stats = lambda: {
+        "providers": ["anthropic"], "tokens_used_today": used["n"], "daily_limit": 10000,
+    }
+
+    first = web_mode._handle_command_sync("/config")["response"]
+    assert "Model:     haiku" in first
+    assert "Budget: 10/10000 tokens today" in first
+
+    used["n"] = 42
+    assert "Budget: 42/10000 tokens today" in web_mode._handle_command_sync("/config")["response"]
+
+
+def test_history_prefixes_and_truncates_messages(web_mode):
+    web_mode.brain._messages = [
+        SimpleNamespace(role="user", content="hi"),
+        SimpleNamespace(role="assistant", content="x" * 61),
+    ]
+    name = web_mode.personality.name
+    assert web_mode._handle_command_sync("/history")["response"] == (
+        f"RECENT MESSAGES\n\nYou: hi\n{name}: {'x' * 60}..."
+    )
+
+
+def test_command_errors_share_one_shape(web_mode):
+    assert web_mode._handle_command_sync("/bash ls") == {
+        "response": "The /bash command is disabled in the web UI.",
+        "error": True,
+    }
+    assert web_mode._info_cmds._error("nope", face="sad") == {"response": "nope", "error": True, "face": "sad"}
+
+
+def test_history_when_empty(web_mode):
+    from modes.web.commands.session import EMPTY_HISTORY_TEXT
+
+    result = web_mode._handle_command_sync("/history")
+    assert result["response"] is EMPTY_HISTORY_TEXT
+    assert result["face"] == web_mode._get_face_str()
+
+
+def test_tasks_command_lists_every_task(personality, tmp_path):
+    from core.tasks import TaskManager
+
+    task_manager = TaskManager(db_path=str(tmp_path / "tasks.db"))
+    for i in range(3):
+        task_manager.create_task(title=f"Task {i}", description="d" * 61 if i == 0 else None)
+    web_mode = WebChatMode(
+        brain=_BrainStub(), display=_DisplayStub(), personality=personality, task_manager=task_manager,
+    )
+
+    response = web_mode._handle_command_sync("/tasks")["response"]
+    assert response.startswith("TASKS\n\n")
+    assert response.endswith("\nTotal: 3 tasks")
+    assert all(f"Task {i}" in response for i in range(3))
+    assert f"   {'d' * 60}...\n" in response
+
+
+@pytest.mark.parametrize("command", ["/face happy", "/FACE   happy", "face happy"])
+def test_command_parsing(web_mode, command):
+    assert web_mode._handle_command_sync(command)["response"] == "Showing face: happy"
+
+
+def test_wifiscan_rows(web_mode, monkeypatch):
+    import core.wifi_utils as wifi_utils
+
+    networks = [
+        SimpleNamespace(ssid="home", signal_strength=85, security="WPA2"),
+        SimpleNamespace(ssid="cafe", signal_strength=45, security="Open"),
+        SimpleNamespace(ssid="far", signal_strength=5, security="WEP"),
+    ]
+    monkeypatch.setattr(wifi_utils, "scan_networks", lambda: networks)
+    monkeypatch.setattr(wifi_utils, "get_current_wifi", lambda: SimpleNamespace(connected=True, ssid="home"))
+
+    assert web_mode._handle_command_sync("/wifiscan")["response"] == (
+        "**Nearby Networks (3)**\n\n"
+        "● ▂▄▆█  85% [WPA2] home\n"
+        "  ▂▄  45% [OPEN] cafe\n"
+        "  ○   5% [WEP] far\n\n"
+        "*Use /btcfg to start BLE configuration service*"
+    )
+
+
+def test_display_updates_collapse_while_rendering(web_mode):
+    import asyncio
+
+    rendering = threading.Event()
+    release = threading.Event()
+    renders = []
+
+    async def slow_update(**kwargs):
+        renders.append(kwargs)
+        rendering.set()
+        await asyncio.get_running_loop().run_in_executor(None, release.wait, 5)
+
+    web_mode.display.update = slow_update
+    loop = asyncio.new_event_loop()
+    thread = threading.Thread(target=loop.run_forever, daemon=True)
+    thread.start()
+    web_mode._loop = loop
+    try:
+        web_mode._update_display(face="happy", text="first")
+        assert rendering.wait(2)
+        web_mode._update_display(force=True)
+        for i in range(3):
+            web_mode._update_display(face="cool", text=f"burst {i}")
+        release.set()
+        for _ in range(100):
+            if not web_mode._display_draining:
+                break
+            threading.Event().wait(0.02)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        thread.join(5)
+        loop.close()
+
+    assert renders == [
+        {"face": "happy", "text": "first"},
+        {"face": "cool", "text": "burst 2", "force": True},
+    ]
+    assert web_mode._pending_display is None
+
+
+def test_play_animation_sets_and_clears_action_face(web_mode, monkeypatch):
+    import asyncio
+    import modes.web.commands.play as play
+
+    seen = []
+    animated_face = SimpleNamespace(_current_action_face=None)
+
+    async def update(**kwargs):
+        seen.append(animated_face._current_action_face)
+
+    async def no_sleep(_delay):
+        return None
+
+    web_mode.display.update = update
+    web_mode.display._ui = SimpleNamespace(animated_face=animated_face)
+    monkeypatch.setattr(play.asyncio, "sleep", no_sleep)
+    monkeypatch.setitem(play.ACTION_FACE_SEQUENCES, "walk", ["a", "b", "c"])
+
+    asyncio.run(web_mode._play_cmds._animate_action("walk"))
+
+    assert seen == ["a", "b", "c"]  # Each frame renders its own action face
+    assert animated_face._current_action_face is None
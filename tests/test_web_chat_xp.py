@@ -87,6 +87,7 @@ def test_web_chat_uses_chat_quality_for_xp(monkeypatch, personality):
         return _DummyFuture(asyncio.run(coro))
 
     monkeypatch.setattr("modes.web_chat.asyncio.run_coroutine_threadsafe", run_coroutine_sync)
+    monkeypatch.setattr(mode, "_schedule", lambda coro: asyncio.run(coro))
 
     result = mode._handle_chat_sync("How are you today?")
 